@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteEth.
+#
+# Copyright (c) 2026 AEW2015 <AEW2015@users.noreply.github.com>
+# SPDX-License-Identifier: BSD-2-Clause
+
+# Compare elaboration time of the CRC equations: legacy symbolic unrolling vs memoized GF(2) matrix.
+
+import time
+import argparse
+
+from collections import OrderedDict
+
+from liteeth.mac import crc
+
+# Legacy Equations ---------------------------------------------------------------------------------
+
+def _optimize_eq(l):
+    d = OrderedDict()
+    for e in l:
+        if e in d:
+            d[e] += 1
+        else:
+            d[e] = 1
+    r = []
+    for key, value in d.items():
+        if value%2 != 0:
+            r.append(key)
+    return r
+
+def legacy_crc_matrices(data_width, width, polynom):
+    taps = [x for x in range(width) if (1 << x) & polynom]
+    curval = [[("state", i)] for i in range(width)]
+    for i in range(data_width):
+        feedback = curval.pop() + [("din", i)]
+        for j in range(width-1):
+            if j+1 in taps:
+                curval[j] += feedback
+            curval[j] = _optimize_eq(curval[j])
+        curval.insert(0, feedback)
+    state_rows = [0]*width
+    data_rows  = [0]*width
+    for i in range(width):
+        for t, n in curval[i]:
+            if t == "state":
+                state_rows[i] |= (1 << n)
+            elif t == "din":
+                data_rows[i]  |= (1 << n)
+    return tuple(state_rows), tuple(data_rows)
+
+# Bench --------------------------------------------------------------------------------------------
+
+def bench(f, n):
+    start = time.perf_counter()
+    for i in range(n):
+        r = f()
+    return r, (time.perf_counter() - start)/n
+
+def main():
+    parser = argparse.ArgumentParser(description="LiteEth CRC elaboration bench.")
+    parser.add_argument("--instances", default=4, type=int, help="Number of CRC instances per data width.")
+    args = parser.parse_args()
+
+    width   = crc.LiteEthMACCRC32.width
+    polynom = crc.LiteEthMACCRC32.polynom
+
+    print("{:>10} | {:>12} | {:>12} | {:>12} | {:>8}".format(
+        "data_width", "legacy (ms)", "matrix (ms)", "cached (ms)", "speedup"))
+    for data_width in [8, 32, 64, 128, 256]:
+        crc._crc_matrices.cache_clear()
+        legacy, legacy_time = bench(lambda: legacy_crc_matrices(data_width, width, polynom), args.instances)
+        matrix, matrix_time = bench(lambda: crc._crc_matrices(data_width, width, polynom), 1)
+        cached, cached_time = bench(lambda: crc._crc_matrices(data_width, width, polynom), args.instances)
+        assert legacy == matrix == cached
+        # Total time to elaborate args.instances CRCs of data_width.
+        legacy_total = legacy_time*args.instances
+        matrix_total = matrix_time + cached_time*(args.instances - 1)
+        print("{:>10} | {:>12.3f} | {:>12.3f} | {:>12.3f} | {:>7.0f}x".format(
+            data_width,
+            legacy_total*1e3,
+            matrix_time*1e3,
+            cached_time*1e3,
+            legacy_total/matrix_total))
+
+if __name__ == "__main__":
+    main()
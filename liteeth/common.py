@@ -19,6 +19,8 @@ from litex.soc.interconnect.packet import Header, HeaderField
 # Ethernet Constants -------------------------------------------------------------------------------
 
 eth_mtu             = 1530
+eth_jumbo_mtu       = 9030
+eth_mtu_overhead    = 30   # eth_mtu/eth_jumbo_mtu: IP MTU (1500/9000) + 30 bytes.
 eth_min_len         = 46
 eth_interpacket_gap = 12
 eth_preamble        = 0xd555555555555555
@@ -26,6 +28,7 @@ buffer_depth        = 2**log2_int(eth_mtu, need_pow2=False)
 
 ethernet_type_ip    = 0x800
 ethernet_type_arp   = 0x806
+ethernet_type_vlan  = 0x8100
 
 # MAC Constants/Header -----------------------------------------------------------------------------
 
@@ -37,6 +40,14 @@ mac_header_fields = {
 }
 mac_header = Header(mac_header_fields, mac_header_length, swap_field_bytes=True)
 
+# 802.1Q tag (between sender_mac and ethernet_type when vlan_tagged).
+vlan_tag_length = 4
+vlan_tag_layout = [
+    ("vlan_tagged", 1),
+    ("vlan_pcp",    3),
+    ("vlan_id",    12),
+]
+
 # ARP Constants/Header -----------------------------------------------------------------------------
 
 arp_hwtype_ethernet = 0x0001
@@ -71,6 +82,7 @@ ipv4_header_fields = {
     "version":        HeaderField(0,  4,  4),
     "total_length":   HeaderField(2,  0, 16),
     "identification": HeaderField(4,  0, 16),
+    "flags_offset":   HeaderField(6,  0, 16), # Flags (3 MSBs) and fragment offset (8-byte units).
     "ttl":            HeaderField(8,  0,  8),
     "protocol":       HeaderField(9,  0,  8),
     "checksum":       HeaderField(10, 0, 16),
@@ -78,6 +90,7 @@ ipv4_header_fields = {
     "target_ip":      HeaderField(16, 0, 32)
 }
 ipv4_header = Header(ipv4_header_fields, ipv4_header_length, swap_field_bytes=True)
+ipv4_more_fragments = 0x2000 # MF flag (in flags_offset).
 
 # ICMP Constants/Header ----------------------------------------------------------------------------
 
@@ -172,6 +185,15 @@ def eth_mac_description(dw):
     ]
     return EndpointDescription(payload_layout)
 
+# MAC VLAN
+def eth_mac_vlan_description(dw):
+    payload_layout = mac_header.get_layout() + vlan_tag_layout + [
+        ("data",       dw),
+        ("last_be", dw//8),
+        ("error",   dw//8)
+    ]
+    return EndpointDescription(payload_layout)
+
 # ARP
 def eth_arp_description(dw):
     param_layout = arp_header.get_layout()
@@ -14,21 +14,32 @@ from liteeth.core.icmp import LiteEthICMP
 # IP Core ------------------------------------------------------------------------------------------
 
 class LiteEthIPCore(Module, AutoCSR):
-    def __init__(self, phy, mac_address, ip_address, clk_freq, with_icmp=True, dw=8):
+    def __init__(self, phy, mac_address, ip_address, clk_freq, with_icmp=True, dw=8, mtu=eth_mtu,
+        arp_entries=4, arp_static_entries=0, netmask=0, gateway=0, with_fragmentation=False):
         if isinstance(ip_address, str):
             ip_address = convert_ip(ip_address)
-        self.submodules.mac = LiteEthMAC(phy, dw, interface="crossbar", with_preamble_crc=True)
-        self.submodules.arp = LiteEthARP(self.mac, mac_address, ip_address, clk_freq, dw=dw)
-        self.submodules.ip  = LiteEthIP(self.mac, mac_address, ip_address, self.arp.table, dw=dw)
+        self.submodules.mac = LiteEthMAC(phy, dw, interface="crossbar", with_preamble_crc=True, mtu=mtu)
+        self.submodules.arp = LiteEthARP(self.mac, mac_address, ip_address, clk_freq, dw=dw,
+            entries        = arp_entries,
+            static_entries = arp_static_entries)
+        self.submodules.ip  = LiteEthIP(self.mac, mac_address, ip_address, self.arp.table, dw=dw,
+            mtu                = mtu,
+            netmask            = netmask,
+            gateway            = gateway,
+            fragmentation      = with_fragmentation,
+            reassembly_timeout = int(clk_freq)) # 1s.
         if with_icmp:
             self.submodules.icmp = LiteEthICMP(self.ip, ip_address, dw=dw)
 
 # UDP IP Core --------------------------------------------------------------------------------------
 
 class LiteEthUDPIPCore(LiteEthIPCore):
-    def __init__(self, phy, mac_address, ip_address, clk_freq, with_icmp=True, dw=8):
+    def __init__(self, phy, mac_address, ip_address, clk_freq, with_icmp=True, dw=8, mtu=eth_mtu,
+        arp_entries=4, arp_static_entries=0, netmask=0, gateway=0, with_fragmentation=False):
         if isinstance(ip_address, str):
             ip_address = convert_ip(ip_address)
         LiteEthIPCore.__init__(self, phy, mac_address, ip_address, clk_freq, dw=dw,
-                               with_icmp=with_icmp)
+                               with_icmp=with_icmp, mtu=mtu, arp_entries=arp_entries,
+                               arp_static_entries=arp_static_entries, netmask=netmask,
+                               gateway=gateway, with_fragmentation=with_fragmentation)
         self.submodules.udp = LiteEthUDP(self.ip, ip_address, dw=dw)
@@ -66,7 +66,9 @@ class LiteEthARPTX(Module):
                 packetizer.sink.target_mac.eq(sink.mac_address),
             ).Elif(sink.request,
                 packetizer.sink.opcode.eq(arp_opcode_request),
-                packetizer.sink.target_mac.eq(0xffffffffffff),
+                # Broadcast (or unicast when the MAC address is provided, to refresh an entry).
+                packetizer.sink.target_mac.eq(Mux(sink.mac_address != 0,
+                    sink.mac_address, 0xffffffffffff)),
             )
         ]
         self.comb += [
@@ -152,8 +154,44 @@ class LiteEthARPRX(Module):
 
 # ARP Table ----------------------------------------------------------------------------------------
 
-class LiteEthARPTable(Module):
-    def __init__(self, clk_freq, max_requests=8):
+class LiteEthARPTable(Module, AutoCSR):
+    """ARP Table
+
+    Resolves the MAC addresses of the IP addresses requested by the IP TX (request/response
+    interface) with a cache of entries IP/MAC couples, broadcasting ARP requests (up to
+    max_requests, every 100ms) on misses and answering the ARP requests received from arp_rx.
+
+    The cache is a CAM (all entries compared in parallel, hits answered on the cycle following the
+    request), it can also be looked up combinatorially on the lookup interface. Entries are aged
+    and expire lifetime seconds after their last update, new entries use a free (or expired) entry
+    or replace (evict) the entries in a round-robin way when the table is full.
+
+    Entries used since their last update are refreshed ahead of their expiration: unicast ARP
+    requests are sent to their host (every 100ms) during the last refresh_ahead seconds of their
+    lifetime, the replies updating the entries (so hot destinations never miss).
+
+    Static entries (static_ipN/static_macN, enabled by static_enable) are programmed through CSRs,
+    never age and take precedence over the cache: their IP addresses are resolved without ARP
+    requests (for deterministic latency on point-to-point links).
+
+    Parameters
+    ----------
+    clk_freq : int
+        System clock frequency.
+    max_requests : int
+        Number of ARP requests sent before reporting a failure.
+    entries : int
+        Number of entries of the cache.
+    lifetime : int
+        Lifetime of the entries (in seconds).
+    refresh_ahead : float
+        Refresh window before the expiration of the entries (in seconds, 0 disables the refresh).
+    static_entries : int
+        Number of static (CSR-programmable) entries.
+    """
+    def __init__(self, clk_freq, max_requests=8, entries=4, lifetime=10, refresh_ahead=1,
+        static_entries=0):
+        assert 0 <= refresh_ahead < lifetime
         self.sink   = sink   = stream.Endpoint(_arp_table_layout)  # from arp_rx
         self.source = source = stream.Endpoint(_arp_table_layout)  # to arp_tx
 
@@ -161,6 +199,23 @@ class LiteEthARPTable(Module):
         self.request  = request  = stream.Endpoint(arp_table_request_layout)
         self.response = response = stream.Endpoint(arp_table_response_layout)
 
+        # Lookup interface (combinatorial, cache only, lookup_valid: one cycle per lookup)
+        self.lookup_valid       = Signal()
+        self.lookup_ip_address  = Signal(32)
+        self.lookup_hit         = Signal()
+        self.lookup_mac_address = Signal(48)
+
+        self._size      = CSRStatus(bits_for(entries), reset=entries)
+        self._hits      = CSRStatus(32)
+        self._misses    = CSRStatus(32)
+        self._evictions = CSRStatus(32)
+        if static_entries:
+            self._static_enable = CSRStorage(static_entries)
+            for n in range(static_entries):
+                for name, nbits in [("static_ip", 32), ("static_mac", 48)]:
+                    csr_name = "{}{}".format(name, n)
+                    setattr(self, "_" + csr_name, CSRStorage(nbits, name=csr_name))
+
         # # #
 
         request_pending     = Signal()
@@ -196,15 +251,111 @@ class LiteEthARPTable(Module):
             )
         self.comb += request_timer.wait.eq(request_pending & ~request_counter_ce)
 
-        # Note: Store only 1 IP/MAC couple, can be improved with a real
-        # table in the future to improve performance when packets are
-        # targeting multiple destinations.
-        update = Signal()
-        cached_valid       = Signal()
-        cached_ip_address  = Signal(32, reset_less=True)
-        cached_mac_address = Signal(48, reset_less=True)
-        cached_timer       = WaitTimer(clk_freq*10)
-        self.submodules += cached_timer
+        # Cache: entries aged on a 100ms tick, expired after lifetime seconds.
+        update      = Signal()
+        cached_mac  = Signal(48, reset_less=True)
+        entry_valid = Array(Signal()                    for _ in range(entries))
+        entry_ip    = Array(Signal(32, reset_less=True) for _ in range(entries))
+        entry_mac   = Array(Signal(48, reset_less=True) for _ in range(entries))
+        entry_age   = Array(Signal(max=10*lifetime + 1) for _ in range(entries))
+        entry_used  = Array(Signal()                    for _ in range(entries))
+        age_timer   = WaitTimer(clk_freq//10)
+        self.submodules += age_timer
+        self.comb += age_timer.wait.eq(~age_timer.done)
+        for n in range(entries):
+            self.sync += If(age_timer.done & entry_valid[n],
+                entry_age[n].eq(entry_age[n] + 1),
+                If(entry_age[n] == (10*lifetime - 1),
+                    entry_valid[n].eq(0)
+                )
+            )
+
+        def lookup(ip_address, use):
+            # Hit entries marked as used when use is asserted.
+            hit = Signal()
+            mac = Signal(48)
+            for n in range(entries):
+                match = Signal()
+                self.comb += [
+                    match.eq(entry_valid[n] & (entry_ip[n] == ip_address)),
+                    If(match,
+                        hit.eq(1),
+                        mac.eq(entry_mac[n])
+                    )
+                ]
+                self.sync += If(use & match, entry_used[n].eq(1))
+            # Static entries (precedence over the cache).
+            for n in range(static_entries):
+                static_ip  = getattr(self, "_static_ip{}".format(n)).storage
+                static_mac = getattr(self, "_static_mac{}".format(n)).storage
+                self.comb += If(self._static_enable.storage[n] & (static_ip == ip_address),
+                    hit.eq(1),
+                    mac.eq(static_mac)
+                )
+            return hit, mac
+        request_hit_ce = Signal()
+        pending_hit_ce = Signal()
+        request_hit, request_mac = lookup(request.ip_address,     request_hit_ce)
+        pending_hit, pending_mac = lookup(request_ip_address,     pending_hit_ce)
+        lookup_hit,  lookup_mac  = lookup(self.lookup_ip_address, self.lookup_valid)
+        self.comb += [
+            self.lookup_hit.eq(lookup_hit),
+            self.lookup_mac_address.eq(lookup_mac),
+        ]
+
+        # Hits (on the request and lookup interfaces).
+        self.sync += self._hits.status.eq(self._hits.status + request_hit_ce +
+            (self.lookup_valid & lookup_hit))
+
+        # Update: entry of the IP address if present, else a free entry, else the next victim.
+        update_hit   = Signal()
+        update_free  = Signal()
+        update_index = Signal(max=max(entries, 2))
+        victim       = Signal(max=max(entries, 2))
+        for n in reversed(range(entries)):
+            self.comb += If(~entry_valid[n], update_free.eq(1), update_index.eq(n))
+        for n in reversed(range(entries)):
+            self.comb += If(entry_valid[n] & (entry_ip[n] == sink.ip_address),
+                update_hit.eq(1),
+                update_index.eq(n)
+            )
+        self.comb += If(~update_hit & ~update_free, update_index.eq(victim))
+        self.sync += If(update,
+            entry_valid[update_index].eq(1),
+            entry_ip[update_index].eq(sink.ip_address),
+            entry_mac[update_index].eq(sink.mac_address),
+            entry_age[update_index].eq(0),
+            entry_used[update_index].eq(0),
+            If(~update_hit & ~update_free,
+                victim.eq(Mux(victim == (entries - 1), 0, victim + 1)),
+                self._evictions.status.eq(self._evictions.status + 1)
+            )
+        )
+
+        # Replies for cached entries (refreshes) update the cache directly.
+        self.comb += If(sink.valid & sink.reply & update_hit, update.eq(1))
+
+        # Refresh: one used entry in its refresh window selected per 100ms tick.
+        refresh_ticks   = int(10*refresh_ahead)
+        refresh_pending = Signal(entries)
+        refresh_index   = Signal(max=max(entries, 2))
+        refresh_ce      = Signal()
+        if refresh_ticks:
+            for n in range(entries):
+                self.sync += [
+                    If(age_timer.done,
+                        refresh_pending[n].eq(entry_valid[n] & entry_used[n] &
+                            (entry_age[n] >= (10*lifetime - refresh_ticks - 1)) &
+                            (entry_age[n] <  (10*lifetime - 1)))
+                    ),
+                    If(refresh_ce & (refresh_index == n),
+                        refresh_pending[n].eq(0)
+                    )
+                ]
+            for n in reversed(range(entries)):
+                self.comb += If(refresh_pending[n], refresh_index.eq(n))
+
+        response_failed = Signal()
 
         self.submodules.fsm = fsm = FSM(reset_state="IDLE")
         fsm.act("IDLE",
@@ -215,9 +366,27 @@ class LiteEthARPTable(Module):
             ).Elif(sink.valid & sink.reply & request_pending,
                 NextState("UPDATE_TABLE"),
             ).Elif(request_counter == max_requests-1,
+                NextValue(response_failed, 1),
+                NextState("PRESENT_RESPONSE")
+            ).Elif(request.valid & request_hit,
+                request.ready.eq(1),
+                NextValue(cached_mac, request_mac),
+                request_hit_ce.eq(1),
                 NextState("PRESENT_RESPONSE")
             ).Elif(request.valid | (request_pending & request_timer.done),
                 NextState("CHECK_TABLE")
+            ).Elif(refresh_pending != 0,
+                NextState("SEND_REFRESH")
+            )
+        )
+        fsm.act("SEND_REFRESH",
+            source.valid.eq(1),
+            source.request.eq(1),
+            source.ip_address.eq(entry_ip[refresh_index]),
+            source.mac_address.eq(entry_mac[refresh_index]), # Unicast.
+            If(source.ready,
+                refresh_ce.eq(1),
+                NextState("IDLE")
             )
         )
         fsm.act("SEND_REPLY",
@@ -234,31 +403,22 @@ class LiteEthARPTable(Module):
             update.eq(1),
             NextState("CHECK_TABLE")
         )
-        self.sync += \
-            If(update,
-                cached_valid.eq(1),
-                cached_ip_address.eq(sink.ip_address),
-                cached_mac_address.eq(sink.mac_address),
-            ).Else(
-                If(cached_timer.done,
-                    cached_valid.eq(0)
-                )
-            )
-        self.comb += cached_timer.wait.eq(~update)
         fsm.act("CHECK_TABLE",
-            If(cached_valid,
-                If(request_ip_address == cached_ip_address,
-                    request_ip_address_reset.eq(1),
-                    NextState("PRESENT_RESPONSE"),
-                ).Elif(request.ip_address == cached_ip_address,
-                    request.ready.eq(request.valid),
-                    NextState("PRESENT_RESPONSE"),
-                ).Else(
-                    request_ip_address_update.eq(request.valid),
-                    NextState("SEND_REQUEST")
-                )
+            If(pending_hit,
+                pending_hit_ce.eq(1),
+                request_ip_address_reset.eq(1),
+                NextValue(cached_mac, pending_mac),
+                NextState("PRESENT_RESPONSE"),
+            ).Elif(request_hit,
+                request.ready.eq(request.valid),
+                request_hit_ce.eq(request.valid),
+                NextValue(cached_mac, request_mac),
+                NextState("PRESENT_RESPONSE"),
             ).Else(
-                request_ip_address_update.eq(request.valid),
+                If(request.valid,
+                    request_ip_address_update.eq(1),
+                    NextValue(self._misses.status, self._misses.status + 1)
+                ),
                 NextState("SEND_REQUEST")
             )
         )
@@ -276,26 +436,29 @@ class LiteEthARPTable(Module):
         )
         self.comb += [
             If(request_counter == max_requests - 1,
-                response.failed.eq(1),
                 request_counter_reset.eq(1),
                 request_pending_clr.eq(1)
             ),
-            response.mac_address.eq(cached_mac_address)
+            response.failed.eq(response_failed),
+            response.mac_address.eq(cached_mac)
         ]
         fsm.act("PRESENT_RESPONSE",
             response.valid.eq(1),
             If(response.ready,
+                NextValue(response_failed, 0),
                 NextState("IDLE")
             )
         )
 
 # ARP ----------------------------------------------------------------------------------------------
 
-class LiteEthARP(Module):
-    def __init__(self, mac, mac_address, ip_address, clk_freq, dw=8):
+class LiteEthARP(Module, AutoCSR):
+    def __init__(self, mac, mac_address, ip_address, clk_freq, dw=8, entries=4, static_entries=0):
         self.submodules.tx    = tx    = LiteEthARPTX(mac_address, ip_address, dw)
         self.submodules.rx    = rx    = LiteEthARPRX(mac_address, ip_address, dw)
-        self.submodules.table = table = LiteEthARPTable(clk_freq)
+        self.submodules.table = table = LiteEthARPTable(clk_freq,
+            entries        = entries,
+            static_entries = static_entries)
         self.comb += [
             rx.source.connect(table.sink),
             table.source.connect(tx.sink)
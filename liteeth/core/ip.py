@@ -4,10 +4,15 @@
 # Copyright (c) 2015-2020 Florent Kermarrec <florent@enjoy-digital.fr>
 # SPDX-License-Identifier: BSD-2-Clause
 
+from functools import reduce
+from operator import or_
+
 from liteeth.common import *
 from liteeth.crossbar import LiteEthCrossbar
 
-from litex.soc.interconnect.packet import Depacketizer, Packetizer
+from migen.genlib.misc import WaitTimer
+
+from litex.soc.interconnect.packet import Depacketizer, Packetizer, Arbiter
 
 # IP Crossbar --------------------------------------------------------------------------------------
 
@@ -80,8 +85,60 @@ class LiteEthIPV4Checksum(Module):
         self.comb += counter_ce.eq(~self.done)
         self.comb += self.done.eq(counter == n_cycles)
 
+
+class LiteEthIPV4TXChecksum(Module):
+    """IPv4 TX Header Checksum
+
+    Combinatorial checksum of the headers sent by the IP TX: the partial sum of the constant
+    fields (version/ihl, ttl, sender_ip) is computed at elaboration, only the variable fields
+    (total_length, protocol, target_ip and, when fragmenting, identification/flags_offset) are
+    added (shallow adder tree and two carry folds), so the checksum is valid on the cycle the
+    header fields are.
+    """
+    def __init__(self, ip_address, ttl=0x80):
+        self.total_length   = Signal(16)
+        self.protocol       = Signal(8)
+        self.target_ip      = Signal(32)
+        self.identification = Signal(16)
+        self.flags_offset   = Signal(16)
+        self.value          = Signal(16)
+
+        # # #
+
+        # Constant fields partial sum (16-bit words in network order).
+        constant  = (0x4 << 12) | ((ipv4_header.length//4) << 8) # Version/IHL, TOS=0.
+        constant += ttl << 8                                      # TTL (and protocol).
+        constant += (ip_address >> 16) + (ip_address & 0xffff)    # Sender IP.
+        while constant >> 16:
+            constant = (constant & 0xffff) + (constant >> 16)
+
+        # Variable fields (adder tree).
+        s0 = Signal(17)
+        s1 = Signal(17)
+        s2 = Signal(17)
+        s  = Signal(19)
+        f  = Signal(17)
+        self.comb += [
+            s0.eq(self.total_length + self.protocol),
+            s1.eq(self.target_ip[16:] + self.target_ip[:16]),
+            s2.eq(self.identification + self.flags_offset),
+            s.eq((s0 + s1) + (s2 + constant)),
+            f.eq(s[:16] + s[16:]),
+            self.value.eq(~(f[:16] + f[16])),
+        ]
+
 # IP TX --------------------------------------------------------------------------------------------
 
+def _ipv4_fragment_description(dw):
+    # IPv4 user description with the fragmentation fields.
+    description = eth_ipv4_user_description(dw)
+    param_layout = description.param_layout + [
+        ("identification", 16),
+        ("flags_offset",   16)
+    ]
+    return EndpointDescription(description.payload_layout, param_layout)
+
+
 class LiteEthIPV4Packetizer(Packetizer):
     def __init__(self, dw=8):
         Packetizer.__init__(self,
@@ -90,68 +147,262 @@ class LiteEthIPV4Packetizer(Packetizer):
             ipv4_header)
 
 
-class LiteEthIPTX(Module):
-    def __init__(self, mac_address, ip_address, arp_table, dw=8):
+class LiteEthIPV4Fragmenter(Module):
+    """IPv4 Fragmenter
+
+    Splits the packets larger than the IP MTU (ip_mtu, IPv4 header included) in fragments of the
+    largest multiple of 8 bytes fitting in the IP MTU, passing the packets through (no buffering,
+    no latency). The fragments of a packet share the packet's identification (incremented on each
+    packet) and get their flags_offset (MF flag on all fragments but the last one) and length.
+    """
+    def __init__(self, dw=8, ip_mtu=eth_mtu - eth_mtu_overhead):
+        nbytes         = dw//8
+        fragment_bytes = ((ip_mtu - ipv4_header.length)//8)*8
+        fragment_words = fragment_bytes//nbytes
+        assert fragment_bytes%nbytes == 0
+        self.sink   = sink   = stream.Endpoint(eth_ipv4_user_description(dw))
+        self.source = source = stream.Endpoint(_ipv4_fragment_description(dw))
+
+        # # #
+
+        offset         = Signal(16) # Of the fragment in the packet (bytes).
+        count          = Signal(max=max(fragment_words, 2))
+        identification = Signal(16)
+        remaining      = Signal(16)
+        more           = Signal()
+        self.comb += [
+            remaining.eq(sink.length - offset),
+            more.eq(remaining > fragment_bytes),
+            sink.connect(source, omit={"last", "last_be", "length"}),
+            source.length.eq(Mux(more, fragment_bytes, remaining)),
+            source.identification.eq(identification),
+            source.flags_offset.eq(Cat(offset[3:], more)),
+            If(sink.last,
+                source.last.eq(1),
+                source.last_be.eq(sink.last_be)
+            ).Elif(more & (count == (fragment_words - 1)),
+                source.last.eq(1),
+                source.last_be.eq(2**(nbytes - 1))
+            )
+        ]
+        self.sync += If(source.valid & source.ready,
+            count.eq(count + 1),
+            If(source.last,
+                count.eq(0),
+                offset.eq(offset + fragment_bytes),
+                If(sink.last,
+                    offset.eq(0),
+                    identification.eq(identification + 1)
+                )
+            )
+        )
+
+
+class LiteEthIPTX(Module, AutoCSR):
+    """IP TX
+
+    Packets to multicast or resolved (ARP cache hit) destinations are sent directly, packets to
+    unresolved destinations (or to destinations of held packets, to preserve the order) are moved
+    to a hold buffer (of hold_packets MTU-sized packets) while their destination is resolved, so
+    that they do not block the packets to resolved destinations. Held packets are sent in order
+    once resolved or dropped if the resolution fails (target_unreachable).
+
+    When the hold buffer is full, packets to unresolved destinations are dropped (hold_policy
+    "drop") or wait for space in the hold buffer (hold_policy "block"). Dropped packets are counted
+    in dropped.
+
+    Destinations outside of the subnet (netmask) are resolved through the gateway (when set): the
+    packets are sent to the MAC address of the gateway. The netmask/gateway CSRs are reset to the
+    netmask/gateway parameters (0: all destinations on the link).
+
+    With fragmentation, packets larger than the IP MTU (mtu - eth_mtu_overhead, mtu being the
+    Ethernet frame budget: 1500 bytes for eth_mtu) are sent in fragments, up to 64KB (see
+    LiteEthIPV4Fragmenter).
+    """
+    def __init__(self, mac_address, ip_address, arp_table, dw=8, mtu=eth_mtu, hold_packets=2,
+        hold_policy="drop", netmask=0, gateway=0, fragmentation=False):
+        assert hold_packets >= 1
+        assert hold_policy in ["drop", "block"]
+        if isinstance(netmask, str):
+            netmask = convert_ip(netmask)
+        if isinstance(gateway, str):
+            gateway = convert_ip(gateway)
         self.sink   = sink   = stream.Endpoint(eth_ipv4_user_description(dw))
         self.source = source = stream.Endpoint(eth_mac_description(dw))
         self.target_unreachable = Signal()
 
+        self._dropped = CSRStatus(32)
+        self._netmask = CSRStorage(32, reset=netmask)
+        self._gateway = CSRStorage(32, reset=gateway)
+
         # # #
 
-        self.submodules.checksum = checksum = LiteEthIPV4Checksum(skip_checksum=True)
-        self.comb += checksum.ce.eq(sink.valid)
-        self.comb += checksum.reset.eq(source.valid & source.last & source.ready)
+        # Fragmentation.
+        if fragmentation:
+            self.submodules.fragmenter = fragmenter = LiteEthIPV4Fragmenter(dw,
+                ip_mtu = mtu - eth_mtu_overhead)
+            self.comb += sink.connect(fragmenter.sink)
+            sink = fragmenter.source
+            identification = sink.identification
+            flags_offset   = sink.flags_offset
+        else:
+            identification = 0
+            flags_offset   = 0
+
+        # Next hop: destination (on the link) or gateway.
+        next_hop = Signal(32)
+        self.comb += [
+            next_hop.eq(sink.ip_address),
+            If((self._gateway.storage != 0) &
+               (((sink.ip_address ^ ip_address) & self._netmask.storage) != 0),
+                next_hop.eq(self._gateway.storage)
+            )
+        ]
+
+        ttl = 0x80
+        self.submodules.checksum = checksum = LiteEthIPV4TXChecksum(ip_address, ttl)
+        self.comb += [
+            checksum.total_length.eq(ipv4_header.length + sink.length),
+            checksum.protocol.eq(sink.protocol),
+            checksum.target_ip.eq(sink.ip_address),
+            checksum.identification.eq(identification),
+            checksum.flags_offset.eq(flags_offset),
+        ]
 
         self.submodules.packetizer = packetizer = LiteEthIPV4Packetizer(dw)
         self.comb += [
-            packetizer.sink.valid.eq(sink.valid & checksum.done),
+            packetizer.sink.valid.eq(sink.valid),
             packetizer.sink.last.eq(sink.last),
             packetizer.sink.last_be.eq(sink.last_be),
-            sink.ready.eq(packetizer.sink.ready & checksum.done),
+            sink.ready.eq(packetizer.sink.ready),
             packetizer.sink.target_ip.eq(sink.ip_address),
             packetizer.sink.protocol.eq(sink.protocol),
             packetizer.sink.total_length.eq(ipv4_header.length + sink.length),
             packetizer.sink.version.eq(0x4),     # ipv4
             packetizer.sink.ihl.eq(ipv4_header.length//4),
-            packetizer.sink.identification.eq(0),
-            packetizer.sink.ttl.eq(0x80),
+            packetizer.sink.identification.eq(identification),
+            packetizer.sink.flags_offset.eq(flags_offset),
+            packetizer.sink.ttl.eq(ttl),
             packetizer.sink.sender_ip.eq(ip_address),
             packetizer.sink.data.eq(sink.data),
-            checksum.header.eq(packetizer.header),
             packetizer.sink.checksum.eq(checksum.value)
         ]
 
         target_mac = Signal(48, reset_less=True)
 
-        self.submodules.fsm = fsm = FSM(reset_state="IDLE")
-        fsm.act("IDLE",
-            packetizer.source.ready.eq(1),
-            If(packetizer.source.valid,
-                packetizer.source.ready.eq(0),
-                If(sink.ip_address[28:] == mcast_ip_mask,
-                    NextValue(target_mac, Cat(sink.ip_address[:23], 0, mcast_oui)),
-                    NextState("SEND")
-                ).Else(
-                    NextState("SEND_MAC_ADDRESS_REQUEST")
-                )
+        # Hold buffer (packets and their destinations).
+        packet_words = (mtu + dw//8 - 1)//(dw//8)
+        hold_fifo_layout = [("data", dw), ("last_be", dw//8), ("error", dw//8)]
+        hold_fifo = stream.SyncFIFO(hold_fifo_layout, hold_packets*packet_words, buffered=True)
+        self.submodules += hold_fifo
+        hold_push  = Signal()
+        hold_pop   = Signal()
+        hold_wr    = Signal(max=max(hold_packets, 2))
+        hold_rd    = Signal(max=max(hold_packets, 2))
+        hold_valid = Array(Signal()                    for _ in range(hold_packets))
+        hold_ip    = Array(Signal(32, reset_less=True) for _ in range(hold_packets))
+        hold_space = Signal()
+        held       = Signal() # Destination of a held packet.
+        self.sync += [
+            If(hold_push,
+                hold_valid[hold_wr].eq(1),
+                hold_ip[hold_wr].eq(next_hop),
+                hold_wr.eq(Mux(hold_wr == (hold_packets - 1), 0, hold_wr + 1))
+            ),
+            If(hold_pop,
+                hold_valid[hold_rd].eq(0),
+                hold_rd.eq(Mux(hold_rd == (hold_packets - 1), 0, hold_rd + 1))
+            )
+        ]
+        self.comb += [
+            hold_space.eq(~hold_valid[hold_wr] &
+                (hold_fifo.level <= (hold_packets - 1)*packet_words)),
+            held.eq(reduce(or_, [hold_valid[n] & (hold_ip[n] == next_hop)
+                for n in range(hold_packets)])),
+        ]
+
+        # Resolution of the held packets destination.
+        hold_mac      = Signal(48, reset_less=True)
+        hold_resolved = Signal()
+        hold_failed   = Signal()
+        hold_done     = Signal()
+        self.comb += arp_table.request.ip_address.eq(hold_ip[hold_rd])
+        self.submodules.resolver = resolver = FSM(reset_state="IDLE")
+        resolver.act("IDLE",
+            If(hold_valid[hold_rd],
+                NextState("SEND_MAC_ADDRESS_REQUEST")
             )
         )
-        self.comb += arp_table.request.ip_address.eq(sink.ip_address)
-        fsm.act("SEND_MAC_ADDRESS_REQUEST",
+        resolver.act("SEND_MAC_ADDRESS_REQUEST",
             arp_table.request.valid.eq(1),
             If(arp_table.request.valid & arp_table.request.ready,
                 NextState("WAIT_MAC_ADDRESS_RESPONSE")
             )
         )
-        fsm.act("WAIT_MAC_ADDRESS_RESPONSE",
+        resolver.act("WAIT_MAC_ADDRESS_RESPONSE",
             If(arp_table.response.valid,
-                NextValue(target_mac, arp_table.response.mac_address),
+                NextValue(hold_mac, arp_table.response.mac_address),
                 arp_table.response.ready.eq(1),
                 If(arp_table.response.failed,
                     self.target_unreachable.eq(1),
-                    NextState("DROP"),
+                    NextValue(hold_failed, 1)
                 ).Else(
+                    NextValue(hold_resolved, 1)
+                ),
+                NextState("WAIT_DONE")
+            )
+        )
+        resolver.act("WAIT_DONE",
+            If(hold_done,
+                hold_pop.eq(1),
+                NextValue(hold_resolved, 0),
+                NextValue(hold_failed, 0),
+                NextState("IDLE")
+            )
+        )
+
+        # Packets from the packetizer: to the output, to the hold buffer or dropped.
+        dropped_ce = Signal()
+        self.sync += self._dropped.status.eq(self._dropped.status + dropped_ce)
+        self.comb += arp_table.lookup_ip_address.eq(next_hop)
+        # Note: lookup_valid is only asserted when the packet leaves IDLE (one lookup per packet).
+        unresolved = [arp_table.lookup_valid.eq(1), hold_push.eq(1), NextState("HOLD")]
+        if hold_policy == "drop":
+            unresolved = [
+                If(hold_space,
+                    *unresolved
+                ).Else(
+                    arp_table.lookup_valid.eq(1),
+                    dropped_ce.eq(1),
+                    NextState("DROP")
+                )
+            ]
+        else:
+            unresolved = [If(hold_space, *unresolved)]
+        self.submodules.fsm = fsm = FSM(reset_state="IDLE")
+        fsm.act("IDLE",
+            packetizer.source.ready.eq(1),
+            If(hold_resolved | hold_failed,
+                packetizer.source.ready.eq(0),
+                If(hold_resolved,
+                    NextState("SEND_HOLD")
+                ).Else(
+                    dropped_ce.eq(1),
+                    NextState("DROP_HOLD")
+                )
+            ).Elif(packetizer.source.valid,
+                packetizer.source.ready.eq(0),
+                If(sink.ip_address[28:] == mcast_ip_mask,
+                    NextValue(target_mac, Cat(sink.ip_address[:23], 0, mcast_oui)),
                     NextState("SEND")
+                ).Else(
+                    If(arp_table.lookup_hit & ~held,
+                        arp_table.lookup_valid.eq(1),
+                        NextValue(target_mac, arp_table.lookup_mac_address),
+                        NextState("SEND")
+                    ).Else(
+                        *unresolved
+                    )
                 )
             )
         )
@@ -172,6 +423,32 @@ class LiteEthIPTX(Module):
                 NextState("IDLE")
             )
         )
+        fsm.act("HOLD",
+            packetizer.source.connect(hold_fifo.sink, keep={"valid", "ready", "last", "data",
+                "last_be", "error"}),
+            If(packetizer.source.valid &
+               packetizer.source.last &
+               packetizer.source.ready,
+                NextState("IDLE")
+            )
+        )
+        fsm.act("SEND_HOLD",
+            hold_fifo.source.connect(source),
+            source.ethernet_type.eq(ethernet_type_ip),
+            source.target_mac.eq(hold_mac),
+            source.sender_mac.eq(mac_address),
+            If(source.valid & source.last & source.ready,
+                hold_done.eq(1),
+                NextState("IDLE")
+            )
+        )
+        fsm.act("DROP_HOLD",
+            hold_fifo.source.ready.eq(1),
+            If(hold_fifo.source.valid & hold_fifo.source.last,
+                hold_done.eq(1),
+                NextState("IDLE")
+            )
+        )
 
 # IP RX --------------------------------------------------------------------------------------------
 
@@ -183,80 +460,270 @@ class LiteEthIPV4Depacketizer(Depacketizer):
             ipv4_header)
 
 
-class LiteEthIPRX(Module):
-    def __init__(self, mac_address, ip_address, dw=8):
-        self.sink   = sink   = stream.Endpoint(eth_mac_description(dw))
+class LiteEthIPV4RXChecksum(Module):
+    """IPv4 RX Header Checksum
+
+    Combinatorial checksum of a received header (adder tree over the 16-bit words and two carry
+    folds): value is 0 when the header checksum is correct.
+    """
+    def __init__(self):
+        self.header = Signal(ipv4_header.length*8)
+        self.value  = Signal(16)
+
+        # # #
+
+        # Adder tree (byte order of the header words is irrelevant for a one's complement sum).
+        terms = [self.header[16*i:16*(i + 1)] for i in range(ipv4_header.length//2)]
+        while len(terms) > 1:
+            pairs = []
+            for i in range(0, len(terms) - 1, 2):
+                t = Signal(len(terms[i]) + 1)
+                self.comb += t.eq(terms[i] + terms[i + 1])
+                pairs.append(t)
+            terms = pairs + terms[len(terms) - len(terms)%2:]
+        f0 = Signal(17)
+        f1 = Signal(16)
+        self.comb += [
+            f0.eq(terms[0][:16] + terms[0][16:]),
+            f1.eq(f0[:16] + f0[16]),
+            self.value.eq(~f1),
+        ]
+
+
+class LiteEthIPV4Reassembler(Module, AutoCSR):
+    """IPv4 Reassembler
+
+    Reassembles the fragmented packets (one at a time) in a buffer of size bytes: the fragments are
+    written at their offset in the buffer and the packet is presented once all its bytes have been
+    received. Fragments of other packets (while a packet is being reassembled) and fragments not
+    fitting in the buffer are dropped (counted in dropped), packets not completed within timeout
+    cycles (from their first fragment) are discarded (counted in timeouts). Overlapping fragments
+    are not supported.
+    """
+    def __init__(self, dw=8, size=8192, timeout=2**24):
+        nbytes = dw//8
+        assert size%8 == 0
+        self.sink   = sink   = stream.Endpoint(eth_ipv4_description(dw))
         self.source = source = stream.Endpoint(eth_ipv4_user_description(dw))
 
+        self._dropped  = CSRStatus(32)
+        self._timeouts = CSRStatus(32)
+
         # # #
 
-        self.submodules.depacketizer = depacketizer = LiteEthIPV4Depacketizer(dw)
-        self.comb += sink.connect(depacketizer.sink)
+        # Buffer.
+        mem    = Memory(dw, size//nbytes)
+        wrport = mem.get_port(write_capable=True)
+        rdport = mem.get_port()
+        self.specials += mem, wrport, rdport
 
-        self.submodules.checksum = checksum = LiteEthIPV4Checksum(skip_checksum=False)
+        # Fragment.
+        fragment_offset = Signal(17)
+        fragment_length = Signal(16)
+        fragment_last   = Signal()
         self.comb += [
-            checksum.header.eq(depacketizer.header),
-            checksum.reset.eq(~(depacketizer.source.valid)),
-            checksum.ce.eq(1)
+            fragment_offset.eq(Cat(C(0, 3), sink.flags_offset[:13])),
+            fragment_length.eq(sink.total_length - ipv4_header.length),
+            fragment_last.eq(~sink.flags_offset[13]),
         ]
 
-        self.submodules.fsm = fsm = FSM(reset_state="IDLE")
-        fsm.act("IDLE",
-            depacketizer.source.ready.eq(1),
-            If(depacketizer.source.valid,
-                depacketizer.source.ready.eq(0),
-                NextState("CHECK")
+        # Packet being reassembled.
+        active         = Signal()
+        ip_address     = Signal(32)
+        identification = Signal(16)
+        protocol       = Signal(8)
+        received       = Signal(17)
+        length         = Signal(17)
+        length_valid   = Signal() # Last fragment received.
+        match          = Signal()
+        fits           = Signal()
+        self.comb += [
+            match.eq(active &
+                (sink.sender_ip      == ip_address) &
+                (sink.identification == identification) &
+                (sink.protocol       == protocol)),
+            fits.eq((fragment_offset + fragment_length) <= size),
+        ]
+        timer = WaitTimer(timeout)
+        self.submodules += timer
+        self.comb += timer.wait.eq(active)
+
+        # Fragments write / Packet read.
+        wr_adr   = Signal(len(wrport.adr))
+        wr_count = Signal(16) # Fragment bytes written, Ethernet padding is not.
+        rd_adr   = Signal(len(rdport.adr))
+        last_adr = Signal(len(rdport.adr))
+        self.comb += [
+            last_adr.eq((length - 1)[log2_int(nbytes):]),
+            wrport.adr.eq(wr_adr),
+            wrport.dat_w.eq(sink.data),
+            rdport.adr.eq(rd_adr),
+            source.data.eq(rdport.dat_r),
+            source.last.eq(rd_adr == last_adr),
+            source.length.eq(length),
+            source.protocol.eq(protocol),
+            source.ip_address.eq(ip_address),
+        ]
+        if nbytes == 1:
+            self.comb += source.last_be.eq(source.last)
+        else:
+            self.comb += If(source.last,
+                source.last_be.eq(1 << (length - 1)[:log2_int(nbytes)])
             )
-        )
-        self.valid = valid = Signal(reset_less=True)
-        self.sync += valid.eq(
-            depacketizer.source.valid &
-            (depacketizer.source.target_ip == ip_address) &
-            (depacketizer.source.version == 0x4) &
-            (depacketizer.source.ihl == 0x5) &
-            (checksum.value == 0)
-        )
 
-        fsm.act("CHECK",
-            If(checksum.done,
-                If(valid,
-                    NextState("PRESENT")
+        self.submodules.fsm = fsm = FSM(reset_state="IDLE")
+        fsm.act("IDLE",
+            If(active & timer.done,
+                NextValue(active, 0),
+                NextValue(self._timeouts.status, self._timeouts.status + 1)
+            ).Elif(sink.valid,
+                If((match | ~active) & fits,
+                    If(~active,
+                        NextValue(active, 1),
+                        NextValue(ip_address, sink.sender_ip),
+                        NextValue(identification, sink.identification),
+                        NextValue(protocol, sink.protocol),
+                        NextValue(received, 0),
+                        NextValue(length_valid, 0)
+                    ),
+                    NextValue(wr_adr, fragment_offset[log2_int(nbytes):]),
+                    NextValue(wr_count, 0),
+                    NextState("WRITE")
                 ).Else(
+                    NextValue(self._dropped.status, self._dropped.status + 1),
                     NextState("DROP")
                 )
             )
         )
-        self.comb += [
-            source.last.eq(depacketizer.source.last),
-            source.length.eq(depacketizer.source.total_length - (0x5*4)),
-            source.protocol.eq(depacketizer.source.protocol),
-            source.ip_address.eq(depacketizer.source.sender_ip),
-            source.data.eq(depacketizer.source.data),
-            source.error.eq(depacketizer.source.error),
-            source.last_be.eq(depacketizer.source.last_be)
-        ]
-        fsm.act("PRESENT",
-            source.valid.eq(depacketizer.source.valid),
-            depacketizer.source.ready.eq(source.ready),
-            If(source.valid & source.last & source.ready,
+        fsm.act("WRITE",
+            sink.ready.eq(1),
+            If(sink.valid,
+                If(wr_count < fragment_length,
+                    wrport.we.eq(1),
+                    NextValue(wr_adr,   wr_adr + 1),
+                    NextValue(wr_count, wr_count + nbytes)
+                ),
+                If(sink.last,
+                    NextValue(received, received + fragment_length),
+                    If(fragment_last,
+                        NextValue(length, fragment_offset + fragment_length),
+                        NextValue(length_valid, 1)
+                    ),
+                    NextState("CHECK")
+                )
+            )
+        )
+        fsm.act("CHECK",
+            If(length_valid & (received == length),
+                rdport.adr.eq(0),
+                NextValue(rd_adr, 0),
+                NextState("READ")
+            ).Else(
                 NextState("IDLE")
             )
         )
+        fsm.act("READ",
+            source.valid.eq(1),
+            If(source.ready,
+                rdport.adr.eq(rd_adr + 1),
+                NextValue(rd_adr, rd_adr + 1),
+                If(source.last,
+                    NextValue(active, 0),
+                    NextState("IDLE")
+                )
+            )
+        )
         fsm.act("DROP",
-            depacketizer.source.ready.eq(1),
-            If(depacketizer.source.valid &
-               depacketizer.source.last &
-               depacketizer.source.ready,
+            sink.ready.eq(1),
+            If(sink.valid & sink.last,
                 NextState("IDLE")
             )
         )
 
+
+class LiteEthIPRX(Module, AutoCSR):
+    """IP RX
+
+    The header is validated (target_ip, version, ihl and checksum) combinatorially from the
+    depacketized header, in parallel with the depacketizer: valid packets are presented and invalid
+    ones dropped without any dead cycle, back-to-back packets flowing at one word per cycle.
+
+    With reassembly, fragments are reassembled (see LiteEthIPV4Reassembler) and the reassembled
+    packets presented between the other packets.
+    """
+    def __init__(self, mac_address, ip_address, dw=8, reassembly=False, reassembly_size=8192,
+        reassembly_timeout=2**24):
+        self.sink   = sink   = stream.Endpoint(eth_mac_description(dw))
+        self.source = source = stream.Endpoint(eth_ipv4_user_description(dw))
+
+        # # #
+
+        self.submodules.depacketizer = depacketizer = LiteEthIPV4Depacketizer(dw)
+        self.comb += sink.connect(depacketizer.sink)
+
+        self.submodules.checksum = checksum = LiteEthIPV4RXChecksum()
+        self.comb += checksum.header.eq(depacketizer.header)
+
+        self.valid = valid = Signal()
+        self.comb += valid.eq(
+            (depacketizer.source.target_ip == ip_address) &
+            (depacketizer.source.version == 0x4) &
+            (depacketizer.source.ihl == 0x5) &
+            (checksum.value == 0)
+        )
+
+        # Reassembly of the fragments (MF flag or fragment offset set).
+        fragment       = Signal()
+        fragment_ready = Signal()
+        if reassembly:
+            self.submodules.reassembler = reassembler = LiteEthIPV4Reassembler(dw,
+                size    = reassembly_size,
+                timeout = reassembly_timeout)
+            direct = stream.Endpoint(eth_ipv4_user_description(dw))
+            self.comb += [
+                fragment.eq(depacketizer.source.flags_offset[:14] != 0),
+                depacketizer.source.connect(reassembler.sink, omit={"valid", "ready"}),
+                reassembler.sink.valid.eq(depacketizer.source.valid & valid & fragment),
+                fragment_ready.eq(reassembler.sink.ready),
+            ]
+            self.submodules.arbiter = Arbiter([direct, reassembler.source], source)
+        else:
+            direct = source
+
+        # Present valid packets, drop invalid ones.
+        self.comb += [
+            direct.valid.eq(depacketizer.source.valid & valid & ~fragment),
+            direct.last.eq(depacketizer.source.last),
+            direct.length.eq(depacketizer.source.total_length - (0x5*4)),
+            direct.protocol.eq(depacketizer.source.protocol),
+            direct.ip_address.eq(depacketizer.source.sender_ip),
+            direct.data.eq(depacketizer.source.data),
+            direct.error.eq(depacketizer.source.error),
+            direct.last_be.eq(depacketizer.source.last_be),
+            If(fragment,
+                depacketizer.source.ready.eq(fragment_ready | ~valid)
+            ).Else(
+                depacketizer.source.ready.eq(direct.ready | ~valid)
+            )
+        ]
+
 # IP -----------------------------------------------------------------------------------------------
 
-class LiteEthIP(Module):
-    def __init__(self, mac, mac_address, ip_address, arp_table, dw=8):
-        self.submodules.tx = tx = LiteEthIPTX(mac_address, ip_address, arp_table, dw=dw)
-        self.submodules.rx = rx = LiteEthIPRX(mac_address, ip_address, dw=dw)
+class LiteEthIP(Module, AutoCSR):
+    def __init__(self, mac, mac_address, ip_address, arp_table, dw=8, mtu=eth_mtu, hold_packets=2,
+        hold_policy="drop", netmask=0, gateway=0, fragmentation=False, reassembly_size=8192,
+        reassembly_timeout=2**24):
+        self.submodules.tx = tx = LiteEthIPTX(mac_address, ip_address, arp_table, dw=dw,
+            mtu           = mtu,
+            hold_packets  = hold_packets,
+            hold_policy   = hold_policy,
+            netmask       = netmask,
+            gateway       = gateway,
+            fragmentation = fragmentation)
+        self.submodules.rx = rx = LiteEthIPRX(mac_address, ip_address, dw=dw,
+            reassembly         = fragmentation,
+            reassembly_size    = reassembly_size,
+            reassembly_timeout = reassembly_timeout)
         mac_port = mac.crossbar.get_port(ethernet_type_ip, dw)
         self.comb += [
             tx.source.connect(mac_port.sink),
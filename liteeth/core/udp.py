@@ -149,6 +149,12 @@ class LiteEthUDPDepacketizer(Depacketizer):
 
 
 class LiteEthUDPRX(Module):
+    """UDP RX
+
+    The protocol is validated combinatorially in parallel with the depacketizer: UDP packets are
+    presented and other packets dropped without any dead cycle, back-to-back packets flowing at
+    one word per cycle.
+    """
     def __init__(self, ip_address, dw=8):
         self.sink   = sink   = stream.Endpoint(eth_ipv4_user_description(dw))
         self.source = source = stream.Endpoint(eth_udp_user_description(dw))
@@ -158,51 +164,21 @@ class LiteEthUDPRX(Module):
         self.submodules.depacketizer = depacketizer = LiteEthUDPDepacketizer(dw)
         self.comb += sink.connect(depacketizer.sink)
 
-        self.submodules.fsm = fsm = FSM(reset_state="IDLE")
-        fsm.act("IDLE",
-            depacketizer.source.ready.eq(1),
-            If(depacketizer.source.valid,
-                depacketizer.source.ready.eq(0),
-                NextState("CHECK")
-            )
-        )
-        valid = Signal(reset_less=True)
-        self.sync += valid.eq(
-            depacketizer.source.valid &
-            (sink.protocol == udp_protocol)
-        )
+        valid = Signal()
+        self.comb += valid.eq(sink.protocol == udp_protocol)
 
-        fsm.act("CHECK",
-            If(valid,
-                NextState("PRESENT")
-            ).Else(
-                NextState("DROP")
-            )
-        )
+        # Present UDP packets, drop other ones.
         self.comb += [
+            source.valid.eq(depacketizer.source.valid & valid),
             source.last.eq(depacketizer.source.last),
             source.src_port.eq(depacketizer.source.src_port),
             source.dst_port.eq(depacketizer.source.dst_port),
             source.ip_address.eq(sink.ip_address),
             source.length.eq(depacketizer.source.length - udp_header.length),
             source.data.eq(depacketizer.source.data),
-            source.error.eq(depacketizer.source.error)
+            source.error.eq(depacketizer.source.error),
+            depacketizer.source.ready.eq(source.ready | ~valid)
         ]
-        fsm.act("PRESENT",
-            source.valid.eq(depacketizer.source.valid),
-            depacketizer.source.ready.eq(source.ready),
-            If(source.valid & source.last & source.ready,
-                NextState("IDLE")
-            )
-        )
-        fsm.act("DROP",
-            depacketizer.source.ready.eq(1),
-            If(depacketizer.source.valid &
-               depacketizer.source.last &
-               depacketizer.source.ready,
-                NextState("IDLE")
-            )
-        )
 
 # UDP ----------------------------------------------------------------------------------------------
 
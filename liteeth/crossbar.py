@@ -30,8 +30,18 @@ class LiteEthCrossbar(Module):
         # RX dispatch
         sources = [port.source for port in self.users.values()]
         self.submodules.dispatcher = Dispatcher(self.master.sink, sources, one_hot=True)
+        # Dispatch on a param or on a list of params (users keys are then tuples of values).
+        if isinstance(self.dispatch_param, list):
+            params = [getattr(self.master.sink, param) for param in self.dispatch_param]
+        else:
+            params = [getattr(self.master.sink, self.dispatch_param)]
         cases = {}
         cases["default"] = self.dispatcher.sel.eq(0)
         for i, (k, v) in enumerate(self.users.items()):
-            cases[k] = self.dispatcher.sel.eq(2**i)
-        self.comb += Case(getattr(self.master.sink, self.dispatch_param), cases)
+            key    = 0
+            offset = 0
+            for param, value in zip(params, k if isinstance(k, tuple) else (k,)):
+                key    |= value << offset
+                offset += len(param)
+            cases[key] = self.dispatcher.sel.eq(2**i)
+        self.comb += Case(Cat(*params), cases)
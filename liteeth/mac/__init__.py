@@ -8,6 +8,8 @@ from liteeth.common import *
 from liteeth.mac.common import *
 from liteeth.mac.core import LiteEthMACCore
 from liteeth.mac.wishbone import LiteEthMACWishboneInterface
+from liteeth.mac.dma import LiteEthMACDMAInterface
+from liteeth.mac.filter import *
 
 # MAC ----------------------------------------------------------------------------------------------
 
@@ -20,31 +22,86 @@ class LiteEthMAC(Module, AutoCSR):
         ntxslots          = 2,
         hw_mac            = None,
         timestamp         = None,
-        full_memory_we    = False):
-        assert interface in ["crossbar", "wishbone", "hybrid"]
-        self.submodules.core = LiteEthMACCore(phy, dw, endianness, with_preamble_crc)
+        full_memory_we    = False,
+        rx_mode           = "cut-through",
+        mtu               = eth_mtu,
+        with_stats        = False,
+        with_pause        = False,
+        filter_naddresses = 4,
+        filter_hash_size  = 64,
+        with_vlan         = False,
+        rx_ring           = False,
+        tx_doorbell       = False,
+        bus_data_width    = 32,
+        bus_bursting      = False,
+        with_checksum     = False,
+        rx_queues         = 1):
+        assert interface in ["crossbar", "wishbone", "hybrid", "dma"]
+        assert mtu <= eth_jumbo_mtu
+        self.submodules.core = LiteEthMACCore(phy, dw, endianness, with_preamble_crc,
+            rx_mode          = rx_mode,
+            mtu              = mtu,
+            with_stats       = with_stats,
+            with_pause       = with_pause,
+            # PAUSE frames generated when all but one RX slots are used (Wishbone MAC).
+            pause_high_water = 0 if interface in ["crossbar", "dma"] else max(nrxslots - 1, 1),
+            mac_address      = 0 if hw_mac is None else hw_mac)
         self.csrs = []
         if interface == "crossbar":
-            self.submodules.crossbar     = LiteEthMACCrossbar(dw)
-            self.submodules.packetizer   = LiteEthMACPacketizer(dw)
-            self.submodules.depacketizer = LiteEthMACDepacketizer(dw)
+            if with_vlan:
+                # 802.1Q VLAN: tags inserted/stripped in hardware, dispatch on (ethernet_type, vlan_id).
+                self.submodules.crossbar     = LiteEthMACVLANCrossbar(dw)
+                self.submodules.packetizer   = LiteEthMACVLANPacketizer(dw)
+                self.submodules.depacketizer = LiteEthMACVLANDepacketizer(dw)
+            else:
+                self.submodules.crossbar     = LiteEthMACCrossbar(dw)
+                self.submodules.packetizer   = LiteEthMACPacketizer(dw)
+                self.submodules.depacketizer = LiteEthMACDepacketizer(dw)
             self.comb += [
                 self.crossbar.master.source.connect(self.packetizer.sink),
                 self.packetizer.source.connect(self.core.sink),
                 self.core.source.connect(self.depacketizer.sink),
                 self.depacketizer.source.connect(self.crossbar.master.sink)
             ]
+        elif interface == "dma":
+            # DMA MAC: frames in system memory, described by RX/TX descriptor rings (bus is a
+            # Wishbone master).
+            assert dw == 32
+            self.submodules.interface = LiteEthMACDMAInterface(
+                dw         = 32,
+                endianness = endianness,
+                timestamp  = timestamp,
+                mtu        = mtu,
+            )
+            self.ev, self.bus = self.interface.ev, self.interface.bus
+            self.csrs = self.interface.get_csrs() + self.core.get_csrs()
+            self.comb += self.interface.source.connect(self.core.sink)
+            self.comb += self.core.source.connect(self.interface.sink)
         else:
             # Wishbone MAC
             self.rx_slots  = CSRConstant(nrxslots)
             self.tx_slots  = CSRConstant(ntxslots)
-            self.slot_size = CSRConstant(2**bits_for(eth_mtu))
+            self.slot_size = CSRConstant(2**bits_for(mtu))
+            if rx_ring:
+                # RX frames packed in a ring buffer (of rx_ring_size bytes) instead of RX slots.
+                self.rx_ring_size = CSRConstant(nrxslots*2**bits_for(mtu))
+            if rx_queues > 1:
+                # RX queues (of rx_slots slots each) selected by the RX steering.
+                self.rx_queues = CSRConstant(rx_queues)
             wishbone_interface = LiteEthMACWishboneInterface(
-                dw         = 32,
-                nrxslots   = nrxslots,
-                ntxslots   = ntxslots,
-                endianness = endianness,
-                timestamp  = timestamp,
+                dw             = 32,
+                nrxslots       = nrxslots,
+                ntxslots       = ntxslots,
+                endianness     = endianness,
+                timestamp      = timestamp,
+                mtu            = mtu,
+                rx_ring        = rx_ring,
+                tx_doorbell    = tx_doorbell,
+                bus_data_width = bus_data_width,
+                bus_bursting   = bus_bursting,
+                # IPv4/UDP/TCP checksums verified on RX and inserted on TX.
+                checksum       = with_checksum,
+                rx_queues      = rx_queues,
             )
             # On some targets (Intel/Altera), the complex ports aren't inferred
             # as block ram, but are created with LUTs.  FullMemoryWe splits such
@@ -57,12 +114,19 @@ class LiteEthMAC(Module, AutoCSR):
                 wishbone_interface = FullMemoryWE()(wishbone_interface)
             self.submodules.interface = wishbone_interface
             self.ev, self.bus = self.interface.sram.ev, self.interface.bus
+            # Events of the RX queues 1 to rx_queues - 1 (one IRQ each).
+            self.rx_evs = self.interface.sram.rx_evs
             self.csrs = self.interface.get_csrs() + self.core.get_csrs()
+            if with_pause:
+                self.comb += self.core.pause.level.eq(self.interface.sram.level)
             if interface == "hybrid":
                 assert dw == 8
                 # Hardware MAC
                 self.submodules.crossbar     = LiteEthMACCrossbar(dw)
-                self.submodules.mac_crossbar = LiteEthMACCoreCrossbar(self.core, self.crossbar, self.interface, dw, endianness, hw_mac)
+                self.submodules.mac_crossbar = LiteEthMACCoreCrossbar(self.core, self.crossbar, self.interface, dw, endianness, hw_mac,
+                    filter_naddresses = filter_naddresses,
+                    filter_hash_size  = filter_hash_size)
+                self.csrs += self.mac_crossbar.get_csrs()
             else:
                 assert dw == 32
                 self.comb += self.interface.source.connect(self.core.sink)
@@ -73,8 +137,9 @@ class LiteEthMAC(Module, AutoCSR):
 
 # MAC Core Crossbar --------------------------------------------------------------------------------
 
-class LiteEthMACCoreCrossbar(Module):
-    def __init__(self, core, crossbar, interface, dw, endianness, hw_mac=None):
+class LiteEthMACCoreCrossbar(Module, AutoCSR):
+    def __init__(self, core, crossbar, interface, dw, endianness, hw_mac=None,
+        filter_naddresses=4, filter_hash_size=64):
         rx_ready = Signal()
         rx_valid = Signal()
 
@@ -142,17 +207,39 @@ class LiteEthMACCoreCrossbar(Module):
                 cpu_packetizer.source.connect(self.rx_pipe.sink),
             ]
 
+            # MAC filter (hw_mac frames to the hardware stack only, others to both by default)
+            self.submodules.filter = LiteEthMACFilter(
+                naddresses     = filter_naddresses,
+                hash_size      = filter_hash_size,
+                addresses      = [(hw_mac, filter_action_hw)],
+                default_action = filter_action_both)
+
+            # Steering (decided on the first word of the frames)
+            first          = Signal(reset=1)
+            action         = Signal(2)
+            action_latched = Signal(2)
+            self.comb += [
+                self.filter.address.eq(depacketizer.source.target_mac),
+                action.eq(Mux(first, self.filter.action, action_latched)),
+            ]
+            self.sync += [
+                If(first, action_latched.eq(self.filter.action)),
+                If(depacketizer.source.valid & depacketizer.source.ready,
+                    first.eq(depacketizer.source.last)
+                )
+            ]
+            to_hw  = action[0]
+            to_cpu = action[1]
+
             # RX packetizer broadcast
-            mac_match = Signal()
             self.comb += [
-                mac_match.eq(hw_mac == depacketizer.source.payload.target_mac),
-                rx_ready.eq(hw_fifo.sink.ready & (cpu_fifo.sink.ready | mac_match)),
+                rx_ready.eq((hw_fifo.sink.ready | ~to_hw) & (cpu_fifo.sink.ready | ~to_cpu)),
                 rx_valid.eq(rx_ready & depacketizer.source.valid),
                 depacketizer.source.connect(hw_fifo.sink, omit={"ready", "valid"}),
                 depacketizer.source.connect(cpu_fifo.sink, omit={"ready", "valid"}),
                 depacketizer.source.ready.eq(rx_ready),
-                hw_fifo.sink.valid.eq(rx_valid),
-                cpu_fifo.sink.valid.eq(rx_valid & ~mac_match),
+                hw_fifo.sink.valid.eq(rx_valid & to_hw),
+                cpu_fifo.sink.valid.eq(rx_valid & to_cpu),
             ]
         else:
             # RX broadcast
@@ -0,0 +1,200 @@
+#
+# This file is part of LiteEth.
+#
+# Copyright (c) 2026 AEW2015 <AEW2015@users.noreply.github.com>
+# SPDX-License-Identifier: BSD-2-Clause
+
+from liteeth.common import *
+
+# MAC Checksum Constants ---------------------------------------------------------------------------
+
+tcp_protocol = 0x06
+
+# Offsets (in bytes) in the Ethernet frame (untagged).
+checksum_ip_offset           = 14 # IPv4 header.
+checksum_ip_checksum_offset  = 24 # IPv4 header checksum.
+checksum_udp_checksum_offset = 6  # UDP checksum (from the UDP header).
+checksum_tcp_checksum_offset = 16 # TCP checksum (from the TCP header).
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def _lanes(data, nbytes, endianness):
+    # Bytes of a word, in transmission order.
+    lanes = [data[8*n:8*(n + 1)] for n in range(nbytes)]
+    return lanes[::-1] if endianness == "big" else lanes
+
+def _fold(value):
+    # 16-bit one's complement folding of a 32-bit sum.
+    return (value[:16] + value[16:]) + ((value[:16] + value[16:]) >> 16)
+
+# MAC Checksum -------------------------------------------------------------------------------------
+
+class LiteEthMACChecksum(Module):
+    """IPv4/UDP/TCP Checksums
+
+    Computes on the fly the IPv4 header checksum and the UDP/TCP checksum (including the
+    pseudo-header) of the observed frames (data words pulsed with valid, the last one with last).
+    The results are available from the cycle following the last word and until the next frame.
+
+    In "check" mode (RX), ip_ok/l4_ok report if the received checksums are correct (UDP frames
+    without checksum are considered correct). In "insert" mode (TX), the checksum fields are
+    ignored and ip_checksum/l4_checksum are the checksums to insert, tx_data being the data of the
+    word at byte offset tx_offset of the frame (tx_data_in) with the checksums inserted (when
+    enabled by ip_insert/l4_insert).
+
+    IPv4 fragments and non-IPv4 (or VLAN tagged) frames are reported with ip/l4 cleared.
+    """
+    def __init__(self, dw=32, endianness="big", mode="check"):
+        assert mode in ["check", "insert"]
+        self.valid   = Signal()
+        self.data    = Signal(dw)
+        self.last    = Signal()
+
+        self.ip          = Signal()   # IPv4 frame.
+        self.l4          = Signal()   # IPv4 (non-fragmented) UDP/TCP frame.
+        self.ip_ok       = Signal()
+        self.l4_ok       = Signal()
+        self.ip_checksum = Signal(16)
+        self.l4_checksum = Signal(16)
+
+        self.ip_insert  = Signal(reset=1)
+        self.l4_insert  = Signal(reset=1)
+        self.tx_offset  = Signal(16)
+        self.tx_data_in = Signal(dw)
+        self.tx_data    = Signal(dw)
+
+        # # #
+
+        nbytes = dw//8
+
+        # Header fields capture.
+        word      = Signal(16)
+        first     = Signal(reset=1)
+        ethertype = Signal(16)
+        ihl       = Signal(4)
+        version   = Signal(4)
+        length    = Signal(16)
+        fragment  = Signal(14) # MF flag and fragment offset.
+        protocol  = Signal(8)
+        self.sync += If(self.valid,
+            word.eq(Mux(self.last, 0, word + 1)),
+            first.eq(self.last)
+        )
+        fields = [
+            (12, ethertype[8:16]), (13, ethertype[0:8]),
+            (14, Cat(ihl, version)),
+            (16, length[8:16]),    (17, length[0:8]),
+            (20, fragment[8:14]),  (21, fragment[0:8]),
+            (23, protocol),
+        ]
+        lanes = _lanes(self.data, nbytes, endianness)
+        for offset, field in fields:
+            self.sync += If(self.valid & (word == offset//nbytes),
+                field.eq(lanes[offset%nbytes][:len(field)])
+            )
+
+        # Regions.
+        l4_start    = Signal(16)
+        l4_end      = Signal(16)
+        l4_checksum = Signal(16) # Offset of the UDP/TCP checksum.
+        udp         = Signal()
+        tcp         = Signal()
+        self.comb += [
+            udp.eq(protocol == udp_protocol),
+            tcp.eq(protocol == tcp_protocol),
+            l4_start.eq(checksum_ip_offset + 4*ihl),
+            l4_end.eq(checksum_ip_offset + length),
+            l4_checksum.eq(l4_start + Mux(udp,
+                checksum_udp_checksum_offset,
+                checksum_tcp_checksum_offset)),
+        ]
+
+        # Sums (16-bit words in network order: even offsets are the MSBs).
+        ip_sum      = Signal(32)
+        l4_sum      = Signal(32)
+        ip_word_sum = 0
+        l4_word_sum = 0
+        l4_zero     = Signal() # UDP checksum field is 0 (no checksum).
+        l4_nonzero  = Signal()
+        for n in range(nbytes):
+            pos   = Signal(16)
+            value = Signal(16)
+            in_ip = Signal()
+            in_l4 = Signal()
+            self.comb += [
+                pos.eq(word*nbytes + n),
+                value.eq(Mux(pos[0], lanes[n], lanes[n] << 8)),
+                in_ip.eq((pos >= checksum_ip_offset) & ((pos < 34) | (pos < l4_start))),
+                in_l4.eq(
+                    # Pseudo-header: protocol, source and destination addresses.
+                    (pos == 23) | ((pos >= 26) & (pos < 34)) |
+                    # UDP/TCP header and payload.
+                    ((pos >= 34) & (pos >= l4_start) & (pos < l4_end))
+                ),
+            ]
+            if mode == "insert":
+                self.comb += [
+                    If((pos == checksum_ip_checksum_offset + 0) |
+                       (pos == checksum_ip_checksum_offset + 1),
+                        in_ip.eq(0)
+                    ),
+                    If((pos >= 34) & ((pos == l4_checksum) | (pos == l4_checksum + 1)),
+                        in_l4.eq(0)
+                    )
+                ]
+            else:
+                self.sync += If(self.valid & (pos >= 34),
+                    If((pos == l4_checksum) | (pos == l4_checksum + 1),
+                        If(lanes[n] != 0, l4_nonzero.eq(1))
+                    )
+                )
+            ip_word_sum += Mux(in_ip, value, 0)
+            l4_word_sum += Mux(in_l4, value, 0)
+        self.sync += If(self.valid,
+            If(first,
+                ip_sum.eq(ip_word_sum),
+                l4_sum.eq(l4_word_sum),
+                l4_nonzero.eq(0)
+            ).Else(
+                ip_sum.eq(ip_sum + ip_word_sum),
+                l4_sum.eq(l4_sum + l4_word_sum)
+            )
+        )
+        self.comb += l4_zero.eq(udp & ~l4_nonzero)
+
+        # Results.
+        ip_fold = Signal(16)
+        l4_fold = Signal(16)
+        self.comb += [
+            ip_fold.eq(_fold(ip_sum)),
+            l4_fold.eq(_fold(l4_sum + (length - 4*ihl))), # Pseudo-header: UDP/TCP length.
+            self.ip.eq((ethertype == ethernet_type_ip) & (version == 4) & (ihl >= 5)),
+            self.l4.eq(self.ip & (fragment == 0) & (udp | tcp)),
+            self.ip_ok.eq(self.ip & (ip_fold == 0xffff)),
+            self.l4_ok.eq(self.l4 & ((l4_fold == 0xffff) | l4_zero)),
+            self.ip_checksum.eq(~ip_fold),
+            # A computed UDP checksum of 0 is transmitted as 0xffff.
+            self.l4_checksum.eq(Mux(udp & (l4_fold == 0xffff), 0xffff, ~l4_fold)),
+        ]
+
+        # Insertion.
+        tx_lanes_in = _lanes(self.tx_data_in, nbytes, endianness)
+        tx_lanes    = _lanes(self.tx_data,    nbytes, endianness)
+        for n in range(nbytes):
+            pos = Signal(16)
+            self.comb += [
+                pos.eq(self.tx_offset + n),
+                tx_lanes[n].eq(tx_lanes_in[n]),
+                If(self.ip & self.ip_insert & (pos == checksum_ip_checksum_offset + 0),
+                    tx_lanes[n].eq(self.ip_checksum[8:16])
+                ),
+                If(self.ip & self.ip_insert & (pos == checksum_ip_checksum_offset + 1),
+                    tx_lanes[n].eq(self.ip_checksum[0:8])
+                ),
+                If(self.l4 & self.l4_insert & (pos == l4_checksum + 0),
+                    tx_lanes[n].eq(self.l4_checksum[8:16])
+                ),
+                If(self.l4 & self.l4_insert & (pos == l4_checksum + 1),
+                    tx_lanes[n].eq(self.l4_checksum[0:8])
+                ),
+            ]
@@ -26,6 +26,120 @@ class LiteEthMACPacketizer(Packetizer):
             eth_phy_description(dw),
             mac_header)
 
+# MAC VLAN Packetizer/Depacketizer -----------------------------------------------------------------
+
+class LiteEthMACVLANDepacketizer(Module):
+    """802.1Q VLAN Depacketizer
+
+    Same as LiteEthMACDepacketizer but also accepts 802.1Q tagged frames: the tag is stripped and
+    decoded to vlan_tagged/vlan_pcp/vlan_id (untagged frames are decoded with a null tag).
+    """
+    def __init__(self, dw=8):
+        assert dw == 8
+        self.sink   = sink   = stream.Endpoint(eth_phy_description(dw))
+        self.source = source = stream.Endpoint(eth_mac_vlan_description(dw))
+
+        # # #
+
+        length = mac_header_length + vlan_tag_length
+        header = [Signal(8) for n in range(length)]
+        count  = Signal(max=length + 1)
+
+        def field(offset, width=2):
+            return Cat(*[header[n] for n in reversed(range(offset, offset + width))])
+
+        tagged = Signal()
+        self.comb += tagged.eq(field(12) == ethernet_type_vlan)
+
+        self.submodules.fsm = fsm = FSM(reset_state="HEADER")
+        fsm.act("HEADER",
+            sink.ready.eq(1),
+            If(sink.valid,
+                NextValue(count, count + 1),
+                If(sink.last,
+                    NextValue(count, 0)
+                ).Elif((count == (mac_header_length - 1)) &
+                       ~((header[12] == (ethernet_type_vlan >> 8)) &
+                         (sink.data  == (ethernet_type_vlan & 0xff))),
+                    # Untagged frame.
+                    NextState("COPY")
+                ).Elif(count == (length - 1),
+                    NextState("COPY")
+                )
+            )
+        )
+        self.sync += If(fsm.ongoing("HEADER") & sink.valid,
+            Case(count, {n: header[n].eq(sink.data) for n in range(length)})
+        )
+        fsm.act("COPY",
+            sink.connect(source, keep={"valid", "ready", "last", "data", "last_be", "error"}),
+            source.target_mac.eq(field(0, 6)),
+            source.sender_mac.eq(field(6, 6)),
+            If(tagged,
+                source.vlan_tagged.eq(1),
+                source.vlan_pcp.eq(field(14)[13:16]),
+                source.vlan_id.eq(field(14)[0:12]),
+                source.ethernet_type.eq(field(16)),
+            ).Else(
+                source.ethernet_type.eq(field(12)),
+            ),
+            If(sink.valid & sink.ready & sink.last,
+                NextValue(count, 0),
+                NextState("HEADER")
+            )
+        )
+
+
+class LiteEthMACVLANPacketizer(Module):
+    """802.1Q VLAN Packetizer
+
+    Same as LiteEthMACPacketizer but inserts an 802.1Q tag (with vlan_pcp/vlan_id) when
+    vlan_tagged is set.
+    """
+    def __init__(self, dw=8):
+        assert dw == 8
+        self.sink   = sink   = stream.Endpoint(eth_mac_vlan_description(dw))
+        self.source = source = stream.Endpoint(eth_phy_description(dw))
+
+        # # #
+
+        def split(value, width=2):
+            return [value[8*n:8*(n + 1)] for n in reversed(range(width))]
+
+        tci    = Cat(sink.vlan_id, C(0, 1), sink.vlan_pcp)
+        header = Array(
+            split(sink.target_mac, 6) +
+            split(sink.sender_mac, 6) +
+            split(C(ethernet_type_vlan, 16)) +
+            split(tci) +
+            split(sink.ethernet_type))
+        count = Signal(max=len(header))
+
+        self.submodules.fsm = fsm = FSM(reset_state="HEADER")
+        fsm.act("HEADER",
+            source.valid.eq(sink.valid),
+            source.data.eq(header[count]),
+            If(source.valid & source.ready,
+                NextValue(count, count + 1),
+                If(count == (12 - 1),
+                    # Skip the tag on untagged frames.
+                    If(~sink.vlan_tagged,
+                        NextValue(count, 16)
+                    )
+                ),
+                If(count == (len(header) - 1),
+                    NextValue(count, 0),
+                    NextState("COPY")
+                )
+            )
+        )
+        fsm.act("COPY",
+            sink.connect(source, keep={"valid", "ready", "last", "data", "last_be", "error"}),
+            If(sink.valid & sink.ready & sink.last,
+                NextState("HEADER")
+            )
+        )
+
 # MAC Ports ----------------------------------------------------------------------------------------
 
 class LiteEthMACMasterPort:
@@ -55,3 +169,42 @@ class LiteEthMACCrossbar(LiteEthCrossbar):
             raise ValueError("Ethernet type {0:#x} already assigned".format(ethernet_type))
         self.users[ethernet_type] = port
         return port
+
+# MAC VLAN Ports -----------------------------------------------------------------------------------
+
+class LiteEthMACVLANMasterPort:
+    def __init__(self, dw):
+        self.source = stream.Endpoint(eth_mac_vlan_description(dw))
+        self.sink   = stream.Endpoint(eth_mac_vlan_description(dw))
+
+
+class LiteEthMACVLANSlavePort:
+    def __init__(self, dw):
+        self.sink   = stream.Endpoint(eth_mac_vlan_description(dw))
+        self.source = stream.Endpoint(eth_mac_vlan_description(dw))
+
+# MAC VLAN Crossbar --------------------------------------------------------------------------------
+
+class LiteEthMACVLANCrossbar(LiteEthCrossbar):
+    """802.1Q VLAN Crossbar
+
+    Dispatches the frames on (ethernet_type, vlan_id), untagged frames having a null vlan_id.
+    User ports are standard MAC ports (the layers above are not VLAN aware): frames sent on a
+    port with a vlan_id are tagged with it.
+    """
+    def __init__(self, dw=8):
+        LiteEthCrossbar.__init__(self, LiteEthMACVLANMasterPort, ["ethernet_type", "vlan_id"], dw)
+
+    def get_port(self, ethernet_type, dw=8, vlan_id=0):
+        if (ethernet_type, vlan_id) in self.users.keys():
+            raise ValueError("Ethernet type {0:#x} already assigned on VLAN {1}".format(ethernet_type, vlan_id))
+        port       = LiteEthMACUserPort(dw)
+        vlan_port  = LiteEthMACVLANSlavePort(dw)
+        self.comb += [
+            port.sink.connect(vlan_port.sink),
+            vlan_port.sink.vlan_tagged.eq(vlan_id != 0),
+            vlan_port.sink.vlan_id.eq(vlan_id),
+            vlan_port.source.connect(port.source, omit={name for name, _ in vlan_tag_layout}),
+        ]
+        self.users[(ethernet_type, vlan_id)] = vlan_port
+        return port
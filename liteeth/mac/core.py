@@ -7,27 +7,60 @@
 # SPDX-License-Identifier: BSD-2-Clause
 
 from liteeth.common import *
-from liteeth.mac import gap, preamble, crc, padding, last_be
+from liteeth.mac import gap, preamble, crc, padding, last_be, drop, stats, pause
 from liteeth.phy.model import LiteEthPHYModel
 
 from migen.genlib.cdc import PulseSynchronizer
 
 from litex.soc.interconnect.stream import BufferizeEndpoints, DIR_SOURCE, DIR_SINK
 
+# MAC Endianness Swap ------------------------------------------------------------------------------
+
+class LiteEthMACEndiannessSwap(Module):
+    """Endianness Swap
+
+    Reverses the byte order of the words (and of last_be/error), converting between the little
+    endian order of the wide PHYs (first byte in lane 0) and big endian order.
+    """
+    def __init__(self, dw):
+        self.sink   = sink   = stream.Endpoint(eth_phy_description(dw))
+        self.source = source = stream.Endpoint(eth_phy_description(dw))
+
+        # # #
+
+        nbytes = dw//8
+        self.comb += [
+            sink.connect(source, omit={"data", "last_be", "error"}),
+            source.data.eq(Cat(*[sink.data[8*i:8*(i + 1)] for i in reversed(range(nbytes))])),
+            source.last_be.eq(sink.last_be[::-1]),
+            source.error.eq(sink.error[::-1]),
+        ]
+
 # MAC Core -----------------------------------------------------------------------------------------
 
 class LiteEthMACCore(Module, AutoCSR):
-    def __init__(self, phy, dw, endianness="big", with_preamble_crc=True, with_padding=True):
+    def __init__(self, phy, dw, endianness="big", with_preamble_crc=True, with_padding=True,
+        rx_mode="cut-through", mtu=eth_mtu, with_stats=False, with_pause=False,
+        pause_high_water=0, mac_address=0):
         if dw < phy.dw:
             raise ValueError("Core data width({}) must be larger than PHY data width({})".format(dw, phy.dw))
+        # RX mode:
+        # - cut-through:       Packets are forwarded as they are received, errored packets are
+        #                      flagged with "error" on last.
+        # - store-and-forward: Packets are buffered until received completely, errored packets
+        #                      are dropped before reaching the rest of the stack.
+        assert rx_mode in ["cut-through", "store-and-forward"]
+        # MTU: up to eth_jumbo_mtu (9000 bytes payload jumbo frames).
+        assert mtu <= eth_jumbo_mtu
 
         rx_pipeline = [phy]
         tx_pipeline = [phy]
 
-        # Interpacket gap
-        tx_gap_inserter = gap.LiteEthMACGap(phy.dw)
-        self.submodules += ClockDomainsRenamer("eth_tx")(tx_gap_inserter)
-        tx_pipeline += [tx_gap_inserter]
+        # Interpacket gap (with Deficit Idle Count on wide PHYs, inserted by the 10G PHYs)
+        if not getattr(phy, "integrated_ifg_inserter", False):
+            tx_gap_inserter = gap.LiteEthMACGap(phy.dw, dic=(8 < phy.dw <= 32))
+            self.submodules += ClockDomainsRenamer("eth_tx")(tx_gap_inserter)
+            tx_pipeline += [tx_gap_inserter]
 
         # Preamble / CRC
         if isinstance(phy, LiteEthPHYModel):
@@ -46,8 +79,12 @@ class LiteEthMACCore(Module, AutoCSR):
             self.submodules += ClockDomainsRenamer("eth_rx")(preamble_checker)
 
             # CRC insert/check
-            crc32_inserter = BufferizeEndpoints({"sink": DIR_SINK})(crc.LiteEthMACCRC32Inserter(eth_phy_description(phy.dw)))
-            crc32_checker  = BufferizeEndpoints({"sink": DIR_SINK})(crc.LiteEthMACCRC32Checker(eth_phy_description(phy.dw)))
+            if phy.dw == 8:
+                crc32_inserter = BufferizeEndpoints({"sink": DIR_SINK})(crc.LiteEthMACCRC32Inserter(eth_phy_description(phy.dw)))
+                crc32_checker  = BufferizeEndpoints({"sink": DIR_SINK})(crc.LiteEthMACCRC32Checker(eth_phy_description(phy.dw)))
+            else:
+                crc32_inserter = crc.LiteEthMACCRC32PipelinedInserter(eth_phy_description(phy.dw))
+                crc32_checker  = crc.LiteEthMACCRC32PipelinedChecker(eth_phy_description(phy.dw))
             self.submodules += ClockDomainsRenamer("eth_tx")(crc32_inserter)
             self.submodules += ClockDomainsRenamer("eth_rx")(crc32_checker)
 
@@ -78,17 +115,20 @@ class LiteEthMACCore(Module, AutoCSR):
             rx_pipeline += [padding_checker]
 
         # Delimiters
-        if dw != 8:
+        if dw != phy.dw:
             tx_last_be = last_be.LiteEthMACTXLastBE(phy.dw)
-            rx_last_be = last_be.LiteEthMACRXLastBE(phy.dw)
             self.submodules += ClockDomainsRenamer("eth_tx")(tx_last_be)
-            self.submodules += ClockDomainsRenamer("eth_rx")(rx_last_be)
             tx_pipeline += [tx_last_be]
-            rx_pipeline += [rx_last_be]
+            # Wide PHYs already provide last_be.
+            if phy.dw == 8:
+                rx_last_be = last_be.LiteEthMACRXLastBE(phy.dw)
+                self.submodules += ClockDomainsRenamer("eth_rx")(rx_last_be)
+                rx_pipeline += [rx_last_be]
 
         # Converters
         if dw != phy.dw:
-            reverse = endianness == "big"
+            # Byte order is reversed by the converter for 8-bit PHYs, by the swap for wide PHYs.
+            reverse = (endianness == "big") and (phy.dw == 8)
             tx_converter = stream.StrideConverter(
                 description_from = eth_phy_description(dw),
                 description_to   = eth_phy_description(phy.dw),
@@ -101,6 +141,27 @@ class LiteEthMACCore(Module, AutoCSR):
             self.submodules += ClockDomainsRenamer("eth_rx")(rx_converter)
             tx_pipeline += [tx_converter]
             rx_pipeline += [rx_converter]
+            if phy.dw != 8:
+                rx_last_be_filter = last_be.LiteEthMACRXLastBEFilter(dw)
+                self.submodules += ClockDomainsRenamer("eth_rx")(rx_last_be_filter)
+                rx_pipeline += [rx_last_be_filter]
+
+        # Endianness
+        if (endianness == "big") and (phy.dw != 8):
+            tx_swap = LiteEthMACEndiannessSwap(dw)
+            rx_swap = LiteEthMACEndiannessSwap(dw)
+            self.submodules += ClockDomainsRenamer("eth_tx")(tx_swap)
+            self.submodules += ClockDomainsRenamer("eth_rx")(rx_swap)
+            tx_pipeline += [tx_swap]
+            rx_pipeline += [rx_swap]
+
+        # Flow Control (802.3x PAUSE)
+        if with_pause:
+            self.submodules.pause = pause.LiteEthMACPause(dw, endianness,
+                quanta_cycles = max(pause.pause_quanta_bits//phy.dw, 1),
+                high_water    = pause_high_water,
+                mac_address   = mac_address)
+            tx_pipeline += [self.pause]
 
         # Cross Domain Crossing
         tx_cdc = stream.ClockDomainCrossing(eth_phy_description(dw), cd_from="sys",    cd_to="eth_tx", depth=32)
@@ -109,6 +170,31 @@ class LiteEthMACCore(Module, AutoCSR):
         tx_pipeline += [tx_cdc]
         rx_pipeline += [rx_cdc]
 
+        # Error Dropper
+        if rx_mode == "store-and-forward":
+            self.submodules.rx_dropper = rx_dropper = drop.LiteEthMACErrorDropper(dw,
+                depth = 2*2**log2_int(mtu, need_pow2=False)//(dw//8))
+            rx_pipeline += [rx_dropper]
+
+        # Statistics (observed in sys domain, before the Error Dropper)
+        if with_stats:
+            self.submodules.stats = stats.LiteEthMACStats(dw, endianness, mtu,
+                tx_min_length = 60 if with_padding else 0)
+            for endpoint, monitor in [(tx_cdc.sink, self.stats.tx), (rx_cdc.source, self.stats.rx)]:
+                self.comb += [
+                    endpoint.connect(monitor.sink, omit={"ready"}),
+                    monitor.sink.ready.eq(endpoint.ready),
+                ]
+            if rx_mode == "store-and-forward":
+                self.comb += self.stats.rx.drop.eq(rx_dropper.drop)
+
+        # PAUSE frames detection (observed in eth_rx domain)
+        if with_pause:
+            self.comb += [
+                rx_cdc.sink.connect(self.pause.detector.sink, omit={"ready"}),
+                self.pause.detector.sink.ready.eq(rx_cdc.sink.ready),
+            ]
+
         # Graph
         self.submodules.tx_pipeline = stream.Pipeline(*reversed(tx_pipeline))
         self.submodules.rx_pipeline = stream.Pipeline(*rx_pipeline)
@@ -7,14 +7,78 @@
 # Copyright (c) 2018 Felix Held <felix-github@felixheld.de>
 # SPDX-License-Identifier: BSD-2-Clause
 
-from functools import reduce
+from functools import reduce, lru_cache
 from operator import xor
-from collections import OrderedDict
 
 from liteeth.common import *
 
 from migen.genlib.misc import chooser, WaitTimer
 
+# MAC CRC Equations --------------------------------------------------------------------------------
+
+@lru_cache(maxsize=None)
+def _crc_matrices(data_width, width, polynom):
+    """Compute the parallel implementation of the CRC's LFSR.
+
+    The LFSR is unrolled over data_width bits with each equation packed as an integer (CRC
+    bits on the LSBs, data bits on the MSBs), equations are memoized on (data_width, width,
+    polynom) so that they are only computed once per elaboration.
+
+    Returns the (state_rows, data_rows) couple: bit i of the next CRC value is the XOR of the
+    last CRC bits selected by state_rows[i] and of the data bits selected by data_rows[i].
+    """
+    taps   = [x for x in range(width) if (1 << x) & polynom]
+    curval = [(1 << i) for i in range(width)]
+    for i in range(data_width):
+        feedback = curval.pop() ^ (1 << (width + i))
+        for j in range(width-1):
+            if j+1 in taps:
+                curval[j] ^= feedback
+        curval.insert(0, feedback)
+    state_rows = tuple(v & (2**width - 1) for v in curval)
+    data_rows  = tuple(v >> width for v in curval)
+    return state_rows, data_rows
+
+def _bits(v):
+    return [n for n in range(v.bit_length()) if (v >> n) & 1]
+
+def _gf2_mul(a, b):
+    """Product of two GF(2) matrices given as rows of bits."""
+    r = []
+    for row in a:
+        v = 0
+        for n in _bits(row):
+            v ^= b[n]
+        r.append(v)
+    return r
+
+def _gf2_pow(a, n):
+    r = [1 << i for i in range(len(a))]
+    for i in range(n):
+        r = _gf2_mul(r, a)
+    return r
+
+def _gf2_inv(a):
+    """Inverse of a GF(2) matrix given as rows of bits (Gauss-Jordan elimination)."""
+    n = len(a)
+    a = list(a)
+    r = [1 << i for i in range(n)]
+    for col in range(n):
+        pivot = [row for row in range(col, n) if (a[row] >> col) & 1][0]
+        a[col], a[pivot] = a[pivot], a[col]
+        r[col], r[pivot] = r[pivot], r[col]
+        for row in range(n):
+            if (row != col) and (a[row] >> col) & 1:
+                a[row] ^= a[col]
+                r[row] ^= r[col]
+    return r
+
+@lru_cache(maxsize=None)
+def _crc_rewind_matrices(nbytes, width, polynom):
+    """Matrices rewinding the CRC over the 0 to nbytes-1 zero bytes ending a word."""
+    byte_rows, _ = _crc_matrices(8, width, polynom)
+    return tuple(tuple(_gf2_inv(_gf2_pow(byte_rows, n))) for n in range(nbytes))
+
 # MAC CRC Engine -----------------------------------------------------------------------------------
 
 class LiteEthMACCRCEngine(Module):
@@ -48,42 +112,12 @@ class LiteEthMACCRCEngine(Module):
 
         # # #
 
-        def _optimize_eq(l):
-            """
-            remove an even numbers of XORs with the same bit
-            replace an odd number of XORs with a single XOR
-            """
-            d = OrderedDict()
-            for e in l:
-                if e in d:
-                    d[e] += 1
-                else:
-                    d[e] = 1
-            r = []
-            for key, value in d.items():
-                if value%2 != 0:
-                    r.append(key)
-            return r
-
-        # compute and optimize the parallel implementation of the CRC's LFSR
-        taps = [x for x in range(width) if (1 << x) & polynom]
-        curval = [[("state", i)] for i in range(width)]
-        for i in range(data_width):
-            feedback = curval.pop() + [("din", i)]
-            for j in range(width-1):
-                if j+1 in taps:
-                    curval[j] += feedback
-                curval[j] = _optimize_eq(curval[j])
-            curval.insert(0, feedback)
+        state_rows, data_rows = _crc_matrices(data_width, width, polynom)
 
         # implement logic
         for i in range(width):
-            xors = []
-            for t, n in curval[i]:
-                if t == "state":
-                    xors += [self.last[n]]
-                elif t == "din":
-                    xors += [self.data[n]]
+            xors  = [self.last[n] for n in _bits(state_rows[i])]
+            xors += [self.data[n] for n in _bits(data_rows[i])]
             self.comb += self.next[i].eq(reduce(xor, xors))
 
 # MAC CRC32 ----------------------------------------------------------------------------------------
@@ -131,6 +165,131 @@ class LiteEthMACCRC32(Module):
             self.error.eq(self.engine.next != self.check)
         ]
 
+# MAC CRC32 Pipelined ------------------------------------------------------------------------------
+
+class LiteEthMACCRC32Pipelined(Module):
+    """Pipelined IEEE 802.3 CRC
+
+    Implement an IEEE 802.3 CRC generator/checker for wide data paths (64/128/256-bit).
+
+    The data contribution of each word is computed by a XOR tree split in `stages` register
+    stages, only the 32-bit state update remains in the feedback loop. The bytes following the
+    last valid byte of a partial last word are zeroed and the CRC is then rewound over them.
+
+    Parameters
+    ----------
+    data_width : int
+        Width of the data bus.
+    stages : int
+        Number of register stages of the data XOR tree.
+
+    Attributes
+    ----------
+    valid : in
+        Data input valid.
+    data : in
+        Data input.
+    last : in
+        Last word of the packet.
+    last_be : in
+        Last valid byte of the last word (one-hot, 0 when the word is complete).
+    done : out
+        Pulses when the CRC of a packet is available, `latency` cycles after its last word.
+    value : out
+        CRC value (used for generator).
+    error : out
+        CRC error (used for checker).
+    """
+    width   = 32
+    polynom = 0x04C11DB7
+    init    = 2**width-1
+    check   = 0xC704DD7B
+    def __init__(self, data_width, stages=1):
+        assert data_width%8 == 0
+        nbytes = data_width//8
+
+        self.valid   = Signal()
+        self.data    = Signal(data_width)
+        self.last    = Signal()
+        self.last_be = Signal(nbytes)
+        self.done    = Signal()
+        self.value   = Signal(self.width)
+        self.error   = Signal()
+        self.latency = stages + 1
+
+        # # #
+
+        state_rows, data_rows = _crc_matrices(data_width, self.width, self.polynom)
+        rewind_rows           = _crc_rewind_matrices(nbytes, self.width, self.polynom)
+
+        # Zero the bytes following the last valid byte.
+        last_be = Signal(nbytes)
+        data    = Signal(data_width)
+        self.comb += If(self.last, last_be.eq(self.last_be))
+        self.comb += data[:8].eq(self.data[:8])
+        for i in range(1, nbytes):
+            self.comb += If(last_be[:i] == 0, data[8*i:8*(i+1)].eq(self.data[8*i:8*(i+1)]))
+
+        # Data XOR trees.
+        terms   = [[data[n] for n in _bits(data_rows[i])] for i in range(self.width)]
+        valid   = self.valid
+        last    = self.last
+        for stage in range(stages):
+            # Split the remaining terms so that each tree is reduced over the remaining stages.
+            remaining = max(len(t) for t in terms)
+            group     = 1
+            while group**(stages - stage) < remaining:
+                group += 1
+            for i in range(self.width):
+                _terms = []
+                for n in range(0, len(terms[i]), group):
+                    t = Signal()
+                    self.sync += t.eq(reduce(xor, terms[i][n:n+group]))
+                    _terms.append(t)
+                terms[i] = _terms
+            _valid   = Signal()
+            _last    = Signal()
+            _last_be = Signal(nbytes)
+            self.sync += [
+                _valid.eq(valid),
+                _last.eq(last),
+                _last_be.eq(last_be),
+            ]
+            valid, last, last_be = _valid, _last, _last_be
+        data_crc = Signal(self.width)
+        for i in range(self.width):
+            self.comb += data_crc[i].eq(reduce(xor, terms[i]))
+
+        # State update.
+        reg       = Signal(self.width, reset=self.init)
+        crc_full  = Signal(self.width)
+        crc_next  = Signal(self.width)
+        for i in range(self.width):
+            xors = [reg[n] for n in _bits(state_rows[i])] + [data_crc[i]]
+            self.comb += crc_full[i].eq(reduce(xor, xors))
+
+        # Rewind the CRC over the zeroed bytes of a partial last word.
+        cases = {}
+        for e in range(nbytes):
+            rows = rewind_rows[nbytes - 1 - e]
+            cases[2**e] = [crc_next[i].eq(reduce(xor, [crc_full[n] for n in _bits(rows[i])]))
+                for i in range(self.width)]
+        cases["default"] = crc_next.eq(crc_full)
+        self.comb += Case(last_be, cases)
+
+        self.sync += [
+            self.done.eq(0),
+            If(valid,
+                reg.eq(crc_next),
+                If(last,
+                    reg.eq(self.init),
+                    self.done.eq(1),
+                    self.value.eq(~crc_next[::-1]),
+                    self.error.eq(crc_next != self.check)
+                )
+            )
+        ]
+
 # MAC CRC Inserter ---------------------------------------------------------------------------------
 
 class LiteEthMACCRCInserter(Module):
@@ -210,6 +369,119 @@ class LiteEthMACCRC32Inserter(LiteEthMACCRCInserter):
     def __init__(self, description):
         LiteEthMACCRCInserter.__init__(self, LiteEthMACCRC32, description)
 
+# MAC CRC Pipelined Inserter -----------------------------------------------------------------------
+
+class LiteEthMACCRCPipelinedInserter(Module):
+    """Pipelined CRC Inserter
+
+    Append a CRC at the end of each packet on wide data paths (at least 32-bit).
+
+    Packets words are buffered while the CRC goes through the pipeline so that the data path
+    is only stalled when the CRC does not fit in the last word. The start of the packets is
+    delayed by the latency of the CRC so that packets are then output without bubbles.
+
+    Parameters
+    ----------
+    description : description
+        description of the dataflow.
+    stages : int
+        Number of register stages of the CRC.
+
+    Attributes
+    ----------
+    sink : in
+        Packets octets without CRC.
+    source : out
+        Packets octets with CRC.
+    """
+    def __init__(self, crc_class, description, stages=1):
+        self.sink   = sink   = stream.Endpoint(description)
+        self.source = source = stream.Endpoint(description)
+
+        # # #
+
+        dw     = len(sink.data)
+        nbytes = dw//8
+        assert nbytes >= 4
+        crc = crc_class(dw, stages)
+        self.submodules += crc
+
+        fifo_depth = crc.latency + 2
+        fifo = stream.SyncFIFO(description, fifo_depth)
+        crcs = stream.SyncFIFO([("value", crc.width)], fifo_depth + crc.latency)
+        self.submodules += fifo, crcs
+
+        self.comb += [
+            sink.connect(fifo.sink),
+            crc.valid.eq(sink.valid & sink.ready),
+            crc.data.eq(sink.data),
+            crc.last.eq(sink.last),
+            crc.last_be.eq(sink.last_be),
+            crcs.sink.valid.eq(crc.done),
+            crcs.sink.value.eq(crc.value),
+        ]
+
+        # Append CRC to the last word, CRC can overflow on an extra word.
+        data           = Signal(2*dw)
+        split          = Signal()
+        last_be        = Signal(nbytes)
+        split_last_be  = Signal(nbytes)
+        cases = {}
+        for e in range(nbytes):
+            cases[2**e] = data.eq(Cat(fifo.source.data[:8*(e+1)], crcs.source.value))
+            if (e + 1 + 4) <= nbytes:
+                cases[2**e] = [cases[2**e], last_be.eq(2**(e + 4))]
+            else:
+                cases[2**e] = [cases[2**e], split.eq(1), split_last_be.eq(2**(e + 4 - nbytes))]
+        cases["default"] = cases[2**(nbytes - 1)]
+        self.comb += Case(fifo.source.last_be, cases)
+
+        # Delay start of packet until the CRC can't be late (or is already available).
+        start = Signal(reset=1)
+        wait  = Signal()
+        self.comb += wait.eq(start & (fifo.level < (crc.latency + 1)) & ~crcs.source.valid)
+        self.sync += If(source.valid & source.ready, start.eq(source.last))
+
+        self.submodules.fsm = fsm = FSM(reset_state="COPY")
+        fsm.act("COPY",
+            fifo.source.connect(source),
+            If(wait,
+                source.valid.eq(0),
+                fifo.source.ready.eq(0)
+            ).Elif(fifo.source.last,
+                source.valid.eq(fifo.source.valid & crcs.source.valid),
+                source.data.eq(data[:dw]),
+                If(split,
+                    source.last.eq(0),
+                    source.last_be.eq(0),
+                    fifo.source.ready.eq(0),
+                    If(source.valid & source.ready,
+                        NextState("CRC")
+                    )
+                ).Else(
+                    source.last_be.eq(last_be),
+                    fifo.source.ready.eq(source.ready & crcs.source.valid),
+                    crcs.source.ready.eq(source.valid & source.ready)
+                )
+            )
+        )
+        fsm.act("CRC",
+            source.valid.eq(1),
+            source.last.eq(1),
+            source.last_be.eq(split_last_be),
+            source.data.eq(data[dw:]),
+            If(source.ready,
+                fifo.source.ready.eq(1),
+                crcs.source.ready.eq(1),
+                NextState("COPY")
+            )
+        )
+
+
+class LiteEthMACCRC32PipelinedInserter(LiteEthMACCRCPipelinedInserter):
+    def __init__(self, description, stages=1):
+        LiteEthMACCRCPipelinedInserter.__init__(self, LiteEthMACCRC32Pipelined, description, stages)
+
 # MAC CRC Checker ----------------------------------------------------------------------------------
 
 class LiteEthMACCRCChecker(Module):
@@ -298,3 +570,121 @@ class LiteEthMACCRCChecker(Module):
 class LiteEthMACCRC32Checker(LiteEthMACCRCChecker):
     def __init__(self, description):
         LiteEthMACCRCChecker.__init__(self, LiteEthMACCRC32, description)
+
+# MAC CRC Pipelined Checker ------------------------------------------------------------------------
+
+class LiteEthMACCRCPipelinedChecker(Module):
+    """Pipelined CRC Checker
+
+    Check CRC at the end of each packet on wide data paths (at least 32-bit).
+
+    Packets are forwarded as they are received, only a word is held back to be able to remove
+    the CRC when it spans two words and the last word waits for the result of the CRC.
+
+    Parameters
+    ----------
+    description : description
+        description of the dataflow.
+    stages : int
+        Number of register stages of the CRC.
+
+    Attributes
+    ----------
+    sink : in
+        Packet octets with CRC.
+    source : out
+        Packet octets without CRC and "error" set to 0
+        on last when CRC OK / set to 1 when CRC KO.
+    error : out
+        Pulses every time a CRC error is detected.
+    """
+    def __init__(self, crc_class, description, stages=1):
+        self.sink   = sink   = stream.Endpoint(description)
+        self.source = source = stream.Endpoint(description)
+
+        self.error = Signal()
+
+        # # #
+
+        dw     = len(sink.data)
+        nbytes = dw//8
+        assert nbytes >= 4
+        crc = crc_class(dw, stages)
+        self.submodules += crc
+
+        fifo_depth = crc.latency + 2
+        fifo   = stream.SyncFIFO(description, fifo_depth)
+        errors = stream.SyncFIFO([("error", 1)], fifo_depth + crc.latency + 1)
+        self.submodules += fifo, errors
+
+        self.comb += [
+            crc.valid.eq(sink.valid & sink.ready),
+            crc.data.eq(sink.data),
+            crc.last.eq(sink.last),
+            crc.last_be.eq(sink.last_be),
+            errors.sink.valid.eq(crc.done),
+            errors.sink.error.eq(crc.error),
+        ]
+
+        # Remove CRC: CRC is in the last word or spans the last two words.
+        short         = Signal()
+        last_be       = Signal(nbytes)
+        short_last_be = Signal(nbytes)
+        cases = {}
+        for e in range(nbytes):
+            if (e + 1) > 4:
+                cases[2**e] = last_be.eq(2**(e - 4))
+            else:
+                cases[2**e] = [short.eq(1), short_last_be.eq(2**(nbytes - 4 + e))]
+        cases["default"] = cases[2**(nbytes - 1)]
+        self.comb += Case(sink.last_be, cases)
+
+        held = stream.Endpoint(description)
+        self.comb += [
+            held.connect(fifo.sink, omit={"valid", "ready"}),
+            fifo.sink.valid.eq(held.valid & (held.last | sink.valid)),
+            If(~held.last & sink.valid & sink.last & short,
+                fifo.sink.last.eq(1),
+                fifo.sink.last_be.eq(short_last_be)
+            ),
+            sink.ready.eq(~held.valid | fifo.sink.ready),
+        ]
+        self.sync += [
+            If(fifo.sink.valid & fifo.sink.ready,
+                held.valid.eq(0)
+            ),
+            If(sink.valid & sink.ready,
+                held.valid.eq(1),
+                held.last.eq(sink.last),
+                held.last_be.eq(0),
+                held.data.eq(sink.data),
+                held.error.eq(sink.error),
+                If(sink.last,
+                    held.last_be.eq(last_be),
+                    If(short,
+                        If(held.valid & ~held.last,
+                            held.valid.eq(0)
+                        ).Else(
+                            held.last_be.eq(short_last_be),
+                            held.error.eq(2**nbytes - 1)
+                        )
+                    )
+                )
+            )
+        ]
+
+        self.comb += [
+            fifo.source.connect(source),
+            If(fifo.source.last,
+                source.valid.eq(fifo.source.valid & errors.source.valid),
+                source.error.eq(fifo.source.error | Replicate(errors.source.error, nbytes)),
+                fifo.source.ready.eq(source.ready & errors.source.valid),
+                errors.source.ready.eq(source.valid & source.ready)
+            ),
+            self.error.eq(errors.source.valid & errors.source.ready & errors.source.error),
+        ]
+
+
+class LiteEthMACCRC32PipelinedChecker(LiteEthMACCRCPipelinedChecker):
+    def __init__(self, description, stages=1):
+        LiteEthMACCRCPipelinedChecker.__init__(self, LiteEthMACCRC32Pipelined, description, stages)
@@ -0,0 +1,373 @@
+#
+# This file is part of LiteEth.
+#
+# Copyright (c) 2026 AEW2015 <AEW2015@users.noreply.github.com>
+# SPDX-License-Identifier: BSD-2-Clause
+
+from liteeth.common import *
+
+from litex.soc.interconnect import wishbone
+from litex.soc.interconnect.csr import *
+from litex.soc.interconnect.csr_eventmanager import *
+
+from liteeth.mac.sram import LiteEthMACIRQModeration
+
+# MAC DMA Constants --------------------------------------------------------------------------------
+
+# Descriptors (4 x 32-bit words, in system memory):
+# +0x0: Status  : Length (bits 0-15), Error (bit 30), Ownership (bit 31, set when owned by the MAC).
+# +0x4: Address : Buffer address (32-bit aligned).
+# +0x8: Timestamp (written back by the MAC when a Timestamp source is provided).
+# +0xc: Reserved.
+dma_descriptor_size = 16
+dma_length_bits     = 16
+dma_error_bit       = 30
+dma_own_bit         = 31
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def _bus_access(bus, adr, we=0, dat_w=0, ack=()):
+    # Single 32-bit access on a Wishbone master, ack statements executed on completion.
+    return [
+        bus.cyc.eq(1),
+        bus.stb.eq(1),
+        bus.we.eq(we),
+        bus.sel.eq(2**len(bus.sel) - 1),
+        bus.adr.eq(adr[2:]),
+        bus.dat_w.eq(dat_w),
+        If(bus.ack, *ack)
+    ]
+
+def _status(length, error=0, own=0):
+    return Cat(length, Replicate(0, dma_error_bit - dma_length_bits), error, own)
+
+# MAC DMA Writer -----------------------------------------------------------------------------------
+
+class LiteEthMACDMAWriter(Module, AutoCSR):
+    """DMA Writer (RX)
+
+    Writes the received frames directly to the buffers of a descriptor ring in system memory. The
+    CPU gives descriptors to the MAC by setting their ownership bit and the size of their buffer in
+    their length field; the MAC writes the frame to the buffer, writes back the descriptor with the
+    length of the frame (and its timestamp) and the ownership bit cleared and pulses the available
+    event. Frames larger than the buffer are truncated and flagged with the error bit. Frames
+    received when the current descriptor is not owned by the MAC are dropped (and counted).
+    """
+    def __init__(self, dw=32, endianness="big", timestamp=None, mtu=eth_mtu):
+        assert dw == 32
+        self.sink = sink = stream.Endpoint(eth_phy_description(dw))
+        self.bus  = bus  = wishbone.Interface()
+
+        self.enable = CSRStorage()
+        self.base   = CSRStorage(32)
+        self.size   = CSRStorage(16) # Number of descriptors.
+        self.index  = CSRStatus(16)  # Next descriptor used by the MAC.
+        self.errors = CSRStatus(32)  # Number of frames dropped.
+
+        self.submodules.ev = EventManager()
+        self.ev.available  = EventSourcePulse()
+        self.ev.finalize()
+
+        # # #
+
+        # Interrupt moderation
+        available = Signal()
+        self.submodules.irq = LiteEthMACIRQModeration(mode="pulse")
+        self.comb += [
+            self.irq.event.eq(available),
+            self.ev.available.trigger.eq(self.irq.trigger),
+        ]
+
+        # FIFO (absorbs the latency of the system memory).
+        fifo_depth = 2**log2_int(mtu, need_pow2=False)//(dw//8)
+        self.submodules.fifo = fifo = stream.SyncFIFO(eth_phy_description(dw), fifo_depth,
+            buffered=True)
+        self.comb += sink.connect(fifo.sink)
+        frame = fifo.source
+
+        # Length computation
+        inc = Signal(3)
+        if endianness == "big":
+            self.comb += If(frame.last, Case(frame.last_be, {
+                0b1000    : inc.eq(1),
+                0b0100    : inc.eq(2),
+                0b0010    : inc.eq(3),
+                "default" : inc.eq(4)
+            })).Else(inc.eq(4))
+        else:
+            self.comb += If(frame.last, Case(frame.last_be, {
+                0b0001    : inc.eq(1),
+                0b0010    : inc.eq(2),
+                0b0100    : inc.eq(3),
+                "default" : inc.eq(4)
+            })).Else(inc.eq(4))
+
+        # Descriptor Ring
+        index      = self.index.status
+        descriptor = Signal(32)
+        self.comb += descriptor.eq(self.base.storage + index*dma_descriptor_size)
+        self.sync += If(~self.enable.storage, index.eq(0))
+
+        buf_address = Signal(32)
+        buf_size    = Signal(dma_length_bits)
+        length      = Signal(dma_length_bits)
+        truncated   = Signal()
+        error       = Signal()
+        self.comb += error.eq((frame.error & frame.last_be) != 0)
+
+        # FSM
+        self.submodules.fsm = fsm = FSM(reset_state="IDLE")
+        fsm.act("IDLE",
+            If(frame.valid,
+                If(self.enable.storage & (self.size.storage != 0),
+                    NextState("READ-STATUS")
+                ).Else(
+                    NextState("DISCARD")
+                )
+            )
+        )
+        fsm.act("READ-STATUS",
+            _bus_access(bus, descriptor + 0x0, ack=[
+                NextValue(buf_size, bus.dat_r[:dma_length_bits]),
+                If(bus.dat_r[dma_own_bit],
+                    NextState("READ-ADDRESS")
+                ).Else(
+                    NextValue(self.errors.status, self.errors.status + 1),
+                    NextState("DISCARD")
+                )
+            ])
+        )
+        fsm.act("READ-ADDRESS",
+            _bus_access(bus, descriptor + 0x4, ack=[
+                NextValue(buf_address, bus.dat_r),
+                NextValue(length,      0),
+                NextValue(truncated,   0),
+                NextState("WRITE")
+            ])
+        )
+        writeback = "WRITE-TIMESTAMP" if timestamp is not None else "WRITE-STATUS"
+        terminate = [
+            If(frame.last,
+                # Errored frames are not given back, the descriptor is reused.
+                If(error,
+                    NextState("IDLE")
+                ).Else(
+                    NextState(writeback)
+                )
+            )
+        ]
+        fsm.act("WRITE",
+            If(frame.valid,
+                If(truncated | ((length + inc) > buf_size),
+                    frame.ready.eq(1),
+                    NextValue(truncated, 1),
+                    *terminate
+                ).Else(
+                    _bus_access(bus, buf_address + length, we=1, dat_w=frame.data, ack=[
+                        frame.ready.eq(1),
+                        NextValue(length, length + inc),
+                        *terminate
+                    ])
+                )
+            )
+        )
+        if timestamp is not None:
+            # Latch Timestamp on start of incoming packet.
+            frame_timestamp = Signal(len(timestamp))
+            self.sync += If(fsm.ongoing("IDLE"), frame_timestamp.eq(timestamp))
+            fsm.act("WRITE-TIMESTAMP",
+                _bus_access(bus, descriptor + 0x8, we=1, dat_w=frame_timestamp, ack=[
+                    NextState("WRITE-STATUS")
+                ])
+            )
+        fsm.act("WRITE-STATUS",
+            _bus_access(bus, descriptor + 0x0, we=1, dat_w=_status(length, truncated), ack=[
+                available.eq(1),
+                NextValue(index, Mux(index == (self.size.storage - 1), 0, index + 1)),
+                NextState("IDLE")
+            ])
+        )
+        fsm.act("DISCARD",
+            frame.ready.eq(1),
+            If(frame.valid & frame.last,
+                NextState("IDLE")
+            )
+        )
+
+# MAC DMA Reader -----------------------------------------------------------------------------------
+
+class LiteEthMACDMAReader(Module, AutoCSR):
+    """DMA Reader (TX)
+
+    Fetches the frames to transmit from the buffers of a descriptor ring in system memory. The CPU
+    fills the buffer, the length and sets the ownership bit of the descriptors and writes the start
+    CSR (doorbell); the MAC then sends the frames of all the descriptors it owns, writes them back
+    (with their timestamp) with the ownership bit cleared and pulses the done event for each of
+    them. Frames are entirely fetched before being sent to avoid underflows: descriptors with an
+    empty length or a length larger than the frame buffer (mtu, rounded up to a power of 2) are
+    given back without being sent, with the error bit set.
+    """
+    def __init__(self, dw=32, endianness="big", timestamp=None, mtu=eth_mtu):
+        assert dw == 32
+        self.source = source = stream.Endpoint(eth_phy_description(dw))
+        self.bus    = bus    = wishbone.Interface()
+
+        self.enable = CSRStorage()
+        self.base   = CSRStorage(32)
+        self.size   = CSRStorage(16) # Number of descriptors.
+        self.start  = CSR()          # Doorbell.
+        self.index  = CSRStatus(16)  # Next descriptor used by the MAC.
+
+        self.submodules.ev = EventManager()
+        self.ev.done       = EventSourcePulse()
+        self.ev.finalize()
+
+        # # #
+
+        # Interrupt moderation
+        done = Signal()
+        self.submodules.irq = LiteEthMACIRQModeration(mode="pulse")
+        self.comb += [
+            self.irq.event.eq(done),
+            self.ev.done.trigger.eq(self.irq.trigger),
+        ]
+
+        # FIFO (frame buffer).
+        fifo_depth = 2**log2_int(mtu, need_pow2=False)//(dw//8)
+        self.submodules.fifo = fifo = stream.SyncFIFO(eth_phy_description(dw), fifo_depth,
+            buffered=True)
+
+        # Descriptor Ring
+        index      = self.index.status
+        descriptor = Signal(32)
+        self.comb += descriptor.eq(self.base.storage + index*dma_descriptor_size)
+        self.sync += If(~self.enable.storage, index.eq(0))
+
+        pending       = Signal()
+        pending_clear = Signal()
+        self.sync += [
+            If(self.start.re,
+                pending.eq(1)
+            ).Elif(pending_clear,
+                pending.eq(0)
+            )
+        ]
+
+        buf_address = Signal(32)
+        length      = Signal(dma_length_bits)
+        counter     = Signal(dma_length_bits)
+        invalid     = Signal()
+        error       = Signal()
+        self.comb += invalid.eq((bus.dat_r[:dma_length_bits] == 0) |
+            (bus.dat_r[:dma_length_bits] > fifo_depth*(dw//8)))
+
+        length_lsb = length[0:2]
+        if endianness == "big":
+            self.comb += If(fifo.sink.last,
+                Case(length_lsb, {
+                    0 : fifo.sink.last_be.eq(0b0001),
+                    1 : fifo.sink.last_be.eq(0b1000),
+                    2 : fifo.sink.last_be.eq(0b0100),
+                    3 : fifo.sink.last_be.eq(0b0010)
+                }))
+        else:
+            self.comb += If(fifo.sink.last,
+                Case(length_lsb, {
+                    0 : fifo.sink.last_be.eq(0b1000),
+                    1 : fifo.sink.last_be.eq(0b0001),
+                    2 : fifo.sink.last_be.eq(0b0010),
+                    3 : fifo.sink.last_be.eq(0b0100)
+                }))
+
+        # FSM
+        self.submodules.fsm = fsm = FSM(reset_state="IDLE")
+        fsm.act("IDLE",
+            If(pending & self.enable.storage & (self.size.storage != 0),
+                NextState("READ-STATUS")
+            )
+        )
+        fsm.act("READ-STATUS",
+            _bus_access(bus, descriptor + 0x0, ack=[
+                NextValue(length, bus.dat_r[:dma_length_bits]),
+                NextValue(error,  invalid),
+                If(bus.dat_r[dma_own_bit],
+                    If(invalid,
+                        NextState("WRITE-STATUS")
+                    ).Else(
+                        NextState("READ-ADDRESS")
+                    )
+                ).Else(
+                    pending_clear.eq(1),
+                    NextState("IDLE")
+                )
+            ])
+        )
+        fsm.act("READ-ADDRESS",
+            _bus_access(bus, descriptor + 0x4, ack=[
+                NextValue(buf_address, bus.dat_r),
+                NextValue(counter,     0),
+                NextState("READ")
+            ])
+        )
+        fsm.act("READ",
+            fifo.sink.last.eq((counter + 4) >= length),
+            fifo.sink.data.eq(bus.dat_r),
+            If(fifo.sink.ready,
+                _bus_access(bus, buf_address + counter, ack=[
+                    fifo.sink.valid.eq(1),
+                    NextValue(counter, counter + 4),
+                    If(fifo.sink.last,
+                        NextState("SEND")
+                    )
+                ])
+            )
+        )
+        writeback = "WRITE-TIMESTAMP" if timestamp is not None else "WRITE-STATUS"
+        fsm.act("SEND",
+            fifo.source.connect(source),
+            If(source.valid & source.ready & source.last,
+                NextState(writeback)
+            )
+        )
+        if timestamp is not None:
+            # Latch Timestamp on start of outgoing packet.
+            frame_timestamp = Signal(len(timestamp))
+            self.sync += If(~fsm.ongoing("SEND"), frame_timestamp.eq(timestamp))
+            fsm.act("WRITE-TIMESTAMP",
+                _bus_access(bus, descriptor + 0x8, we=1, dat_w=frame_timestamp, ack=[
+                    NextState("WRITE-STATUS")
+                ])
+            )
+        fsm.act("WRITE-STATUS",
+            _bus_access(bus, descriptor + 0x0, we=1, dat_w=_status(length, error), ack=[
+                done.eq(1),
+                NextValue(index, Mux(index == (self.size.storage - 1), 0, index + 1)),
+                NextState("IDLE")
+            ])
+        )
+
+# MAC DMA ------------------------------------------------------------------------------------------
+
+class LiteEthMACDMAInterface(Module, AutoCSR):
+    """Descriptor-Ring DMA Interface
+
+    Bus-master alternative to LiteEthMACWishboneInterface: the RX and TX frames are directly
+    written to/fetched from buffers in system memory through bus (a Wishbone master), described by
+    RX and TX descriptor rings (see LiteEthMACDMAWriter and LiteEthMACDMAReader).
+    """
+    def __init__(self, dw=32, endianness="big", timestamp=None, mtu=eth_mtu):
+        assert mtu <= eth_jumbo_mtu
+        self.sink   = stream.Endpoint(eth_phy_description(dw))
+        self.source = stream.Endpoint(eth_phy_description(dw))
+        self.bus    = wishbone.Interface()
+
+        # # #
+
+        self.submodules.writer = LiteEthMACDMAWriter(dw, endianness, timestamp, mtu)
+        self.submodules.reader = LiteEthMACDMAReader(dw, endianness, timestamp, mtu)
+        self.submodules.ev     = SharedIRQ(self.writer.ev, self.reader.ev)
+        self.submodules.arbiter = wishbone.Arbiter([self.writer.bus, self.reader.bus], self.bus)
+        self.comb += [
+            self.sink.connect(self.writer.sink),
+            self.reader.source.connect(self.source),
+        ]
@@ -0,0 +1,108 @@
+#
+# This file is part of LiteEth.
+#
+# Copyright (c) 2026 AEW2015 <AEW2015@users.noreply.github.com>
+# SPDX-License-Identifier: BSD-2-Clause
+
+from liteeth.common import *
+
+# MAC Error Dropper --------------------------------------------------------------------------------
+
+class LiteEthMACErrorDropper(Module):
+    """Error Dropper
+
+    Store and forward packets, dropping the packets with an error (CRC, PHY, ...) or too large
+    to fit in the buffer before they reach the rest of the stack.
+
+    Parameters
+    ----------
+    dw : int
+        Width of the data bus.
+    depth : int
+        Depth of the buffer (in words), should be able to store at least a packet of MTU size.
+
+    Attributes
+    ----------
+    sink : in
+        Packets with "error" set on errored packets.
+    source : out
+        Packets without errors.
+    drop : out
+        Pulses every time a packet is dropped.
+    """
+    def __init__(self, dw, depth=None):
+        self.sink   = sink   = stream.Endpoint(eth_phy_description(dw))
+        self.source = source = stream.Endpoint(eth_phy_description(dw))
+
+        self.drop = Signal()
+
+        # # #
+
+        if depth is None:
+            depth = 2*buffer_depth//(dw//8)
+        depth = 2**log2_int(depth, need_pow2=False)
+        bits  = log2_int(depth)
+
+        # Buffer
+        layout = [("data", dw), ("last_be", dw//8), ("last", 1)]
+        mem    = Memory(layout_len(layout), depth)
+        wrport = mem.get_port(write_capable=True)
+        rdport = mem.get_port()
+        self.specials += mem, wrport, rdport
+
+        # Pointers (with an extra bit to differentiate full from empty).
+        wr_ptr     = Signal(bits + 1)  # Write pointer.
+        commit_ptr = Signal(bits + 1)  # End of the last valid packet.
+        rd_ptr     = Signal(bits + 1)  # Read pointer.
+
+        # Write: packets are only committed when received without errors ("error" on last).
+        overflow = Signal()
+        full     = Signal()
+        write    = Signal()
+        self.comb += [
+            sink.ready.eq(1),
+            full.eq((wr_ptr - rd_ptr)[:bits + 1] == depth),
+            write.eq(sink.valid & ~overflow & ~full),
+            wrport.adr.eq(wr_ptr[:bits]),
+            wrport.dat_w.eq(Cat(sink.data, sink.last_be, sink.last)),
+            wrport.we.eq(write),
+        ]
+        self.sync += [
+            self.drop.eq(0),
+            If(write,
+                wr_ptr.eq(wr_ptr + 1)
+            ),
+            If(sink.valid,
+                If(full,
+                    overflow.eq(1)
+                ),
+                If(sink.last,
+                    overflow.eq(0),
+                    If(overflow | full | (sink.error != 0),
+                        wr_ptr.eq(commit_ptr),
+                        self.drop.eq(1)
+                    ).Else(
+                        commit_ptr.eq(wr_ptr + 1)
+                    )
+                )
+            )
+        ]
+
+        # Read: committed packets are prefetched in a small output FIFO.
+        fifo = stream.SyncFIFO(eth_phy_description(dw), 4)
+        self.submodules += fifo
+        read       = Signal()
+        read_valid = Signal()
+        self.comb += [
+            read.eq((rd_ptr != commit_ptr) & (fifo.level < 2)),
+            rdport.adr.eq(rd_ptr[:bits]),
+            fifo.sink.valid.eq(read_valid),
+            Cat(fifo.sink.data, fifo.sink.last_be, fifo.sink.last).eq(rdport.dat_r),
+            fifo.source.connect(source),
+        ]
+        self.sync += [
+            If(read,
+                rd_ptr.eq(rd_ptr + 1)
+            ),
+            read_valid.eq(read)
+        ]
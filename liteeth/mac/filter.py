@@ -0,0 +1,105 @@
+#
+# This file is part of LiteEth.
+#
+# Copyright (c) 2026 AEW2015 <AEW2015@users.noreply.github.com>
+# SPDX-License-Identifier: BSD-2-Clause
+
+from liteeth.common import *
+from liteeth.mac.crc import LiteEthMACCRC32, LiteEthMACCRCEngine
+
+# MAC Filter Constants -----------------------------------------------------------------------------
+
+# Actions (steering of the frames): bit 0: Hardware stack, bit 1: CPU.
+filter_action_drop = 0b00
+filter_action_hw   = 0b01
+filter_action_cpu  = 0b10
+filter_action_both = 0b11
+
+# MAC Filter ---------------------------------------------------------------------------------------
+
+class LiteEthMACFilter(Module, AutoCSR):
+    """MAC Address Filter
+
+    Steers the received frames to the hardware stack, to the CPU, to both or to neither based on
+    their destination MAC address:
+    - Broadcast frames get broadcast_action.
+    - Frames matching one of the naddresses enabled exact-match entries (addressN) get the
+      actionN of the first matching entry.
+    - Multicast frames hitting the hash table get multicast_action. The table is indexed by the
+      hash_size LSBs of the IEEE 802.3 CRC32 of the address (zlib.crc32 of its 6 bytes).
+    - Other frames get default_action.
+
+    Parameters
+    ----------
+    naddresses : int
+        Number of exact-match entries.
+    hash_size : int
+        Size of the multicast hash table (64 or 512 bits).
+    addresses : list
+        Reset values of the exact-match entries as (address, action) couples, the entries are
+        enabled at reset.
+    default_action : int
+        Reset value of the default_action CSR.
+
+    Attributes
+    ----------
+    address : in
+        Destination MAC address of the frame.
+    action : out
+        Action for the frame.
+    """
+    def __init__(self, naddresses=4, hash_size=64, addresses=(), default_action=filter_action_both):
+        assert hash_size in [64, 512]
+        assert len(addresses) <= naddresses
+        self.address = Signal(48)
+        self.action  = Signal(2)
+
+        self.enable           = CSRStorage(naddresses, reset=2**len(addresses) - 1)
+        self.broadcast_action = CSRStorage(2, reset=filter_action_both)
+        self.multicast_action = CSRStorage(2, reset=filter_action_both)
+        self.default_action   = CSRStorage(2, reset=default_action)
+        self.hash_table       = CSRStorage(hash_size)
+        for n in range(naddresses):
+            address, action = addresses[n] if n < len(addresses) else (0, filter_action_drop)
+            address_name = "address{}".format(n)
+            action_name  = "action{}".format(n)
+            setattr(self, address_name, CSRStorage(48, reset=address, name=address_name))
+            setattr(self, action_name,  CSRStorage(2,  reset=action,  name=action_name))
+
+        # # #
+
+        # Broadcast/Multicast.
+        broadcast = Signal()
+        multicast = Signal()
+        self.comb += [
+            broadcast.eq(self.address == 2**48 - 1),
+            multicast.eq(self.address[40]), # I/G bit of the first byte.
+        ]
+
+        # Multicast hash: address bytes in transmission order.
+        self.submodules.crc = crc = LiteEthMACCRCEngine(
+            data_width = 48,
+            width      = LiteEthMACCRC32.width,
+            polynom    = LiteEthMACCRC32.polynom)
+        crc_value = Signal(32)
+        hash_hit  = Signal()
+        self.comb += [
+            crc.data.eq(Cat(*[self.address[8*n:8*(n + 1)] for n in reversed(range(6))])),
+            crc.last.eq(LiteEthMACCRC32.init),
+            crc_value.eq(~crc.next[::-1]),
+            hash_hit.eq((self.hash_table.storage >> crc_value[:log2_int(hash_size)])[0]),
+        ]
+
+        # Exact-match entries (first match wins).
+        action = If(broadcast, self.action.eq(self.broadcast_action.storage))
+        for n in range(naddresses):
+            address = getattr(self, "address{}".format(n)).storage
+            action = action.Elif(self.enable.storage[n] & (self.address == address),
+                self.action.eq(getattr(self, "action{}".format(n)).storage)
+            )
+        action = action.Elif(multicast & hash_hit,
+            self.action.eq(self.multicast_action.storage)
+        ).Else(
+            self.action.eq(self.default_action.storage)
+        )
+        self.comb += action
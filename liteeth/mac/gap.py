@@ -13,26 +13,75 @@ from liteeth.common import *
 # MAC Gap ------------------------------------------------------------------------------------------
 
 class LiteEthMACGap(Module):
-    def __init__(self, dw):
+    """Interpacket Gap
+
+    Inserts the interpacket gap (12 bytes) between packets. The gap is rounded up to whole words,
+    except in Deficit Idle Count (DIC) mode (up to 32-bit) where it is computed in bytes (taking
+    into account the unused bytes of the last word of the packet) and shortened by up to 3 bytes
+    (IEEE 802.3 clause 46 limit, minimum gap of 9 bytes) while keeping an average of exactly 12
+    bytes over time.
+
+    Packets always start on the first byte lane here: on 64-bit, DIC requires starting packets on
+    lane 4 and is done by the PHY (see LiteEthPHYXGMIITX).
+
+    Parameters
+    ----------
+    dw : int
+        Width of the data bus.
+    dic : bool
+        Enable Deficit Idle Count.
+    """
+    def __init__(self, dw, dic=False):
+        assert (not dic) or (dw <= 32)
         self.sink   = sink   = stream.Endpoint(eth_phy_description(dw))
         self.source = source = stream.Endpoint(eth_phy_description(dw))
 
         # # #
 
-        gap     = math.ceil(eth_interpacket_gap/(dw//8))
-        counter = Signal(max=gap, reset_less=True)
+        nbytes   = dw//8
+        max_gap  = math.ceil(eth_interpacket_gap/nbytes)
+        counter  = Signal(max=max_gap + 1, reset_less=True)
+        gap      = Signal(max=max_gap + 1)
+        next_gap = Signal(max=max_gap + 1)
+
+        if dic:
+            # Deficit (in bytes) of idle compared to the interpacket gap.
+            max_deficit  = min(nbytes - 1, 3)
+            deficit      = Signal(max=max_deficit + 1)
+            next_deficit = Signal(max=max_deficit + 1)
+
+            # Gap (in words) and new deficit for each last byte lane and deficit.
+            last_lane = Signal(max=max(nbytes, 2))
+            self.comb += last_lane.eq(nbytes - 1)
+            for i in range(nbytes):
+                self.comb += If(sink.last_be[i], last_lane.eq(i))
+            cases = {}
+            for lane in range(nbytes):
+                for d in range(max_deficit + 1):
+                    tail = nbytes - 1 - lane
+                    n    = math.ceil(max(eth_interpacket_gap - (max_deficit - d) - tail, 0)/nbytes)
+                    idle = tail + n*nbytes
+                    cases[(d << len(last_lane)) | lane] = [
+                        next_gap.eq(n),
+                        next_deficit.eq(max(d + eth_interpacket_gap - idle, 0))
+                    ]
+            self.comb += Case(Cat(last_lane, deficit), cases)
+            self.sync += If(sink.valid & sink.last & sink.ready, deficit.eq(next_deficit))
+        else:
+            self.comb += next_gap.eq(max_gap)
 
         self.submodules.fsm = fsm = FSM(reset_state="COPY")
         fsm.act("COPY",
-            NextValue(counter, 0),
+            NextValue(counter, 1),
+            NextValue(gap, next_gap),
             sink.connect(source),
-            If(sink.valid & sink.last & sink.ready,
+            If(sink.valid & sink.last & sink.ready & (next_gap != 0),
                 NextState("GAP")
             )
         )
         fsm.act("GAP",
             NextValue(counter, counter + 1),
-            If(counter == (gap-1),
+            If(counter == gap,
                 NextState("COPY")
             )
         )
@@ -19,11 +19,11 @@ class LiteEthMACTXLastBE(Module):
 
         self.submodules.fsm = fsm = FSM(reset_state="COPY")
         fsm.act("COPY",
-            sink.connect(source, omit={"last", "last_be"}),
-            source.last.eq(sink.last_be),
+            sink.connect(source, omit={"last"}),
+            source.last.eq(sink.last_be != 0),
             If(sink.valid & sink.ready,
                 # If last Byte but not last packet token.
-                If(sink.last_be & ~sink.last,
+                If((sink.last_be != 0) & ~sink.last,
                     NextState("WAIT-LAST")
                 )
             )
@@ -49,3 +49,28 @@ class LiteEthMACRXLastBE(Module):
             sink.connect(source),
             source.last_be.eq(sink.last)
         ]
+
+# MAC RX Last BE Filter ----------------------------------------------------------------------------
+
+class LiteEthMACRXLastBEFilter(Module):
+    def __init__(self, dw):
+        self.sink = sink = stream.Endpoint(eth_phy_description(dw))
+        self.source = source = stream.Endpoint(eth_phy_description(dw))
+
+        # # #
+
+        # Up-converters can leave stale last_be/error on the unused bytes of the last word:
+        # only keep the first byte enable and the errors up to it.
+        nbytes  = dw//8
+        last_be = Signal(nbytes)
+        error   = Signal(nbytes)
+        self.comb += last_be.eq(sink.last_be & (~sink.last_be + 1))
+        for i in range(nbytes):
+            self.comb += error[i].eq(sink.error[i] & ((last_be == 0) | (last_be[i:] != 0)))
+        self.comb += [
+            sink.connect(source),
+            If(sink.last,
+                source.last_be.eq(last_be),
+                source.error.eq(error)
+            )
+        ]
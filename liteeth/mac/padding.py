@@ -19,12 +19,19 @@ class LiteEthMACPaddingInserter(Module):
 
         # # #
 
-        padding_limit = math.ceil(padding/(dw/8))-1
+        nbytes          = dw//8
+        padding_limit   = math.ceil(padding/(dw/8))-1
+        padding_last_be = 2**((padding - 1)%nbytes)
 
         counter      = Signal(16)
         counter_done = Signal()
         self.comb += counter_done.eq(counter >= padding_limit)
 
+        # Bytes of the last word after last_be are replaced by padding (zeroes).
+        mask = Signal(dw)
+        for i in range(nbytes):
+            self.comb += mask[8*i:8*(i + 1)].eq(Replicate((sink.last_be == 0) | (sink.last_be[i:] != 0), 8))
+
         self.submodules.fsm = fsm = FSM(reset_state="IDLE")
         fsm.act("IDLE",
             sink.connect(source),
@@ -38,11 +45,21 @@ class LiteEthMACPaddingInserter(Module):
                         NextValue(counter, 0),
                     )
                 )
+            ),
+            If(sink.last & (sink.last_be != 0),
+                If(~counter_done,
+                    source.data.eq(sink.data & mask),
+                    source.last_be.eq(0)
+                ).Elif((counter == padding_limit) & (sink.last_be < padding_last_be),
+                    source.data.eq(sink.data & mask),
+                    source.last_be.eq(padding_last_be)
+                )
             )
         )
         fsm.act("PADDING",
             source.valid.eq(1),
             source.last.eq(counter_done),
+            source.last_be.eq(Mux(counter_done, padding_last_be, 0)),
             source.data.eq(0),
             If(source.valid & source.ready,
                 NextValue(counter, counter + 1),
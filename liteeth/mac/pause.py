@@ -0,0 +1,266 @@
+#
+# This file is part of LiteEth.
+#
+# Copyright (c) 2026 AEW2015 <AEW2015@users.noreply.github.com>
+# SPDX-License-Identifier: BSD-2-Clause
+
+from migen.genlib.cdc import MultiReg, BusSynchronizer
+
+from liteeth.common import *
+
+# MAC PAUSE Constants ------------------------------------------------------------------------------
+
+pause_mac_address = 0x0180c2000001
+pause_ethertype   = 0x8808
+pause_opcode      = 0x0001
+pause_quanta_bits = 512
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def _lanes(data, nbytes, endianness):
+    # Bytes of a word, in transmission order.
+    lanes = [data[8*n:8*(n + 1)] for n in range(nbytes)]
+    return lanes[::-1] if endianness == "big" else lanes
+
+# MAC PAUSE Detector -------------------------------------------------------------------------------
+
+class LiteEthMACPauseDetector(Module):
+    """PAUSE Detector
+
+    Passively observes the RX frames (sink, to be driven with the observed endpoint's signals,
+    including ready) and pulses pause when a valid 802.3x PAUSE frame is received, with the
+    requested pause time (in quanta of 512 bit times) on quanta. PAUSE frames are not removed
+    from the stream (upper layers ignore the MAC Control ethertype).
+    """
+    def __init__(self, dw, endianness="big"):
+        self.sink   = sink = stream.Endpoint(eth_phy_description(dw))
+        self.pause  = Signal()
+        self.quanta = Signal(16)
+
+        # # #
+
+        nbytes = dw//8
+
+        # Header capture: destination (6), source (6), ethertype (2), opcode (2), quanta (2).
+        header_bytes = 18
+        header_words = (header_bytes + nbytes - 1)//nbytes
+        word         = Signal(max=header_words + 1)
+        header       = Signal(8*header_bytes)
+        next_header  = Signal(8*header_bytes)
+        self.comb += next_header.eq(header)
+        lanes = _lanes(sink.data, nbytes, endianness)
+        for i in range(header_words):
+            for j in range(nbytes):
+                n = i*nbytes + j
+                if n < header_bytes:
+                    self.comb += If(word == i, next_header[8*n:8*(n + 1)].eq(lanes[j]))
+        self.sync += If(sink.valid & sink.ready,
+            header.eq(next_header),
+            If(sink.last,
+                word.eq(0)
+            ).Elif(word != header_words,
+                word.eq(word + 1)
+            )
+        )
+
+        def field(offset, length):
+            return Cat(*[next_header[8*n:8*(n + 1)] for n in reversed(range(offset, offset + length))])
+
+        self.sync += [
+            self.pause.eq(0),
+            If(sink.valid & sink.ready & sink.last & (sink.error == 0),
+                If((field( 0, 6) == pause_mac_address) &
+                   (field(12, 2) == pause_ethertype) &
+                   (field(14, 2) == pause_opcode),
+                    self.pause.eq(1),
+                    self.quanta.eq(field(16, 2))
+                )
+            )
+        ]
+
+# MAC PAUSE Inserter -------------------------------------------------------------------------------
+
+class LiteEthMACPauseInserter(Module):
+    """PAUSE Inserter
+
+    TX side of the 802.3x flow control:
+    - Honoring: when pause pulses, no new frame is started for quanta pause quanta (frames already
+      started are completed).
+    - Generation: while request is asserted, PAUSE frames (XOFF) with pause_time quanta are sent
+      (and refreshed at half of pause_time), a PAUSE frame with a null pause time (XON) is sent
+      when request is released. PAUSE frames are sent even when paused.
+
+    Parameters
+    ----------
+    dw : int
+        Width of the data bus.
+    endianness : str
+        Byte order of the data bus.
+    quanta_cycles : int
+        Number of clock cycles of a pause quanta (512 bit times).
+    """
+    def __init__(self, dw, endianness="big", quanta_cycles=64):
+        self.sink        = sink   = stream.Endpoint(eth_phy_description(dw))
+        self.source      = source = stream.Endpoint(eth_phy_description(dw))
+        self.pause       = Signal()
+        self.quanta      = Signal(16)
+        self.request     = Signal()
+        self.pause_time  = Signal(16)
+        self.mac_address = Signal(48)
+        self.paused      = Signal()
+
+        # # #
+
+        nbytes = dw//8
+
+        # Quanta ticks.
+        quanta_tick    = Signal()
+        quanta_counter = Signal(max=max(quanta_cycles, 2))
+        self.sync += [
+            quanta_counter.eq(quanta_counter + 1),
+            If(self.pause | (quanta_counter == (quanta_cycles - 1)),
+                quanta_counter.eq(0)
+            )
+        ]
+        self.comb += quanta_tick.eq(quanta_counter == (quanta_cycles - 1))
+
+        # Honoring.
+        pause_timer = Signal(16)
+        self.sync += [
+            If(self.pause,
+                pause_timer.eq(self.quanta)
+            ).Elif(quanta_tick & (pause_timer != 0),
+                pause_timer.eq(pause_timer - 1)
+            )
+        ]
+        self.comb += self.paused.eq(pause_timer != 0)
+
+        # Generation.
+        sent          = Signal() # XOFF sent and not released.
+        refresh_timer = Signal(16)
+        send_xoff     = Signal()
+        send_xon      = Signal()
+        send_quanta   = Signal(16)
+        self.comb += [
+            send_xoff.eq(self.request & (~sent | (refresh_timer == 0))),
+            send_xon.eq(~self.request & sent),
+        ]
+        self.sync += If(quanta_tick & (refresh_timer != 0), refresh_timer.eq(refresh_timer - 1))
+
+        # PAUSE frame (padded to 60 bytes).
+        frame = []
+        frame += [C(b, 8) for b in pause_mac_address.to_bytes(6, byteorder="big")]
+        frame += [self.mac_address[8*n:8*(n + 1)] for n in reversed(range(6))]
+        frame += [C(b, 8) for b in pause_ethertype.to_bytes(2, byteorder="big")]
+        frame += [C(b, 8) for b in pause_opcode.to_bytes(2, byteorder="big")]
+        frame += [send_quanta[8:16], send_quanta[0:8]]
+        frame += [C(0, 8)]*(eth_min_len + 14 - len(frame))
+        frame_words  = (len(frame) + nbytes - 1)//nbytes
+        frame_last   = len(frame) - (frame_words - 1)*nbytes
+        frame_cases  = {}
+        for i in range(frame_words):
+            chunk = frame[i*nbytes:(i + 1)*nbytes]
+            chunk = chunk + [C(0, 8)]*(nbytes - len(chunk))
+            frame_cases[i] = source.data.eq(Cat(*(chunk[::-1] if endianness == "big" else chunk)))
+        if endianness == "big":
+            frame_last_be = 2**(nbytes - frame_last)
+        else:
+            frame_last_be = 2**(frame_last - 1)
+
+        counter = Signal(max=max(frame_words, 2))
+        self.submodules.fsm = fsm = FSM(reset_state="IDLE")
+        fsm.act("IDLE",
+            If(send_xoff | send_xon,
+                NextValue(send_quanta, Mux(send_xoff, self.pause_time, 0)),
+                NextValue(counter, 0),
+                NextState("PAUSE")
+            ).Elif(~self.paused,
+                sink.connect(source),
+                If(sink.valid & sink.ready & ~sink.last,
+                    NextState("COPY")
+                )
+            )
+        )
+        fsm.act("COPY",
+            sink.connect(source),
+            If(sink.valid & sink.ready & sink.last,
+                NextState("IDLE")
+            )
+        )
+        fsm.act("PAUSE",
+            source.valid.eq(1),
+            Case(counter, frame_cases),
+            If(counter == (frame_words - 1),
+                source.last.eq(1),
+                source.last_be.eq(frame_last_be)
+            ),
+            If(source.ready,
+                NextValue(counter, counter + 1),
+                If(source.last,
+                    NextValue(sent, send_quanta != 0),
+                    NextValue(refresh_timer, send_quanta[1:]),
+                    NextState("IDLE")
+                )
+            )
+        )
+
+# MAC PAUSE ----------------------------------------------------------------------------------------
+
+class LiteEthMACPause(Module, AutoCSR):
+    """802.3x Flow Control
+
+    PAUSE frames detection (on the RX stream, in "eth_rx" domain), honoring and generation (on the
+    TX stream, in "eth_tx" domain).
+
+    PAUSE frames are generated when level (in "sys" domain, for example the level of the SRAM
+    Writer's status FIFO or of a user-port FIFO) reaches the high_water CSR and until it falls
+    below it.
+
+    Parameters
+    ----------
+    dw : int
+        Width of the data bus.
+    endianness : str
+        Byte order of the data bus.
+    quanta_cycles : int
+        Number of "eth_tx" clock cycles of a pause quanta (512 bit times).
+    high_water : int
+        Reset value of the high_water CSR (0 disables PAUSE frames generation).
+    mac_address : int
+        Reset value of the mac_address CSR (source address of the generated PAUSE frames).
+    """
+    def __init__(self, dw, endianness="big", quanta_cycles=64, high_water=0, mac_address=0):
+        self.level = Signal(16)
+
+        self.pause_time  = CSRStorage(16, reset=0xffff)
+        self.high_water  = CSRStorage(16, reset=high_water)
+        self.mac_address = CSRStorage(48, reset=mac_address)
+
+        # # #
+
+        self.submodules.detector = detector = ClockDomainsRenamer("eth_rx")(
+            LiteEthMACPauseDetector(dw, endianness))
+        self.submodules.inserter = inserter = ClockDomainsRenamer("eth_tx")(
+            LiteEthMACPauseInserter(dw, endianness, quanta_cycles))
+        self.sink, self.source = inserter.sink, inserter.source
+
+        # RX -> TX: pause requests (with a sequence number to detect new requests).
+        seq = Signal(4)
+        self.sync.eth_rx += If(detector.pause, seq.eq(seq + 1))
+        self.submodules.pause_sync = pause_sync = BusSynchronizer(4 + 16, "eth_rx", "eth_tx")
+        seq_tx = Signal(4)
+        self.comb += [
+            pause_sync.i.eq(Cat(seq, detector.quanta)),
+            inserter.pause.eq(pause_sync.o[:4] != seq_tx),
+            inserter.quanta.eq(pause_sync.o[4:]),
+        ]
+        self.sync.eth_tx += seq_tx.eq(pause_sync.o[:4])
+
+        # Sys -> TX: generation request and configuration.
+        request = Signal()
+        self.sync += request.eq((self.high_water.storage != 0) & (self.level >= self.high_water.storage))
+        self.specials += [
+            MultiReg(request,                  inserter.request,     "eth_tx"),
+            MultiReg(self.pause_time.storage,  inserter.pause_time,  "eth_tx"),
+            MultiReg(self.mac_address.storage, inserter.mac_address, "eth_tx"),
+        ]
@@ -15,7 +15,8 @@ from migen.genlib.misc import chooser
 class LiteEthMACPreambleInserter(Module):
     """Preamble inserter
 
-    Inserts preamble at the beginning of each packet.
+    Inserts preamble at the beginning of each packet. On 32/64-bit data widths, the preamble
+    starts in lane 0 and the SFD ends the last preamble word (as required by XGMII).
 
     Attributes
     ----------
@@ -25,27 +26,21 @@ class LiteEthMACPreambleInserter(Module):
         Preamble, SFD, and packet octets.
     """
     def __init__(self, dw):
+        assert dw in [8, 16, 32, 64]
         self.sink   = stream.Endpoint(eth_phy_description(dw))
         self.source = stream.Endpoint(eth_phy_description(dw))
 
         # # #
 
         preamble = Signal(64, reset=eth_preamble)
-        count    = Signal(max=(64//dw)-1, reset_less=True)
-        self.submodules.fsm = fsm = FSM(reset_state="IDLE")
-        fsm.act("IDLE",
-            self.sink.ready.eq(1),
-            NextValue(count, 0),
-            If(self.sink.valid,
-                self.sink.ready.eq(0),
-                NextState("PREAMBLE"),
-            )
-        )
+        count    = Signal(max=max(64//dw, 2), reset_less=True)
+        self.submodules.fsm = fsm = FSM(reset_state="PREAMBLE")
         fsm.act("PREAMBLE",
-            self.source.valid.eq(1),
+            self.source.valid.eq(self.sink.valid),
             chooser(preamble, count, self.source.data),
-            If(self.source.ready,
+            If(self.sink.valid & self.source.ready,
                 If(count == (64//dw)-1,
+                    NextValue(count, 0),
                     NextState("COPY")
                 ).Else(
                     NextValue(count, count + 1)
@@ -60,7 +55,7 @@ class LiteEthMACPreambleInserter(Module):
             self.sink.connect(self.source, omit={"data", "last_be"}),
 
             If(self.sink.valid & self.sink.last & self.source.ready,
-                NextState("IDLE"),
+                NextState("PREAMBLE"),
             )
         )
 
@@ -69,7 +64,9 @@ class LiteEthMACPreambleInserter(Module):
 class LiteEthMACPreambleChecker(Module):
     """Preamble checker
 
-    Detects preamble at the beginning of each packet.
+    Detects preamble at the beginning of each packet. On 32/64-bit data widths, the preamble
+    is expected to start in lane 0 (as done by XGMII PHYs) and the SFD to end the last preamble
+    word: packets with an invalid SFD are dropped.
 
     Attributes
     ----------
@@ -81,7 +78,7 @@ class LiteEthMACPreambleChecker(Module):
         Pulses every time a preamble error is detected.
     """
     def __init__(self, dw):
-        assert dw == 8
+        assert dw in [8, 16, 32, 64]
         self.sink   = sink   = stream.Endpoint(eth_phy_description(dw))
         self.source = source = stream.Endpoint(eth_phy_description(dw))
 
@@ -90,13 +87,42 @@ class LiteEthMACPreambleChecker(Module):
         # # #
 
         self.submodules.fsm = fsm = FSM(reset_state="PREAMBLE")
-        fsm.act("PREAMBLE",
-            sink.ready.eq(1),
-            If(sink.valid & ~sink.last & (sink.data == (eth_preamble >> 56)),
-                NextState("COPY")
-            ),
-            If(sink.valid & sink.last, self.error.eq(1))
-        )
+        if dw == 8:
+            fsm.act("PREAMBLE",
+                sink.ready.eq(1),
+                If(sink.valid & ~sink.last & (sink.data == (eth_preamble >> 56)),
+                    NextState("COPY")
+                ),
+                If(sink.valid & sink.last, self.error.eq(1))
+            )
+        else:
+            count = Signal(max=max(64//dw, 2), reset_less=True)
+            sfd   = Signal()
+            self.comb += sfd.eq(sink.data[-8:] == (eth_preamble >> 56))
+            fsm.act("PREAMBLE",
+                sink.ready.eq(1),
+                If(sink.valid,
+                    NextValue(count, count + 1),
+                    If(sink.last,
+                        NextValue(count, 0),
+                        self.error.eq(1)
+                    ).Elif(count == (64//dw)-1,
+                        NextValue(count, 0),
+                        If(sfd,
+                            NextState("COPY")
+                        ).Else(
+                            self.error.eq(1),
+                            NextState("DROP")
+                        )
+                    )
+                )
+            )
+            fsm.act("DROP",
+                sink.ready.eq(1),
+                If(sink.valid & sink.last,
+                    NextState("PREAMBLE")
+                )
+            )
         self.comb += [
             source.data.eq(sink.data),
             source.last_be.eq(sink.last_be)
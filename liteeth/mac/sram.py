@@ -7,16 +7,96 @@
 # SPDX-License-Identifier: BSD-2-Clause
 
 from liteeth.common import *
+from liteeth.mac.checksum import LiteEthMACChecksum
+from liteeth.mac.steering import LiteEthMACRXSteering
 
 from litex.soc.interconnect.csr import *
 from litex.soc.interconnect.csr_eventmanager import *
 
+# Helpers ------------------------------------------------------------------------------------------
+
+def _mem_write(port, address, data, we, ratio):
+    # Write of a data word at (data word) address in a memory of ratio data words width.
+    lanebits = log2_int(ratio)
+    return [
+        port.adr.eq(address[lanebits:]),
+        port.dat_w.eq(Replicate(data, ratio)),
+        If(we,
+            port.we.eq(2**len(port.we) - 1 if ratio == 1 else C(1, ratio) << address[:lanebits])
+        )
+    ]
+
+# MAC IRQ Moderation -------------------------------------------------------------------------------
+
+class LiteEthMACIRQModeration(Module, AutoCSR):
+    """Interrupt Moderation
+
+    Delays the trigger of an event until frames events are pending or until timeout clock cycles
+    elapsed since the first pending event, whichever comes first. The reset configuration
+    (frames = 1) triggers on each event.
+
+    In "level" mode, the number of pending events is provided on level and trigger is kept
+    asserted until all the pending events are handled (level is 0). In "pulse" mode, events are
+    pulsed on event and trigger pulses once for all the events since the previous pulse.
+
+    Attributes
+    ----------
+    level : in
+        Number of pending events ("level" mode).
+    event : in
+        Event pulse ("pulse" mode).
+    trigger : out
+        Moderated trigger of the event.
+    """
+    def __init__(self, level_bits=16, mode="level"):
+        assert mode in ["level", "pulse"]
+        self.level   = Signal(level_bits)
+        self.event   = Signal()
+        self.trigger = Signal()
+
+        self.frames  = CSRStorage(level_bits, reset=1)
+        self.timeout = CSRStorage(32) # In clock cycles, 0 disables the timeout.
+
+        # # #
+
+        if mode == "pulse":
+            self.sync += [
+                If(self.trigger,
+                    self.level.eq(self.event)
+                ).Elif(self.event,
+                    self.level.eq(self.level + 1)
+                )
+            ]
+
+        timer   = Signal(32)
+        expired = Signal()
+        fired   = Signal()
+        self.comb += [
+            expired.eq((self.timeout.storage != 0) & (timer >= self.timeout.storage)),
+            self.trigger.eq((self.level != 0) &
+                (fired | expired | (self.level >= self.frames.storage))),
+        ]
+        self.sync += [
+            If(self.level == 0,
+                timer.eq(0),
+                fired.eq(0)
+            ).Elif(~expired,
+                timer.eq(timer + 1)
+            )
+        ]
+        if mode == "level":
+            self.sync += If(self.trigger, fired.eq(1))
+        else:
+            self.sync += If(self.trigger, timer.eq(0))
+
 # MAC SRAM Writer ----------------------------------------------------------------------------------
 
 class LiteEthMACSRAMWriter(Module, AutoCSR):
-    def __init__(self, dw, depth, nslots=2, endianness="big", timestamp=None):
+    def __init__(self, dw, depth, nslots=2, endianness="big", timestamp=None, mtu=eth_mtu,
+        mem_dw=32, checksum=False):
         self.sink      = sink = stream.Endpoint(eth_phy_description(dw))
         self.crc_error = Signal()
+        self.level     = Signal(bits_for(nslots)) # Number of slots waiting to be read.
 
         slotbits      = max(log2_int(nslots), 1)
         lengthbits    = 32
@@ -31,6 +111,10 @@ class LiteEthMACSRAMWriter(Module, AutoCSR):
             timestampbits   = len(timestamp)
             self._timestamp = CSRStatus(timestampbits)
 
+        if checksum:
+            # Checksums status of the packets (IPv4, IPv4 OK, UDP/TCP, UDP/TCP OK).
+            self._checksum = CSRStatus(4)
+
         self.submodules.ev = EventManager()
         self.ev.available  = EventSourceLevel()
         self.ev.finalize()
@@ -71,9 +155,19 @@ class LiteEthMACSRAMWriter(Module, AutoCSR):
         stat_fifo_layout = [("slot", slotbits), ("length", lengthbits)]
         if timestamp is not None:
             stat_fifo_layout += [("timestamp", timestampbits)]
+        if checksum:
+            stat_fifo_layout += [("checksum", 4)]
 
         stat_fifo = stream.SyncFIFO(stat_fifo_layout, nslots)
         self.submodules += stat_fifo
+        self.comb += self.level.eq(stat_fifo.level)
+
+        # Interrupt moderation
+        self.submodules.irq = LiteEthMACIRQModeration(len(stat_fifo.level))
+        self.comb += [
+            self.irq.level.eq(stat_fifo.level),
+            self.ev.available.trigger.eq(self.irq.trigger),
+        ]
 
         # FSM
         self.submodules.fsm = fsm = FSM(reset_state="IDLE")
@@ -92,7 +186,7 @@ class LiteEthMACSRAMWriter(Module, AutoCSR):
         )
         fsm.act("WRITE",
             If(sink.valid,
-                If(counter == eth_mtu,
+                If(counter >= mtu,
                     NextState("DISCARD_REMAINING")
                 ).Else(
                     NextValue(counter, counter + inc),
@@ -130,7 +224,6 @@ class LiteEthMACSRAMWriter(Module, AutoCSR):
 
         self.comb += [
             stat_fifo.source.ready.eq(self.ev.available.clear),
-            self.ev.available.trigger.eq(stat_fifo.source.valid),
             self._slot.status.eq(stat_fifo.source.slot),
             self._length.status.eq(stat_fifo.source.length),
         ]
@@ -138,42 +231,270 @@ class LiteEthMACSRAMWriter(Module, AutoCSR):
             # Latch Timestamp on start of incoming packet.
             self.sync += If(start, stat_fifo.sink.timestamp.eq(timestamp))
             self.comb += self._timestamp.status.eq(stat_fifo.source.timestamp)
+        if checksum:
+            # Checksums verified on the fly (results available on TERMINATE).
+            self.submodules.checksum = LiteEthMACChecksum(dw, endianness, mode="check")
+            self.comb += [
+                self.checksum.valid.eq(sink.valid & sink.ready),
+                self.checksum.data.eq(sink.data),
+                self.checksum.last.eq(sink.last),
+                stat_fifo.sink.checksum.eq(Cat(
+                    self.checksum.ip, self.checksum.ip_ok,
+                    self.checksum.l4, self.checksum.l4_ok)),
+                self._checksum.status.eq(stat_fifo.source.checksum),
+            ]
 
-        # Memory
+        # Memory (mem_dw wide, for the Wishbone interface).
+        ratio = mem_dw//dw
         mems  = [None]*nslots
         ports = [None]*nslots
         for n in range(nslots):
-            mems[n] = Memory(dw, depth)
-            ports[n] = mems[n].get_port(write_capable=True)
+            mems[n] = Memory(mem_dw, (depth + ratio - 1)//ratio)
+            ports[n] = mems[n].get_port(write_capable=True, we_granularity=0 if ratio == 1 else dw)
             self.specials += ports[n]
         self.mems = mems
 
         cases = {}
         for n, port in enumerate(ports):
-            cases[n] = [
-                ports[n].adr.eq(counter[2:]),
-                ports[n].dat_w.eq(sink.data),
-                If(sink.valid & ongoing,
-                    ports[n].we.eq(0xf)
+            cases[n] = _mem_write(ports[n], counter[2:], sink.data, sink.valid & ongoing, ratio)
+        self.comb += Case(slot, cases)
+
+# MAC SRAM Ring Writer -----------------------------------------------------------------------------
+
+class LiteEthMACSRAMRingWriter(Module, AutoCSR):
+    """SRAM Ring Writer
+
+    Alternative to LiteEthMACSRAMWriter storing the received frames back-to-back in a single
+    memory of depth words used as a ring buffer (so burst absorption scales with the total number
+    of bytes rather than with the number of frames). Each frame is preceded by a header: a length
+    word (and timestamp words when a Timestamp source is provided), with the frame data starting
+    on the next word.
+
+    The MAC updates wr_ptr (word address of the next frame) when a frame is complete, software
+    reads the frames from rd_ptr and advances rd_ptr past the handled frames (the available event
+    stays asserted while frames are pending). The pending frames are tracked from the pointers
+    (the end of each committed frame is queued and retired once rd_ptr reaches it), so rd_ptr can
+    be written at any time (no frame consumed, or several frames at once). Frames that do not fit
+    in the free space are dropped (and counted in errors).
+
+    With checksum, the checksums status of the frame is reported in bits 16-19 of the length word
+    (IPv4, IPv4 checksum OK, UDP/TCP, UDP/TCP checksum OK).
+    """
+    def __init__(self, dw, depth, endianness="big", timestamp=None, mtu=eth_mtu, mem_dw=32,
+        checksum=False):
+        assert dw == 32
+        assert depth == 2**log2_int(depth)
+        self.sink      = sink = stream.Endpoint(eth_phy_description(dw))
+        self.crc_error = Signal()
+        self.level     = Signal(16) # Number of frames waiting to be read.
+
+        ptrbits      = log2_int(depth)
+        header_words = 1
+        if timestamp is not None:
+            timestampbits = len(timestamp)
+            header_words += (timestampbits + 31)//32
+        assert 4*(depth - header_words - 1) >= mtu
+
+        self._wr_ptr = CSRStatus(ptrbits)
+        self._rd_ptr = CSRStorage(ptrbits)
+        self._errors = CSRStatus(32)
+
+        self.submodules.ev = EventManager()
+        self.ev.available  = EventSourceLevel()
+        self.ev.finalize()
+
+        # # #
+
+        # Packet dropped if no space available
+        sink.ready.reset = 1
+
+        # Length computation
+        inc = Signal(3)
+        if endianness == "big":
+            self.comb += Case(sink.last_be, {
+                0b1000    : inc.eq(1),
+                0b0100    : inc.eq(2),
+                0b0010    : inc.eq(3),
+                "default" : inc.eq(4)
+            })
+        else:
+            self.comb += Case(sink.last_be, {
+                0b0001    : inc.eq(1),
+                0b0010    : inc.eq(2),
+                0b0100    : inc.eq(3),
+                "default" : inc.eq(4)
+            })
+
+        counter = Signal(16)
+
+        # Pointers
+        wr_ptr = self._wr_ptr.status
+        rd_ptr = self._rd_ptr.storage
+        free   = Signal(ptrbits) # Free words (one word kept empty to distinguish full from empty).
+        offset = Signal(ptrbits) # Offset of the current word from wr_ptr.
+        self.comb += [
+            free.eq(rd_ptr - wr_ptr - 1),
+            offset.eq(header_words + counter[2:]),
+        ]
+
+        # Pending frames (end pointers of the committed frames, retired once reached by rd_ptr).
+        # Frames use at least header_words + 1 words of the ring, bounding the pending frames.
+        commit     = Signal()
+        cons_ptr   = Signal(ptrbits) # Start of the oldest pending frame.
+        frames     = stream.SyncFIFO([("ptr", ptrbits)], depth//(header_words + 1))
+        self.submodules += frames
+        rd_offset  = Signal(ptrbits)
+        end_offset = Signal(ptrbits)
+        self.comb += [
+            frames.sink.valid.eq(commit),
+            frames.sink.ptr.eq(wr_ptr + header_words + (counter + 3)[2:]),
+            rd_offset.eq(rd_ptr - cons_ptr),
+            end_offset.eq(frames.source.ptr - cons_ptr),
+            frames.source.ready.eq(rd_offset >= end_offset),
+            self.level.eq(frames.level),
+        ]
+        self.sync += If(frames.source.valid & frames.source.ready,
+            cons_ptr.eq(frames.source.ptr)
+        )
+
+        # Interrupt moderation
+        self.submodules.irq = LiteEthMACIRQModeration(len(self.level))
+        self.comb += [
+            self.irq.level.eq(self.level),
+            self.ev.available.trigger.eq(self.irq.trigger),
+        ]
+
+        # FSM
+        start   = Signal()
+        ongoing = Signal()
+        error   = Signal()
+        self.comb += error.eq((sink.error & sink.last_be) != 0)
+        write = [
+            If(sink.valid,
+                If(sink.last,
+                    If(error,
+                        NextValue(counter, 0),
+                        NextState("IDLE")
+                    ).Else(
+                        NextState("HEADER")
+                    )
+                ),
+                If(counter >= mtu,
+                    If(~sink.last,
+                        NextState("DISCARD_REMAINING")
+                    )
+                ).Elif(offset >= free,
+                    NextValue(self._errors.status, self._errors.status + 1),
+                    NextValue(counter, 0),
+                    If(sink.last,
+                        NextState("IDLE")
+                    ).Else(
+                        NextState("DROP")
+                    )
+                ).Else(
+                    ongoing.eq(1),
+                    NextValue(counter, counter + inc)
                 )
+            )
+        ]
+        self.submodules.fsm = fsm = FSM(reset_state="IDLE")
+        fsm.act("IDLE",
+            If(sink.valid,
+                start.eq(1),
+                NextState("WRITE")
+            ),
+            *write
+        )
+        fsm.act("WRITE", *write)
+        fsm.act("DISCARD_REMAINING",
+            If(sink.valid & sink.last,
+                NextState("HEADER")
+            )
+        )
+        fsm.act("DROP",
+            If(sink.valid & sink.last,
+                NextState("IDLE")
+            )
+        )
+
+        # Header
+        header         = Signal(32*header_words)
+        header_count   = Signal(max=max(header_words, 2))
+        header_data    = Signal(32)
+        header_address = Signal(ptrbits)
+        data_address   = Signal(ptrbits)
+        self.comb += header[:16].eq(counter)
+        if timestamp is not None:
+            # Latch Timestamp on start of incoming packet.
+            self.sync += If(start, header[32:32 + timestampbits].eq(timestamp))
+        if checksum:
+            # Checksums verified on the fly (results available on HEADER).
+            self.submodules.checksum = LiteEthMACChecksum(dw, endianness, mode="check")
+            self.comb += [
+                self.checksum.valid.eq(sink.valid & sink.ready),
+                self.checksum.data.eq(sink.data),
+                self.checksum.last.eq(sink.last),
+                header[16:20].eq(Cat(
+                    self.checksum.ip, self.checksum.ip_ok,
+                    self.checksum.l4, self.checksum.l4_ok)),
             ]
-        self.comb += Case(slot, cases)
+        fsm.act("HEADER",
+            sink.ready.eq(0),
+            NextValue(header_count, header_count + 1),
+            If(header_count == (header_words - 1),
+                NextValue(header_count, 0),
+                NextValue(counter, 0),
+                NextValue(wr_ptr, wr_ptr + header_words + (counter + 3)[2:]),
+                commit.eq(1),
+                NextState("IDLE")
+            )
+        )
+
+        # Memory (mem_dw wide, for the Wishbone interface).
+        ratio = mem_dw//dw
+        mem   = Memory(mem_dw, depth//ratio)
+        port  = mem.get_port(write_capable=True, we_granularity=0 if ratio == 1 else dw)
+        self.specials += port
+        self.mems = [mem]
+
+        header_cases = {}
+        for n in range(header_words):
+            header_cases[n] = header_data.eq(header[32*n:32*(n + 1)])
+        self.comb += [
+            Case(header_count, header_cases),
+            If(fsm.ongoing("HEADER"),
+                _mem_write(port, header_address, header_data, 1, ratio)
+            ).Else(
+                _mem_write(port, data_address, sink.data, sink.valid & ongoing, ratio)
+            ),
+            header_address.eq(wr_ptr + header_count),
+            data_address.eq(wr_ptr + offset),
+        ]
 
 # MAC SRAM Reader ----------------------------------------------------------------------------------
 
 class LiteEthMACSRAMReader(Module, AutoCSR):
-    def __init__(self, dw, depth, nslots=2, endianness="big", timestamp=None):
+    def __init__(self, dw, depth, nslots=2, endianness="big", timestamp=None, doorbell=False,
+        mem_dw=32, checksum=False):
         self.source = source = stream.Endpoint(eth_phy_description(dw))
 
         slotbits        = max(log2_int(nslots), 1)
         lengthbits      = bits_for(depth*4)  # length in bytes
         self.lengthbits = lengthbits
 
-        self._start  = CSR()
-        self._ready  = CSRStatus()
-        self._level  = CSRStatus(log2_int(nslots) + 1)
-        self._slot   = CSRStorage(slotbits,   reset_less=True)
-        self._length = CSRStorage(lengthbits, reset_less=True)
+        if doorbell:
+            # Doorbell mode: the slots are used as a ring, software fills the slots (length in
+            # the first word, followed by the packet) and submits them all at once by advancing
+            # the tail pointer, the MAC reports the completions by advancing the head pointer.
+            ptrbits    = log2_int(nslots) + 1
+            self._tail = CSRStorage(ptrbits) # Next slot to be filled by software.
+            self._head = CSRStatus(ptrbits)  # Next slot to be sent by the MAC.
+        else:
+            self._start  = CSR()
+            self._ready  = CSRStatus()
+            self._level  = CSRStatus(log2_int(nslots) + 1)
+            self._slot   = CSRStorage(slotbits,   reset_less=True)
+            self._length = CSRStorage(lengthbits, reset_less=True)
 
         if timestamp is not None:
             # Timestamp the outgoing packets when a Timestamp source is provided
@@ -182,6 +503,10 @@ class LiteEthMACSRAMReader(Module, AutoCSR):
             self._timestamp_slot = CSRStatus(slotbits)
             self._timestamp      = CSRStatus(timestampbits)
 
+        if checksum:
+            # Checksums insertion enables: IPv4 (bit 0), UDP/TCP (bit 1).
+            self._checksum = CSRStorage(2)
+
         self.submodules.ev = EventManager()
         self.ev.done       = EventSourcePulse() if timestamp is None else EventSourceLevel()
         self.ev.finalize()
@@ -190,16 +515,33 @@ class LiteEthMACSRAMReader(Module, AutoCSR):
 
         start = Signal()
 
-        # Command FIFO
-        cmd_fifo = stream.SyncFIFO([("slot", slotbits), ("length", lengthbits)], nslots)
-        self.submodules += cmd_fifo
-        self.comb += [
-            cmd_fifo.sink.valid.eq(self._start.re),
-            cmd_fifo.sink.slot.eq(self._slot.storage),
-            cmd_fifo.sink.length.eq(self._length.storage),
-            self._ready.status.eq(cmd_fifo.sink.ready),
-            self._level.status.eq(cmd_fifo.level)
-        ]
+        # Commands
+        cmd_valid  = Signal()
+        cmd_ready  = Signal()
+        cmd_slot   = Signal(slotbits)
+        cmd_length = Signal(lengthbits)
+        if doorbell:
+            # Slots between head and tail.
+            head = self._head.status
+            self.comb += cmd_valid.eq(head != self._tail.storage)
+            if nslots > 1:
+                self.comb += cmd_slot.eq(head[:log2_int(nslots)])
+            self.sync += If(cmd_ready, head.eq(head + 1))
+        else:
+            # Command FIFO
+            cmd_fifo = stream.SyncFIFO([("slot", slotbits), ("length", lengthbits)], nslots)
+            self.submodules += cmd_fifo
+            self.comb += [
+                cmd_fifo.sink.valid.eq(self._start.re),
+                cmd_fifo.sink.slot.eq(self._slot.storage),
+                cmd_fifo.sink.length.eq(self._length.storage),
+                self._ready.status.eq(cmd_fifo.sink.ready),
+                self._level.status.eq(cmd_fifo.level),
+                cmd_valid.eq(cmd_fifo.source.valid),
+                cmd_slot.eq(cmd_fifo.source.slot),
+                cmd_length.eq(cmd_fifo.source.length),
+                cmd_fifo.source.ready.eq(cmd_ready),
+            ]
 
         # Status FIFO (Only added when Timestamping).
         if timestamp is not None:
@@ -210,21 +552,82 @@ class LiteEthMACSRAMReader(Module, AutoCSR):
             self.comb += self._timestamp_slot.status.eq(stat_fifo.source.slot)
             self.comb += self._timestamp.status.eq(stat_fifo.source.timestamp)
 
+        # Interrupt moderation
+        done = Signal()
+        if timestamp is None:
+            # Packets sent.
+            self.submodules.irq = LiteEthMACIRQModeration(mode="pulse")
+            self.comb += self.irq.event.eq(done)
+        else:
+            # Number of timestamps waiting to be read.
+            self.submodules.irq = LiteEthMACIRQModeration(len(stat_fifo.level))
+            self.comb += self.irq.level.eq(stat_fifo.level)
+        self.comb += self.ev.done.trigger.eq(self.irq.trigger)
+
         # Length computation
-        read_address = Signal(lengthbits)
+        offset       = 4 if doorbell else 0 # Packet offset in the slot.
+        read_address = Signal(bits_for(depth*4 + offset))
         counter      = Signal(lengthbits)
+        mem_data     = Signal(dw)
 
         # FSM
         self.submodules.fsm = fsm = FSM(reset_state="IDLE")
+        send = NextState("SEND")
+        if checksum:
+            # Checksums computed on a first pass over the packet when enabled.
+            send = If(self._checksum.storage != 0,
+                NextState("CHECKSUM")
+            ).Else(
+                NextState("SEND")
+            )
         fsm.act("IDLE",
             NextValue(counter, 0),
-            If(cmd_fifo.source.valid,
+            If(cmd_valid,
                 start.eq(1),
-                NextState("SEND")
+                NextState("LENGTH") if doorbell else send
             )
         )
+        if doorbell:
+            # Length read from the first word of the slot.
+            fsm.act("LENGTH",
+                read_address.eq(offset),
+                NextValue(cmd_length, mem_data),
+                send
+            )
+        if checksum:
+            self.submodules.checksum = LiteEthMACChecksum(dw, endianness, mode="insert")
+            checksum_valid = Signal()
+            checksum_last  = Signal()
+            fsm.act("CHECKSUM",
+                read_address.eq(counter + offset),
+                NextValue(counter, counter + 4),
+                checksum_valid.eq(1),
+                checksum_last.eq(counter >= (cmd_length - 4)),
+                If(checksum_last,
+                    NextState("CHECKSUM-END")
+                )
+            )
+            fsm.act("CHECKSUM-END",
+                read_address.eq(offset),
+                NextValue(counter, 0),
+                NextState("SEND")
+            )
+            self.sync += [
+                self.checksum.valid.eq(checksum_valid),
+                self.checksum.last.eq(checksum_last),
+            ]
+            self.comb += [
+                self.checksum.data.eq(mem_data),
+                self.checksum.ip_insert.eq(self._checksum.storage[0]),
+                self.checksum.l4_insert.eq(self._checksum.storage[1]),
+                self.checksum.tx_offset.eq(counter),
+                self.checksum.tx_data_in.eq(mem_data),
+                source.data.eq(self.checksum.tx_data),
+            ]
+        else:
+            self.comb += source.data.eq(mem_data)
 
-        length_lsb = cmd_fifo.source.length[0:2]
+        length_lsb = cmd_length[0:2]
         if endianness == "big":
             self.comb += If(source.last,
                 Case(length_lsb, {
@@ -243,10 +646,10 @@ class LiteEthMACSRAMReader(Module, AutoCSR):
                 }))
         fsm.act("SEND",
             source.valid.eq(1),
-            source.last.eq(counter >= (cmd_fifo.source.length - 4)),
-            read_address.eq(counter),
+            source.last.eq(counter >= (cmd_length - 4)),
+            read_address.eq(counter + offset),
             If(source.ready,
-                read_address.eq(counter + 4),
+                read_address.eq(counter + 4 + offset),
                 NextValue(counter, counter + 4),
                 If(source.last,
                     NextState("END")
@@ -254,8 +657,8 @@ class LiteEthMACSRAMReader(Module, AutoCSR):
             )
         )
         fsm.act("END",
-            self.ev.done.trigger.eq(1),
-            cmd_fifo.source.ready.eq(1),
+            done.eq(1),
+            cmd_ready.eq(1),
             NextState("IDLE")
         )
 
@@ -263,31 +666,78 @@ class LiteEthMACSRAMReader(Module, AutoCSR):
             # Latch Timestamp on start of outgoing packet.
             self.sync += If(start, stat_fifo.sink.timestamp.eq(timestamp))
             self.comb += stat_fifo.sink.valid.eq(fsm.ongoing("END"))
-            self.comb += stat_fifo.sink.slot.eq(cmd_fifo.source.slot)
-            # Trigger event when Status FIFO has contents (Override FSM assignment).
-            self.comb += self.ev.done.trigger.eq(stat_fifo.source.valid)
-
-        # Memory
-        rd_slot = cmd_fifo.source.slot
-        mems    = [None]*nslots
-        ports   = [None]*nslots
+            self.comb += stat_fifo.sink.slot.eq(cmd_slot)
+
+        # Memory (mem_dw wide, for the Wishbone interface).
+        ratio    = mem_dw//dw
+        lanebits = log2_int(ratio)
+        rd_slot  = cmd_slot
+        mems     = [None]*nslots
+        ports    = [None]*nslots
         for n in range(nslots):
-            mems[n]  = Memory(dw, depth)
+            mems[n]  = Memory(mem_dw, (depth + offset//4 + ratio - 1)//ratio)
             ports[n] = mems[n].get_port()
             self.specials += ports[n]
         self.mems = mems
 
+        # Data word selection (on the registered read address).
+        lane = Signal(max(lanebits, 1))
+        if ratio > 1:
+            self.sync += lane.eq(read_address[2:2 + lanebits])
+
         cases = {}
         for n, port in enumerate(ports):
-            self.comb += ports[n].adr.eq(read_address[2:])
-            cases[n] = [source.data.eq(port.dat_r)]
+            self.comb += ports[n].adr.eq(read_address[2 + lanebits:])
+            if ratio == 1:
+                cases[n] = [mem_data.eq(port.dat_r)]
+            else:
+                words    = Array(port.dat_r[dw*i:dw*(i + 1)] for i in range(ratio))
+                cases[n] = [mem_data.eq(words[lane])]
         self.comb += Case(rd_slot, cases)
 
 # MAC SRAM -----------------------------------------------------------------------------------------
 
 class LiteEthMACSRAM(Module, AutoCSR):
-    def __init__(self, dw, depth, nrxslots, ntxslots, endianness, timestamp=None):
-        self.submodules.writer = LiteEthMACSRAMWriter(dw, depth, nrxslots, endianness, timestamp)
-        self.submodules.reader = LiteEthMACSRAMReader(dw, depth, ntxslots, endianness, timestamp)
+    def __init__(self, dw, depth, nrxslots, ntxslots, endianness, timestamp=None, mtu=eth_mtu,
+        rx_ring=False, tx_doorbell=False, mem_dw=32, checksum=False, rx_queues=1):
+        self.level = Signal(16) # Highest RX level (of the RX queues).
+        if rx_ring:
+            # RX frames packed in a ring buffer using the memory of the RX slots.
+            assert rx_queues == 1
+            ring_depth = nrxslots*2**log2_int(depth, need_pow2=False)
+            writer = LiteEthMACSRAMRingWriter(dw, ring_depth, endianness, timestamp, mtu,
+                mem_dw   = mem_dw,
+                checksum = checksum)
+        else:
+            writer = LiteEthMACSRAMWriter(dw, depth, nrxslots, endianness, timestamp, mtu,
+                mem_dw   = mem_dw,
+                checksum = checksum)
+        self.submodules.writer = writer
+        self.writers = [writer]
+        self.submodules.reader = LiteEthMACSRAMReader(dw, depth, ntxslots, endianness, timestamp,
+            doorbell = tx_doorbell,
+            mem_dw   = mem_dw,
+            checksum = checksum)
         self.submodules.ev     = SharedIRQ(self.writer.ev, self.reader.ev)
         self.sink, self.source = self.writer.sink, self.reader.source
+
+        # RX queues: queue 0 is the writer (sharing its IRQ with the reader), the other queues have
+        # their own writer (writerN) with its own slots and IRQ (rx_evs).
+        self.rx_evs = []
+        if rx_queues > 1:
+            self.submodules.steering = LiteEthMACRXSteering(dw, endianness, nqueues=rx_queues)
+            self.sink = self.steering.sink
+            self.comb += self.steering.sources[0].connect(self.writer.sink)
+            for n in range(1, rx_queues):
+                writer = LiteEthMACSRAMWriter(dw, depth, nrxslots, endianness, timestamp, mtu,
+                    mem_dw   = mem_dw,
+                    checksum = checksum)
+                setattr(self.submodules, "writer{}".format(n), writer)
+                self.writers.append(writer)
+                self.rx_evs.append(writer.ev)
+                self.comb += self.steering.sources[n].connect(writer.sink)
+
+        level = 0
+        for writer in self.writers:
+            level = Mux(writer.level > level, writer.level, level)
+        self.comb += self.level.eq(level)
@@ -0,0 +1,193 @@
+#
+# This file is part of LiteEth.
+#
+# Copyright (c) 2026 AEW2015 <AEW2015@users.noreply.github.com>
+# SPDX-License-Identifier: BSD-2-Clause
+
+from collections import OrderedDict
+
+from liteeth.common import *
+
+# MAC Statistics Constants -------------------------------------------------------------------------
+
+# RMON packet size histogram bins (in bytes, with FCS): name, min, max.
+stats_histogram = [
+    ("pkts_64",          64,   64),
+    ("pkts_65_127",      65,  127),
+    ("pkts_128_255",    128,  255),
+    ("pkts_256_511",    256,  511),
+    ("pkts_512_1023",   512, 1023),
+    ("pkts_1024_1518", 1024, 1518),
+    ("pkts_1519_max",  1519, None),
+]
+
+stats_counters = [
+    "frames",
+    "bytes",
+    "unicast",
+    "multicast",
+    "broadcast",
+    "runts",
+    "oversize",
+    "errors",
+    "drops",
+] + [name for name, _, _ in stats_histogram]
+
+# MAC Statistics Monitor ---------------------------------------------------------------------------
+
+class LiteEthMACStatsMonitor(Module):
+    """Statistics Monitor
+
+    Passively observes the frames of an endpoint (sink, to be driven with the observed endpoint's
+    signals, including ready) and computes the increments of the statistics counters. Frames are
+    accounted on their last word, sizes include the FCS (4 bytes).
+
+    Parameters
+    ----------
+    dw : int
+        Width of the data bus.
+    endianness : str
+        Byte order of the data bus ("big": first byte in the MSBs, "little": in the LSBs).
+    mtu : int
+        MTU, frames larger than mtu - 8 (preamble) bytes are counted as oversize.
+    min_length : int
+        Frames shorter than min_length are accounted as min_length (TX padding).
+
+    Attributes
+    ----------
+    sink : in
+        Observed frames.
+    drop : in
+        Pulses every time a frame is dropped (outside of the observed endpoint).
+    increments : dict
+        Increment of each counter (see stats_counters) for the current cycle.
+    """
+    def __init__(self, dw, endianness="big", mtu=eth_mtu, min_length=0):
+        self.sink = sink = stream.Endpoint(eth_phy_description(dw))
+        self.drop = Signal()
+
+        self.increments = OrderedDict()
+        for name in stats_counters:
+            self.increments[name] = Signal(bits_for(dw//8) if name == "bytes" else 1)
+
+        # # #
+
+        nbytes = dw//8
+
+        def lane(n):
+            if endianness == "big":
+                n = nbytes - 1 - n
+            return sink.data[8*n:8*(n + 1)]
+
+        transfer = Signal()
+        self.comb += transfer.eq(sink.valid & sink.ready)
+
+        # Length computation (bytes of the current word, bytes of the frame).
+        word_bytes = Signal(max=nbytes + 1)
+        cases = {"default": word_bytes.eq(nbytes)}
+        for n in range(nbytes):
+            last_be = 2**(nbytes - 1 - n) if endianness == "big" else 2**n
+            cases[last_be] = word_bytes.eq(n + 1)
+        self.comb += If(sink.last, Case(sink.last_be, cases)).Else(word_bytes.eq(nbytes))
+
+        length      = Signal(16)
+        next_length = Signal(16)
+        self.comb += next_length.eq(length + word_bytes)
+        self.sync += If(transfer, length.eq(Mux(sink.last, 0, next_length)))
+
+        # Destination MAC address capture (first 6 bytes).
+        dst_words = (6 + nbytes - 1)//nbytes
+        word      = Signal(max=dst_words + 1)
+        dst       = Signal(48)
+        next_dst  = Signal(48)
+        self.comb += next_dst.eq(dst)
+        for i in range(dst_words):
+            for j in range(nbytes):
+                n = i*nbytes + j
+                if n < 6:
+                    self.comb += If(word == i, next_dst[8*n:8*(n + 1)].eq(lane(j)))
+        self.sync += If(transfer,
+            dst.eq(next_dst),
+            If(sink.last,
+                word.eq(0)
+            ).Elif(word != dst_words,
+                word.eq(word + 1)
+            )
+        )
+
+        # Frame size (with FCS).
+        size = Signal(16)
+        self.comb += size.eq(Mux(next_length < min_length, min_length, next_length) + 4)
+
+        # Increments.
+        frame     = Signal()
+        broadcast = Signal()
+        multicast = Signal()
+        self.comb += [
+            frame.eq(transfer & sink.last),
+            broadcast.eq(next_dst == 2**48 - 1),
+            multicast.eq(next_dst[0] & ~broadcast),
+        ]
+        inc = self.increments
+        self.comb += [
+            inc["frames"].eq(frame),
+            inc["bytes"].eq(Mux(transfer, word_bytes, 0)),
+            inc["unicast"].eq(frame & ~next_dst[0]),
+            inc["multicast"].eq(frame & multicast),
+            inc["broadcast"].eq(frame & broadcast),
+            inc["runts"].eq(frame & (size < 64)),
+            inc["oversize"].eq(frame & (size > (mtu - 8))),
+            inc["errors"].eq(frame & (sink.error != 0)),
+            inc["drops"].eq(self.drop),
+        ]
+        for name, size_min, size_max in stats_histogram:
+            match = (size >= size_min)
+            if size_max is not None:
+                match = match & (size <= size_max)
+            self.comb += inc[name].eq(frame & match)
+
+# MAC Statistics -----------------------------------------------------------------------------------
+
+class LiteEthMACStats(Module, AutoCSR):
+    """MAC Statistics
+
+    RMON-style statistics of the RX/TX frames: frames, bytes, unicast/multicast/broadcast, runts
+    (< 64 bytes), oversize, errors (frames with "error"), drops and a packet size histogram.
+
+    Counters are free-running and are not directly readable: a write to the snapshot CSR copies
+    all the counters (of both directions) to their CSRs and clears them in the same cycle, so
+    that the values read by software are consistent and no event is lost between snapshots.
+
+    Parameters
+    ----------
+    dw : int
+        Width of the data bus.
+    endianness : str
+        Byte order of the data bus.
+    mtu : int
+        MTU (see LiteEthMACStatsMonitor).
+    tx_min_length : int
+        Minimum TX frame length (without FCS) after padding, 0 when no padding.
+    """
+    def __init__(self, dw, endianness="big", mtu=eth_mtu, tx_min_length=60):
+        self.snapshot = CSR()
+
+        # # #
+
+        self.submodules.rx = LiteEthMACStatsMonitor(dw, endianness, mtu)
+        self.submodules.tx = LiteEthMACStatsMonitor(dw, endianness, mtu, min_length=tx_min_length)
+
+        for direction, monitor in [("rx", self.rx), ("tx", self.tx)]:
+            for name, inc in monitor.increments.items():
+                width   = 64 if name == "bytes" else 32
+                counter = Signal(width)
+                status  = CSRStatus(width, name="{}_{}".format(direction, name))
+                setattr(self, "{}_{}".format(direction, name), status)
+                self.sync += [
+                    If(self.snapshot.re,
+                        status.status.eq(counter + inc),
+                        counter.eq(0)
+                    ).Else(
+                        counter.eq(counter + inc)
+                    )
+                ]
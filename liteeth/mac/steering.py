@@ -0,0 +1,171 @@
+#
+# This file is part of LiteEth.
+#
+# Copyright (c) 2026 AEW2015 <AEW2015@users.noreply.github.com>
+# SPDX-License-Identifier: BSD-2-Clause
+
+from liteeth.common import *
+from liteeth.mac.checksum import tcp_protocol
+
+# MAC RX Steering Constants ------------------------------------------------------------------------
+
+# Offsets (in bytes) in the Ethernet frame (untagged).
+steering_ip_offset = 14 # IPv4 header.
+steering_l4_end    = 4  # End of the UDP/TCP ports (from the UDP/TCP header).
+
+# MAC RX Steering ----------------------------------------------------------------------------------
+
+class LiteEthMACRXSteering(Module, AutoCSR):
+    """RX Steering
+
+    Steers the received frames to one of nqueues RX queues (sources):
+    - Frames matching one of the nrules enabled rules get the queueN of the first matching rule.
+      A rule matches on the Ethernet type (ethertypeN, 0 matches all types) and on the UDP/TCP
+      destination port (portN, 0 matches all frames, including non UDP/TCP ones).
+    - IPv4 frames get, when hash_enable is set, the queue selected by the flow hash: the 16-bit XOR
+      fold of the source/destination addresses and UDP/TCP source/destination ports (ports taken
+      as 0 for fragments and non UDP/TCP frames) modulo nqueues.
+    - Other frames get default_queue.
+
+    The start of the frames is buffered until the headers are parsed, the frames are then
+    forwarded to the selected queue.
+
+    Parameters
+    ----------
+    nqueues : int
+        Number of RX queues (power of 2).
+    nrules : int
+        Number of rules.
+    """
+    def __init__(self, dw=32, endianness="big", nqueues=2, nrules=4):
+        assert nqueues == 2**log2_int(nqueues)
+        queuebits    = max(log2_int(nqueues), 1)
+        self.sink    = sink = stream.Endpoint(eth_phy_description(dw))
+        self.sources = [stream.Endpoint(eth_phy_description(dw)) for _ in range(nqueues)]
+
+        self.enable        = CSRStorage(max(nrules, 1))
+        self.hash_enable   = CSRStorage(reset=1)
+        self.default_queue = CSRStorage(queuebits)
+        for n in range(nrules):
+            for name, nbits in [("ethertype", 16), ("port", 16), ("queue", queuebits)]:
+                csr_name = "{}{}".format(name, n)
+                setattr(self, csr_name, CSRStorage(nbits, name=csr_name))
+
+        # # #
+
+        nbytes = dw//8
+
+        # Headers buffering (until parsed).
+        self.submodules.fifo = fifo = stream.SyncFIFO(eth_phy_description(dw), 32, buffered=True)
+        self.submodules.queue_fifo = queue_fifo = stream.SyncFIFO([("queue", queuebits)], 4)
+
+        # Header fields capture.
+        word      = Signal(16)
+        ethertype = Signal(16)
+        ihl       = Signal(4)
+        version   = Signal(4)
+        fragment  = Signal(14) # MF flag and fragment offset.
+        protocol  = Signal(8)
+        src_ip    = Signal(32)
+        dst_ip    = Signal(32)
+        src_port  = Signal(16)
+        dst_port  = Signal(16)
+        l4_start  = Signal(16)
+        beat      = Signal()
+        self.comb += [
+            beat.eq(sink.valid & sink.ready),
+            l4_start.eq(steering_ip_offset + 4*ihl),
+        ]
+        self.sync += If(beat, word.eq(Mux(sink.last, 0, word + 1)))
+        lanes = [sink.data[8*n:8*(n + 1)] for n in range(nbytes)]
+        if endianness == "big":
+            lanes = lanes[::-1]
+        fields = [
+            (12, ethertype[8:16]), (13, ethertype[0:8]),
+            (14, Cat(ihl, version)),
+            (20, fragment[8:14]),  (21, fragment[0:8]),
+            (23, protocol),
+        ]
+        fields += [(26 + n, src_ip[8*(3 - n):8*(4 - n)]) for n in range(4)]
+        fields += [(30 + n, dst_ip[8*(3 - n):8*(4 - n)]) for n in range(4)]
+        for offset, field in fields:
+            self.sync += If(beat & (word == offset//nbytes),
+                field.eq(lanes[offset%nbytes][:len(field)])
+            )
+        for n in range(nbytes):
+            pos = Signal(16)
+            self.comb += pos.eq(word*nbytes + n)
+            for offset, field in [(0, src_port[8:16]), (1, src_port[0:8]),
+                                  (2, dst_port[8:16]), (3, dst_port[0:8])]:
+                self.sync += If(beat & (word > steering_ip_offset//nbytes) &
+                                (pos == l4_start + offset),
+                    field.eq(lanes[n])
+                )
+
+        # Queue selection (on the parsed headers).
+        ip    = Signal()
+        l4    = Signal()
+        queue = Signal(queuebits)
+        hash  = Signal(16)
+        self.comb += [
+            ip.eq((ethertype == ethernet_type_ip) & (version == 4) & (ihl >= 5)),
+            l4.eq(ip & (fragment == 0) & ((protocol == udp_protocol) | (protocol == tcp_protocol))),
+            hash.eq(src_ip[:16] ^ src_ip[16:] ^ dst_ip[:16] ^ dst_ip[16:] ^
+                Mux(l4, src_port ^ dst_port, 0)),
+        ]
+        selection = None
+        for n in range(nrules):
+            rule_ethertype = getattr(self, "ethertype{}".format(n)).storage
+            rule_port      = getattr(self, "port{}".format(n)).storage
+            rule_match     = self.enable.storage[n]
+            rule_match    &= (rule_ethertype == 0) | (rule_ethertype == ethertype)
+            rule_match    &= (rule_port == 0) | (l4 & (rule_port == dst_port))
+            rule_queue     = queue.eq(getattr(self, "queue{}".format(n)).storage)
+            if selection is None:
+                selection = If(rule_match, rule_queue)
+            else:
+                selection = selection.Elif(rule_match, rule_queue)
+        hash_match    = ip & self.hash_enable.storage
+        hash_queue    = queue.eq(hash[:log2_int(nqueues)] if nqueues > 1 else 0)
+        default_queue = queue.eq(self.default_queue.storage)
+        if selection is None:
+            selection = If(hash_match, hash_queue)
+        else:
+            selection = selection.Elif(hash_match, hash_queue)
+        self.comb += selection.Else(default_queue)
+
+        # Parsing: headers parsed once the UDP/TCP ports are captured (or on the last word).
+        parsed   = Signal() # Queue selected for the current frame.
+        complete = Signal() # Headers captured, queue to be pushed.
+        stall    = Signal()
+        self.comb += [
+            stall.eq(complete & ~queue_fifo.sink.ready),
+            sink.connect(fifo.sink, omit={"valid", "ready"}),
+            fifo.sink.valid.eq(sink.valid & ~stall),
+            sink.ready.eq(fifo.sink.ready & ~stall),
+            queue_fifo.sink.valid.eq(complete),
+            queue_fifo.sink.queue.eq(queue),
+        ]
+        self.sync += [
+            If(queue_fifo.sink.ready,
+                complete.eq(0)
+            ),
+            If(beat,
+                If(~parsed & (sink.last | ((word > steering_ip_offset//nbytes) &
+                   ((word + 1)*nbytes >= l4_start + steering_l4_end))),
+                    complete.eq(1),
+                    parsed.eq(1)
+                ),
+                If(sink.last,
+                    parsed.eq(0)
+                )
+            )
+        ]
+
+        # Forwarding to the selected queue.
+        for n, source in enumerate(self.sources):
+            self.comb += If(queue_fifo.source.valid & (queue_fifo.source.queue == n),
+                fifo.source.connect(source)
+            )
+        self.comb += queue_fifo.source.ready.eq(
+            fifo.source.valid & fifo.source.ready & fifo.source.last)
@@ -13,32 +13,56 @@ from litex.soc.interconnect import wishbone
 # MAC Wishbone Interface ---------------------------------------------------------------------------
 
 class LiteEthMACWishboneInterface(Module, AutoCSR):
-    def __init__(self, dw, nrxslots=2, ntxslots=2, endianness="big", timestamp=None):
+    def __init__(self, dw, nrxslots=2, ntxslots=2, endianness="big", timestamp=None, mtu=eth_mtu,
+        rx_ring=False, tx_doorbell=False, bus_data_width=32, bus_bursting=False, checksum=False,
+        rx_queues=1):
+        assert mtu <= eth_jumbo_mtu
+        assert bus_data_width in [32, 64, 128]
         self.sink   = stream.Endpoint(eth_phy_description(dw))
         self.source = stream.Endpoint(eth_phy_description(dw))
-        self.bus    = wishbone.Interface()
+        self.bus    = wishbone.Interface(data_width=bus_data_width, bursting=bus_bursting)
 
         # # #
 
         # Storage in SRAM
-        sram_depth = eth_mtu//(dw//8)
-        self.submodules.sram = sram.LiteEthMACSRAM(dw, sram_depth, nrxslots, ntxslots, endianness, timestamp)
+        sram_depth = (mtu + dw//8 - 1)//(dw//8)
+        if tx_doorbell:
+            # TX slots have an additional length word (must fit in the slot address space).
+            assert sram_depth + 1 <= 2**log2_int(sram_depth, need_pow2=False)
+        self.submodules.sram = sram.LiteEthMACSRAM(dw, sram_depth, nrxslots, ntxslots, endianness, timestamp, mtu,
+            rx_ring     = rx_ring,
+            tx_doorbell = tx_doorbell,
+            mem_dw      = bus_data_width,
+            checksum    = checksum,
+            rx_queues   = rx_queues)
         self.comb += self.sink.connect(self.sram.sink)
         self.comb += self.sram.source.connect(self.source)
 
-        # Wishbone interface
-        wb_rx_sram_ifs = [wishbone.SRAM(self.sram.writer.mems[n], read_only=True)
-            for n in range(nrxslots)]
-        wb_tx_sram_ifs = [wishbone.SRAM(self.sram.reader.mems[n], read_only=False)
+        # Wishbone interface (memories as wide as the bus, with incrementing bursts support)
+        def wb_sram_bus():
+            return wishbone.Interface(data_width=bus_data_width, bursting=bus_bursting)
+        # RX slots of the RX queues mapped one after the other.
+        wb_rx_sram_ifs = [wishbone.SRAM(mem, read_only=True, bus=wb_sram_bus())
+            for writer in self.sram.writers for mem in writer.mems]
+        wb_tx_sram_ifs = [wishbone.SRAM(self.sram.reader.mems[n], read_only=False, bus=wb_sram_bus())
             for n in range(ntxslots)]
         wb_sram_ifs = wb_rx_sram_ifs + wb_tx_sram_ifs
 
         wb_slaves     = []
-        decoderoffset = log2_int(sram_depth, need_pow2=False)
-        rx_decoderbits   = log2_int(len(wb_rx_sram_ifs))
+        decoderoffset = log2_int(sram_depth, need_pow2=False) - log2_int(bus_data_width//32)
+        rx_decoderbits   = log2_int(nrxslots*rx_queues)
         tx_decoderbits   = log2_int(len(wb_tx_sram_ifs))
         decoderbits      = max(rx_decoderbits, tx_decoderbits)+1
+        if rx_ring:
+            # Ring buffer mapped on the RX slots region.
+            def slave_filter(a):
+                return a[decoderoffset:decoderoffset+decoderbits] < nrxslots
+            wb_slaves.append((slave_filter, wb_rx_sram_ifs[0].bus))
+            self.submodules += wb_rx_sram_ifs[0]
+            wb_sram_ifs = [None]*nrxslots + wb_tx_sram_ifs
         for n, wb_sram_if in enumerate(wb_sram_ifs):
+            if wb_sram_if is None:
+                continue
             def slave_filter(a, v=n):
                 return a[decoderoffset:decoderoffset+decoderbits] == v
             wb_slaves.append((slave_filter, wb_sram_if.bus))
@@ -12,6 +12,10 @@ def LiteEthPHY(clock_pads, pads, clk_freq=None, **kwargs):
             # This is a pure 1G PHY
             from liteeth.phy.gmii import LiteEthPHYGMII
             return LiteEthPHYGMII(clock_pads, pads, **kwargs)
+    elif hasattr(pads, "rx_ctl") and len(pads.rx_data) == 64:
+        # This is a 10G XGMII PHY
+        from liteeth.phy.xgmii import LiteEthPHYXGMII
+        return LiteEthPHYXGMII(clock_pads, pads, **kwargs)
     elif hasattr(pads, "rx_ctl"):
         # This is a 10/100/1G RGMII PHY
         raise ValueError("RGMII PHYs are specific to vendors (for now), use direct instantiation")
@@ -26,6 +30,7 @@ from liteeth.phy.mii  import LiteEthPHYMII
 from liteeth.phy.rmii import LiteEthPHYRMII
 from liteeth.phy.gmii import LiteEthPHYGMII
 from liteeth.phy.gmii_mii import LiteEthPHYGMIIMII
+from liteeth.phy.xgmii import LiteEthPHYXGMII
 
 from liteeth.phy.s6rgmii import LiteEthPHYRGMII as LiteEthS6PHYRGMII
 from liteeth.phy.s7rgmii   import LiteEthPHYRGMII as LiteEthS7PHYRGMII
@@ -0,0 +1,334 @@
+#
+# This file is part of LiteEth.
+#
+# Copyright (c) 2026 AEW2015 <AEW2015@users.noreply.github.com>
+# SPDX-License-Identifier: BSD-2-Clause
+
+from migen import *
+
+from liteeth.common import *
+from liteeth.phy.xgmii import xgmii_idle, xgmii_start, xgmii_end, xgmii_error, xgmii_layout
+
+
+__all__ = ["Scrambler", "Descrambler", "Encoder", "Decoder", "TransmitPath", "ReceivePath", "PCS"]
+
+# 64b/66b Constants --------------------------------------------------------------------------------
+
+# Sync headers (bit 0 transmitted first).
+sync_data = 0b10
+sync_ctrl = 0b01
+
+# Block types.
+block_type_ctrl    = 0x1e # C0 C1 C2 C3 C4 C5 C6 C7
+block_type_start_4 = 0x33 # C0 C1 C2 C3 S4 D5 D6 D7
+block_type_start_0 = 0x78 # S0 D1 D2 D3 D4 D5 D6 D7
+block_type_term    = [    # Terminate in lane n (Dx then Tn Cx).
+    0x87, 0x99, 0xaa, 0xb4, 0xcc, 0xd2, 0xe1, 0xff
+]
+
+# 7-bit control codes.
+ctrl_idle  = 0x00
+ctrl_error = 0x1e
+
+# Scrambler / Descrambler --------------------------------------------------------------------------
+
+def _scramble(i, state, feedback):
+    # Self-synchronous scrambler, polynomial x^58 + x^39 + 1, bit 0 first:
+    # o[n] = i[n] ^ s[n - 39] ^ s[n - 58] with s the scrambled bit stream.
+    s = [state[n] for n in range(58)]
+    o = []
+    for n in range(len(i)):
+        o.append(i[n] ^ s[n + 19] ^ s[n])
+        s.append(o[n] if feedback else i[n])
+    return Cat(*o), Cat(*s[-58:])
+
+
+class Scrambler(Module):
+    def __init__(self, n=64):
+        self.i = Signal(n)
+        self.o = Signal(n)
+
+        # # #
+
+        state = Signal(58, reset=2**58 - 1)
+        o, next_state = _scramble(self.i, state, feedback=True)
+        self.comb += self.o.eq(o)
+        self.sync += state.eq(next_state)
+
+
+class Descrambler(Module):
+    def __init__(self, n=64):
+        self.i = Signal(n)
+        self.o = Signal(n)
+
+        # # #
+
+        state = Signal(58)
+        o, next_state = _scramble(self.i, state, feedback=False)
+        self.comb += self.o.eq(o)
+        self.sync += state.eq(next_state)
+
+# 64b/66b Encoder ----------------------------------------------------------------------------------
+
+class Encoder(Module):
+    """64b/66b Encoder
+
+    Encodes a 64-bit XGMII word (d/k) to a 66-bit block (o) with the sync header in bits 0-1.
+    Ordered sets are not supported and are encoded as error blocks.
+    """
+    def __init__(self):
+        self.d = Signal(64)
+        self.k = Signal(8)
+        self.o = Signal(66)
+
+        # # #
+
+        header  = Signal(2)
+        payload = Signal(64)
+        self.comb += self.o.eq(Cat(header, payload))
+
+        lanes = [self.d[8*n:8*(n + 1)] for n in range(8)]
+        codes = [Signal(7) for n in range(8)]
+        for n in range(8):
+            self.comb += codes[n].eq(Mux(lanes[n] == xgmii_idle, C(ctrl_idle, 7), C(ctrl_error, 7)))
+
+        # Default: Error block.
+        self.comb += [
+            header.eq(sync_ctrl),
+            payload.eq(Cat(C(block_type_ctrl, 8), *[C(ctrl_error, 7)]*8))
+        ]
+        # Data.
+        encoding = If(self.k == 0,
+            header.eq(sync_data),
+            payload.eq(self.d)
+        )
+        # Start.
+        encoding = encoding.Elif((self.k == 0b00000001) & (lanes[0] == xgmii_start),
+            payload.eq(Cat(C(block_type_start_0, 8), self.d[8:]))
+        )
+        encoding = encoding.Elif((self.k == 0b00011111) & (lanes[4] == xgmii_start),
+            payload.eq(Cat(C(block_type_start_4, 8), *codes[:4], C(0, 4), self.d[40:]))
+        )
+        # Terminate.
+        for n in range(8):
+            fields = [C(block_type_term[n], 8)]
+            if n > 0:
+                fields += [self.d[:8*n]]
+            if n < 7:
+                fields += [C(0, 7 - n), *codes[n + 1:]]
+            encoding = encoding.Elif((self.k == ((0xff << n) & 0xff)) & (lanes[n] == xgmii_end),
+                payload.eq(Cat(*fields))
+            )
+        # Control.
+        encoding = encoding.Elif(self.k == 0xff,
+            payload.eq(Cat(C(block_type_ctrl, 8), *codes))
+        )
+        self.comb += encoding
+
+# 64b/66b Decoder ----------------------------------------------------------------------------------
+
+class Decoder(Module):
+    """64b/66b Decoder
+
+    Decodes a 66-bit block (i) to a 64-bit XGMII word (d/k). Invalid blocks (and ordered sets,
+    not supported) are decoded as /E/.
+    """
+    def __init__(self):
+        self.i = Signal(66)
+        self.d = Signal(64)
+        self.k = Signal(8)
+
+        # # #
+
+        header  = self.i[:2]
+        payload = self.i[2:]
+
+        def decode(code):
+            return Mux(code == ctrl_idle, C(xgmii_idle, 8), C(xgmii_error, 8))
+
+        def codes(start, n):
+            return [decode(payload[start + 7*j:start + 7*(j + 1)]) for j in range(n)]
+
+        cases = {}
+        cases[block_type_ctrl] = [
+            self.d.eq(Cat(*codes(8, 8))),
+            self.k.eq(0xff)
+        ]
+        cases[block_type_start_0] = [
+            self.d.eq(Cat(C(xgmii_start, 8), payload[8:])),
+            self.k.eq(0b00000001)
+        ]
+        cases[block_type_start_4] = [
+            self.d.eq(Cat(*codes(8, 4), C(xgmii_start, 8), payload[40:])),
+            self.k.eq(0b00011111)
+        ]
+        for n in range(8):
+            lanes = [payload[8*(j + 1):8*(j + 2)] for j in range(n)]
+            cases[block_type_term[n]] = [
+                self.d.eq(Cat(*lanes, C(xgmii_end, 8), *codes(8*(n + 1) + (7 - n), 7 - n))),
+                self.k.eq((0xff << n) & 0xff)
+            ]
+        cases["default"] = [
+            self.d.eq(Cat(*[C(xgmii_error, 8)]*8)),
+            self.k.eq(0xff)
+        ]
+
+        self.comb += [
+            If(header == sync_data,
+                self.d.eq(payload),
+                self.k.eq(0)
+            ).Elif(header == sync_ctrl,
+                Case(payload[:8], cases)
+            ).Else(
+                self.d.eq(Cat(*[C(xgmii_error, 8)]*8)),
+                self.k.eq(0xff)
+            )
+        ]
+
+# Transmit Path ------------------------------------------------------------------------------------
+
+class TransmitPath(Module):
+    """10GBASE-R Transmit Path
+
+    XGMII (d/k) -> 64b/66b encoding -> scrambling -> 66-bit blocks (data, bit 0 first) to be
+    sent by a transceiver (with its gearbox).
+    """
+    def __init__(self):
+        self.d    = Signal(64)
+        self.k    = Signal(8)
+        self.data = Signal(66)
+
+        # # #
+
+        self.submodules.encoder   = encoder   = Encoder()
+        self.submodules.scrambler = scrambler = Scrambler()
+        self.comb += [
+            encoder.d.eq(self.d),
+            encoder.k.eq(self.k),
+            scrambler.i.eq(encoder.o[2:]),
+        ]
+        self.sync += self.data.eq(Cat(encoder.o[:2], scrambler.o))
+
+# Receive Path -------------------------------------------------------------------------------------
+
+class ReceivePath(Module):
+    """10GBASE-R Receive Path
+
+    66-bit words (data, bit 0 first) from a transceiver -> block lock/bitslip -> descrambling ->
+    64b/66b decoding -> XGMII (d/k).
+
+    Block lock follows IEEE 802.3 clause 49: lock is acquired after 64 consecutive valid sync
+    headers and lost after 16 invalid sync headers in a 64 blocks window. Alignment is searched
+    by slipping the 66-bit window one bit at a time. /I/ is presented on XGMII while not locked.
+    """
+    def __init__(self):
+        self.data       = Signal(66)
+        self.d          = Signal(64)
+        self.k          = Signal(8)
+        self.block_lock = Signal()
+
+        # # #
+
+        # Bitslip.
+        offset = Signal(max=66)
+        data_d = Signal(66)
+        block  = Signal(66)
+        self.sync += data_d.eq(self.data)
+        self.sync += Case(offset, {n: block.eq(Cat(data_d, self.data)[n:n + 66]) for n in range(66)})
+
+        # Block lock.
+        sh_valid       = Signal()
+        sh_count       = Signal(6)
+        sh_invalid_cnt = Signal(4)
+        slip           = Signal()
+        slip_wait      = Signal(2)
+        self.comb += sh_valid.eq(block[0] ^ block[1])
+        self.sync += [
+            If(slip,
+                If(offset == 65,
+                    offset.eq(0)
+                ).Else(
+                    offset.eq(offset + 1)
+                ),
+                # Wait for the new alignment to reach the block register.
+                slip_wait.eq(2**len(slip_wait) - 1),
+            ).Elif(slip_wait != 0,
+                slip_wait.eq(slip_wait - 1)
+            )
+        ]
+        self.submodules.fsm = fsm = FSM(reset_state="LOCK_INIT")
+        fsm.act("LOCK_INIT",
+            If(slip_wait == 0,
+                If(sh_valid,
+                    NextValue(sh_count, sh_count + 1),
+                    If(sh_count == (64 - 1),
+                        NextValue(sh_invalid_cnt, 0),
+                        NextState("LOCKED")
+                    )
+                ).Else(
+                    slip.eq(1),
+                    NextValue(sh_count, 0)
+                )
+            )
+        )
+        fsm.act("LOCKED",
+            self.block_lock.eq(1),
+            NextValue(sh_count, sh_count + 1),
+            If(~sh_valid,
+                NextValue(sh_invalid_cnt, sh_invalid_cnt + 1),
+                If(sh_invalid_cnt == (16 - 1),
+                    slip.eq(1),
+                    NextValue(sh_count, 0),
+                    NextState("LOCK_INIT")
+                )
+            ),
+            If(sh_count == (64 - 1),
+                NextValue(sh_invalid_cnt, 0)
+            )
+        )
+
+        # Descrambling/Decoding.
+        self.submodules.descrambler = descrambler = Descrambler()
+        self.submodules.decoder     = decoder     = Decoder()
+        self.comb += [
+            descrambler.i.eq(block[2:]),
+            decoder.i.eq(Cat(block[:2], descrambler.o)),
+        ]
+        self.sync += [
+            If(self.block_lock,
+                self.d.eq(decoder.d),
+                self.k.eq(decoder.k)
+            ).Else(
+                self.d.eq(Cat(*[C(xgmii_idle, 8)]*8)),
+                self.k.eq(0xff)
+            )
+        ]
+
+# PCS ----------------------------------------------------------------------------------------------
+
+class PCS(Module):
+    """10GBASE-R PCS
+
+    Exposes a 64-bit SDR XGMII interface (xgmii, to be used as pads of LiteEthPHYXGMII) and
+    66-bit TX/RX words (tx_data/rx_data) for the transceiver, in the "eth_tx"/"eth_rx" clock
+    domains.
+    """
+    def __init__(self):
+        self.xgmii      = Record(xgmii_layout)
+        self.tx_data    = Signal(66)
+        self.rx_data    = Signal(66)
+        self.block_lock = Signal()
+
+        # # #
+
+        self.submodules.tx = tx = ClockDomainsRenamer("eth_tx")(TransmitPath())
+        self.submodules.rx = rx = ClockDomainsRenamer("eth_rx")(ReceivePath())
+        self.comb += [
+            tx.d.eq(self.xgmii.tx_data),
+            tx.k.eq(self.xgmii.tx_ctl),
+            self.tx_data.eq(tx.data),
+            rx.data.eq(self.rx_data),
+            self.xgmii.rx_data.eq(rx.d),
+            self.xgmii.rx_ctl.eq(rx.k),
+            self.block_lock.eq(rx.block_lock),
+        ]
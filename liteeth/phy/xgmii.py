@@ -0,0 +1,332 @@
+#
+# This file is part of LiteEth.
+#
+# Copyright (c) 2026 AEW2015 <AEW2015@users.noreply.github.com>
+# SPDX-License-Identifier: BSD-2-Clause
+
+from migen import *
+from migen.genlib.resetsync import AsyncResetSynchronizer
+
+from liteeth.common import *
+
+# XGMII Constants ----------------------------------------------------------------------------------
+
+xgmii_idle  = 0x07
+xgmii_start = 0xfb
+xgmii_end   = 0xfd
+xgmii_error = 0xfe
+
+xgmii_layout = [
+    ("tx_data", 64),
+    ("tx_ctl",   8),
+    ("rx_data", 64),
+    ("rx_ctl",   8),
+]
+
+# XGMII TX -----------------------------------------------------------------------------------------
+
+class LiteEthPHYXGMIITX(Module):
+    """XGMII TX
+
+    Converts MAC frames (starting with the preamble/SFD word) to 64-bit SDR XGMII: the first
+    preamble byte is replaced by /S/ and /T/ is inserted after the last valid byte, /I/ being sent
+    in all the other lanes. TX underflow during a frame is reported with /E/.
+
+    The interpacket gap (12 bytes) is inserted here: frames start in lane 0 or lane 4 (shifted by
+    4 lanes) and, with Deficit Idle Count (IEEE 802.3 clause 46), the gap is shortened by up to
+    3 bytes (minimum gap of 9 bytes) to start the frames on the first possible lane while keeping
+    an average of exactly 12 bytes over time.
+
+    Parameters
+    ----------
+    pads : Record
+        XGMII pads (tx_data/tx_ctl).
+    dic : bool
+        Enable Deficit Idle Count (else the gap is at least 12 bytes).
+    """
+    def __init__(self, pads, dic=True):
+        self.sink = sink = stream.Endpoint(eth_phy_description(64))
+
+        # # #
+
+        nlanes = 8
+        data   = Signal(64)
+        ctl    = Signal(nlanes)
+
+        def idle(n):
+            return [C(xgmii_idle, 8)]*n
+
+        # Gap: idle bytes (including /T/) sent since the end of the last frame (saturated) and
+        # deficit (in bytes) of idle compared to the interpacket gap.
+        max_deficit = 3 if dic else 0
+        max_count   = eth_interpacket_gap + max_deficit
+        count       = Signal(max=max_count + 1, reset=max_count)
+        deficit     = Signal(max=max(max_deficit + 1, 2))
+        start_lane0 = Signal()
+        start_lane4 = Signal()
+        self.comb += [
+            start_lane0.eq(count       >= (eth_interpacket_gap - max_deficit + deficit)),
+            start_lane4.eq((count + 4) >= (eth_interpacket_gap - max_deficit + deficit)),
+        ]
+        def start(gap):
+            return NextValue(deficit, Mux((deficit + eth_interpacket_gap) > gap,
+                deficit + eth_interpacket_gap - gap, 0))
+
+        # Frames starting in lane 4: upper half of the previous word kept for the next one.
+        shift    = Signal()
+        buf      = Signal(32)
+        tail_cnt = Signal(max=5)
+
+        # Terminate after the last valid byte (bytes in lanes [0, n - 1]) when not at the end of
+        # the word.
+        def terminate(lanes, n):
+            return [
+                data.eq(Cat(*(lanes[:n] + [C(xgmii_end, 8)] + idle(nlanes - n - 1)))),
+                ctl.eq((2**nlanes - 1) & ~(2**n - 1)),
+                NextValue(count, nlanes - n),
+                NextState("IDLE")
+            ]
+        sink_lanes = [sink.data[8*i:8*(i + 1)] for i in range(nlanes)]
+        buf_lanes  = [buf[8*i:8*(i + 1)]       for i in range(nlanes//2)]
+        terminate_cases       = {}
+        terminate_cases_shift = {}
+        for i in range(nlanes):
+            if i < (nlanes - 1):
+                terminate_cases[2**i] = terminate(sink_lanes, i + 1)
+            else:
+                terminate_cases[2**i] = NextState("TERMINATE")
+            if i < (nlanes//2 - 1):
+                terminate_cases_shift[2**i] = terminate(buf_lanes + sink_lanes, 4 + i + 1)
+            elif i == (nlanes//2 - 1):
+                terminate_cases_shift[2**i] = NextState("TERMINATE")
+            else:
+                terminate_cases_shift[2**i] = [
+                    NextValue(tail_cnt, i - 3),
+                    NextState("TAIL")
+                ]
+        terminate_cases["default"]       = NextState("TERMINATE")
+        terminate_cases_shift["default"] = NextState("TERMINATE")
+
+        self.comb += [
+            data.eq(Cat(*idle(nlanes))),
+            ctl.eq(2**nlanes - 1),
+        ]
+        self.submodules.fsm = fsm = FSM(reset_state="IDLE")
+        fsm.act("IDLE",
+            If(sink.valid & start_lane0,
+                sink.ready.eq(1),
+                # The first preamble byte is replaced by /S/.
+                data.eq(Cat(C(xgmii_start, 8), sink.data[8:])),
+                ctl.eq(0b00000001),
+                start(count),
+                NextValue(shift, 0),
+                If(sink.last,
+                    NextState("TERMINATE")
+                ).Else(
+                    NextState("DATA")
+                )
+            ).Elif(sink.valid & start_lane4,
+                sink.ready.eq(1),
+                data.eq(Cat(*(idle(nlanes//2) + [C(xgmii_start, 8), sink.data[8:32]]))),
+                ctl.eq(0b00011111),
+                start(count + 4),
+                NextValue(shift, 1),
+                NextValue(buf, sink.data[32:]),
+                NextState("DATA")
+            ).Else(
+                NextValue(count, Mux(count >= (max_count - nlanes), max_count, count + nlanes))
+            )
+        )
+        fsm.act("DATA",
+            sink.ready.eq(1),
+            If(sink.valid,
+                ctl.eq(0),
+                If(shift,
+                    data.eq(Cat(buf, sink.data[:32])),
+                    NextValue(buf, sink.data[32:]),
+                    If(sink.last,
+                        Case(sink.last_be, terminate_cases_shift)
+                    )
+                ).Else(
+                    data.eq(sink.data),
+                    If(sink.last,
+                        Case(sink.last_be, terminate_cases)
+                    )
+                )
+            ).Else(
+                # Underflow, no way to pause the link: corrupt the frame.
+                data.eq(Cat(*([C(xgmii_error, 8)]*nlanes))),
+                ctl.eq(2**nlanes - 1)
+            )
+        )
+        tail_cases = {}
+        for n in range(1, nlanes//2 + 1):
+            tail_cases[n] = terminate(buf_lanes, n)
+        fsm.act("TAIL",
+            Case(tail_cnt, tail_cases)
+        )
+        fsm.act("TERMINATE",
+            data.eq(Cat(C(xgmii_end, 8), *idle(nlanes - 1))),
+            NextValue(count, nlanes),
+            NextState("IDLE")
+        )
+        self.sync += [
+            pads.tx_data.eq(data),
+            pads.tx_ctl.eq(ctl),
+        ]
+
+# XGMII RX -----------------------------------------------------------------------------------------
+
+class LiteEthPHYXGMIIRX(Module):
+    """XGMII RX
+
+    Converts 64-bit SDR XGMII to MAC frames. /S/ can be received in lane 0 or lane 4, frames
+    are realigned so that the preamble always starts in lane 0 (/S/ being replaced by a preamble
+    byte). Control characters received during a frame (/E/, ...) set "error" on the frame.
+    """
+    def __init__(self, pads):
+        self.source = source = stream.Endpoint(eth_phy_description(64))
+
+        # # #
+
+        nlanes = 8
+
+        # Input register.
+        rx_data = Signal(64)
+        rx_ctl  = Signal(nlanes)
+        self.sync += [
+            rx_data.eq(pads.rx_data),
+            rx_ctl.eq(pads.rx_ctl),
+        ]
+
+        # Alignment: frames starting in lane 4 are shifted by 4 lanes.
+        in_frame    = Signal()
+        shift       = Signal()
+        shift_frame = Signal()
+        data        = Signal(64)
+        ctl         = Signal(nlanes)
+        self.comb += [
+            If(in_frame,
+                shift.eq(shift_frame)
+            ).Else(
+                shift.eq(~(rx_ctl[0] & (rx_data[0:8] == xgmii_start)) &
+                          (rx_ctl[4] & (rx_data[32:40] == xgmii_start)))
+            ),
+            If(shift,
+                data.eq(Cat(rx_data[32:], pads.rx_data[:32])),
+                ctl.eq(Cat(rx_ctl[4:], pads.rx_ctl[:4]))
+            ).Else(
+                data.eq(rx_data),
+                ctl.eq(rx_ctl)
+            )
+        ]
+
+        # Start/Terminate detection (on aligned words).
+        start           = Signal()
+        terminate       = Signal(nlanes)
+        first_terminate = Signal(nlanes)
+        self.comb += start.eq(~in_frame & ctl[0] & (data[0:8] == xgmii_start))
+        for i in range(nlanes):
+            self.comb += terminate[i].eq(ctl[i] & (data[8*i:8*(i + 1)] == xgmii_end))
+        self.comb += first_terminate.eq(terminate & (~terminate + 1))
+
+        # Frames are delayed by a word to know whether the current word is the last one
+        # (/T/ in lane 0 of the next word). Errors are sticky until the end of the frame.
+        pending_valid   = Signal()
+        pending_data    = Signal(64)
+        pending_error   = Signal()
+        pending_last    = Signal()
+        pending_last_be = Signal(nlanes)
+
+        def emit(last=0, last_be=0):
+            return [
+                source.valid.eq(1),
+                source.data.eq(pending_data),
+                source.last.eq(last),
+                source.last_be.eq(last_be),
+                source.error.eq(Replicate(pending_error, nlanes)),
+            ]
+
+        terminate_cases = {}
+        for i in range(1, nlanes):
+            terminate_cases[2**i] = [
+                pending_last_be.eq(2**(i - 1)),
+                pending_error.eq(pending_error | (ctl[:i] != 0)),
+            ]
+
+        self.sync += [
+            source.valid.eq(0),
+            If(pending_valid & pending_last,
+                emit(last=1, last_be=pending_last_be),
+                pending_valid.eq(0),
+            ),
+            If(start,
+                in_frame.eq(1),
+                shift_frame.eq(shift),
+                pending_valid.eq(1),
+                # /S/ is replaced by a preamble byte.
+                pending_data.eq(Cat(C(0x55, 8), data[8:])),
+                pending_error.eq(0),
+                pending_last.eq(0),
+            ).Elif(in_frame,
+                If(terminate[0],
+                    emit(last=1, last_be=2**(nlanes - 1)),
+                    pending_valid.eq(0),
+                    in_frame.eq(0)
+                ).Elif(terminate != 0,
+                    emit(),
+                    pending_data.eq(data),
+                    pending_last.eq(1),
+                    in_frame.eq(0),
+                    # Only the first /T/ is relevant.
+                    Case(first_terminate, terminate_cases)
+                ).Else(
+                    emit(),
+                    pending_data.eq(data),
+                    pending_error.eq(pending_error | (ctl != 0))
+                )
+            )
+        ]
+
+# XGMII CRG ----------------------------------------------------------------------------------------
+
+class LiteEthPHYXGMIICRG(Module, AutoCSR):
+    def __init__(self, clock_pads):
+        self._reset = CSRStorage()
+
+        # # #
+
+        self.clock_domains.cd_eth_rx = ClockDomain()
+        self.clock_domains.cd_eth_tx = ClockDomain()
+
+        # RX/TX clocks: provided by the PCS/Transceiver.
+        self.comb += [
+            self.cd_eth_rx.clk.eq(clock_pads.rx),
+            self.cd_eth_tx.clk.eq(clock_pads.tx)
+        ]
+
+        # Reset
+        reset = self._reset.storage
+        self.specials += [
+            AsyncResetSynchronizer(self.cd_eth_tx, reset),
+            AsyncResetSynchronizer(self.cd_eth_rx, reset),
+        ]
+
+# XGMII PHY ----------------------------------------------------------------------------------------
+
+class LiteEthPHYXGMII(Module, AutoCSR):
+    """64-bit SDR XGMII PHY
+
+    Connects to a 10G PHY/PCS exposing a 64-bit XGMII interface (tx/rx_data, tx/rx_ctl) clocked
+    by clock_pads.tx/rx, for example the 10GBASE-R PCS of liteeth.phy.pcs_10gbaser. The
+    interpacket gap is inserted by the PHY (with Deficit Idle Count, see LiteEthPHYXGMIITX).
+    """
+    dw                      = 64
+    tx_clk_freq             = 156.25e6
+    rx_clk_freq             = 156.25e6
+    integrated_ifg_inserter = True
+    def __init__(self, clock_pads, pads):
+        self.submodules.crg = LiteEthPHYXGMIICRG(clock_pads)
+        self.submodules.tx  = ClockDomainsRenamer("eth_tx")(LiteEthPHYXGMIITX(pads))
+        self.submodules.rx  = ClockDomainsRenamer("eth_rx")(LiteEthPHYXGMIIRX(pads))
+        self.sink, self.source = self.tx.sink, self.rx.source
@@ -0,0 +1,58 @@
+#
+# This file is part of LiteEth.
+#
+# Copyright (c) 2026 AEW2015 <AEW2015@users.noreply.github.com>
+# SPDX-License-Identifier: BSD-2-Clause
+
+import random
+
+from migen import *
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def packet_to_words(packet, nbytes):
+    words = []
+    for n in range(0, len(packet), nbytes):
+        chunk = packet[n:n+nbytes]
+        last  = (n + nbytes) >= len(packet)
+        words.append({
+            "data"    : int.from_bytes(bytes(chunk), byteorder="little"),
+            "last"    : int(last),
+            "last_be" : 2**(len(chunk) - 1) if last else 0,
+        })
+    return words
+
+def stream_generator(endpoint, packets, nbytes, errors=None, valid_rand=50):
+    prng = random.Random(42)
+    for i, packet in enumerate(packets):
+        for word in packet_to_words(packet, nbytes):
+            error = word["last"] and (errors is not None) and errors[i]
+            yield endpoint.valid.eq(1)
+            yield endpoint.data.eq(word["data"])
+            yield endpoint.last.eq(word["last"])
+            yield endpoint.last_be.eq(word["last_be"])
+            yield endpoint.error.eq(2**nbytes - 1 if error else 0)
+            yield
+            while (yield endpoint.ready) == 0:
+                yield
+            yield endpoint.valid.eq(0)
+            while prng.randrange(100) < valid_rand:
+                yield
+
+def stream_logger(endpoint, npackets, nbytes, packets, errors, ready_rand=50):
+    prng   = random.Random(43)
+    packet = []
+    while len(packets) < npackets:
+        yield endpoint.ready.eq(prng.randrange(100) >= ready_rand)
+        yield
+        if (yield endpoint.valid) and (yield endpoint.ready):
+            data    = (yield endpoint.data)
+            last_be = (yield endpoint.last_be)
+            if (yield endpoint.last):
+                length = nbytes if last_be == 0 else log2_int(last_be) + 1
+                packet += list(data.to_bytes(nbytes, byteorder="little"))[:length]
+                packets.append(packet)
+                errors.append((yield endpoint.error) != 0)
+                packet = []
+            else:
+                packet += list(data.to_bytes(nbytes, byteorder="little"))
@@ -13,7 +13,7 @@ from litex.soc.interconnect.stream_sim import *
 
 from liteeth.common import *
 from liteeth.mac import LiteEthMAC
-from liteeth.core.arp import LiteEthARP
+from liteeth.core.arp import LiteEthARP, LiteEthARPTable
 
 from test.model import phy, mac, arp
 
@@ -43,7 +43,114 @@ def main_generator(dut):
     print("Received MAC : 0x{:12x}".format((yield dut.arp.table.response.mac_address)))
 
 
+def arp_table_resolve(table, ip_address, mac_addresses, requests):
+    # Request the MAC address of ip_address, answering the ARP requests (from mac_addresses).
+    yield table.request.valid.eq(1)
+    yield table.request.ip_address.eq(ip_address)
+    yield table.source.ready.eq(1)
+    yield table.response.ready.eq(1)
+    while True:
+        yield
+        if (yield table.request.ready):
+            yield table.request.valid.eq(0)
+        if (yield table.source.valid) and (yield table.source.request):
+            requests.append((yield table.source.ip_address))
+            yield
+            yield table.sink.valid.eq(1)
+            yield table.sink.reply.eq(1)
+            yield table.sink.ip_address.eq(ip_address)
+            yield table.sink.mac_address.eq(mac_addresses[ip_address])
+            yield
+            yield table.sink.valid.eq(0)
+        if (yield table.response.valid):
+            mac_address = (yield table.response.mac_address)
+            yield table.request.valid.eq(0)
+            yield
+            return mac_address
+
+
+@passive
+def arp_table_responder(table, mac_addresses, requests):
+    # Answer the ARP requests (logged with their target MAC address: 0 for broadcasts).
+    replies = []
+    yield table.source.ready.eq(1)
+    while True:
+        yield table.sink.valid.eq(0)
+        if replies:
+            ip_address = replies.pop(0)
+            yield table.sink.valid.eq(1)
+            yield table.sink.reply.eq(1)
+            yield table.sink.ip_address.eq(ip_address)
+            yield table.sink.mac_address.eq(mac_addresses[ip_address])
+        yield
+        if (yield table.source.valid) and (yield table.source.request):
+            ip_address = (yield table.source.ip_address)
+            requests.append((ip_address, (yield table.source.mac_address)))
+            replies.append(ip_address)
+
+
+def arp_table_request(table, ip_address):
+    yield table.request.valid.eq(1)
+    yield table.request.ip_address.eq(ip_address)
+    yield table.response.ready.eq(1)
+    while not (yield table.response.valid):
+        yield
+        if (yield table.request.ready):
+            yield table.request.valid.eq(0)
+    yield table.request.valid.eq(0)
+    yield
+
+
 class TestARP(unittest.TestCase):
+    def test_table(self):
+        entries = 4
+        dut     = LiteEthARPTable(clk_freq=1000, entries=entries, lifetime=1, refresh_ahead=0)
+        hosts   = {0xc0a80100 + n: 0x10e2d5000000 + n for n in range(6)}
+        def generator():
+            requests = []
+            # Alternate traffic to 2 hosts: a single ARP request each.
+            for i in range(8):
+                ip_address  = 0xc0a80100 + i%2
+                mac_address = yield from arp_table_resolve(dut, ip_address, hosts, requests)
+                self.assertEqual(mac_address, hosts[ip_address])
+            self.assertEqual(requests, [0xc0a80100, 0xc0a80101])
+            self.assertEqual((yield dut._hits.status), 6)
+            self.assertEqual((yield dut._misses.status), 2)
+            # 6 hosts in a 4 entries table: 2 evictions.
+            for ip_address in hosts.keys():
+                mac_address = yield from arp_table_resolve(dut, ip_address, hosts, requests)
+                self.assertEqual(mac_address, hosts[ip_address])
+            self.assertEqual((yield dut._evictions.status), 2)
+            self.assertEqual((yield dut._size.status), entries)
+            # Entries expired after their lifetime: requested again.
+            for i in range(1000):
+                yield
+            del requests[:]
+            yield from arp_table_resolve(dut, 0xc0a80105, hosts, requests)
+            self.assertEqual(requests, [0xc0a80105])
+        run_simulation(dut, generator())
+
+
+    def test_table_refresh(self):
+        dut      = LiteEthARPTable(clk_freq=1000, lifetime=2, refresh_ahead=1)
+        hosts    = {0xc0a80101: 0x10e2d5000001, 0xc0a80102: 0x10e2d5000002}
+        requests = []
+        def generator():
+            # Host 1 used continuously (refreshed ahead of expiration), host 2 used once (expires).
+            yield from arp_table_request(dut, 0xc0a80101)
+            yield from arp_table_request(dut, 0xc0a80102)
+            for i in range(30):
+                yield from arp_table_request(dut, 0xc0a80101)
+                for j in range(200):
+                    yield
+            yield from arp_table_request(dut, 0xc0a80102)
+        run_simulation(dut, [generator(), arp_table_responder(dut, hosts, requests)])
+        broadcasts = [ip_address for ip_address, mac_address in requests if mac_address == 0]
+        refreshes  = [ip_address for ip_address, mac_address in requests if mac_address != 0]
+        self.assertEqual(broadcasts, [0xc0a80101, 0xc0a80102, 0xc0a80102])
+        self.assertTrue(refreshes.count(0xc0a80101) >= 2)
+        self.assertTrue(refreshes.count(0xc0a80102) <= 1)
+
     def test(self):
         dut = DUT()
         generators = {
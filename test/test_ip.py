@@ -5,6 +5,7 @@
 # SPDX-License-Identifier: BSD-2-Clause
 
 import unittest
+import random
 
 from migen import *
 
@@ -13,8 +14,11 @@ from litex.soc.interconnect.stream_sim import *
 
 from liteeth.common import *
 from liteeth.core import LiteEthIPCore
+from liteeth.core.arp import LiteEthARPTable
+from liteeth.core.ip import LiteEthIPTX, LiteEthIPV4TXChecksum, LiteEthIPRX
 
 from test.model import phy, mac, arp, ip
+from test.model.stream import stream_generator, stream_logger
 
 from litex.gen.sim import *
 
@@ -45,7 +49,374 @@ def main_generator(dut):
     print("packet from IP 0x{:08x}".format((yield dut.ip_port.sink.ip_address)))
 
 
+class IPTXDUT(Module):
+    def __init__(self, hold_packets, hold_policy="drop", static_entries=0, netmask=0, gateway=0,
+        mtu=eth_mtu, fragmentation=False):
+        self.submodules.arp_table = LiteEthARPTable(clk_freq=1000, static_entries=static_entries)
+        self.submodules.tx        = LiteEthIPTX(mac_address, ip_address, self.arp_table,
+            mtu           = mtu,
+            hold_packets  = hold_packets,
+            hold_policy   = hold_policy,
+            netmask       = netmask,
+            gateway       = gateway,
+            fragmentation = fragmentation)
+
+
+def iptx_generator(dut, packets):
+    for target_ip, payload in packets:
+        yield dut.tx.sink.ip_address.eq(target_ip)
+        yield dut.tx.sink.protocol.eq(udp_protocol)
+        yield dut.tx.sink.length.eq(len(payload))
+        yield from stream_generator(dut.tx.sink, [payload], 1, valid_rand=0)
+
+
+def iptx_logger(dut, npackets, received, header=False):
+    packet = []
+    yield dut.tx.source.ready.eq(1)
+    while len(received) < npackets:
+        yield
+        if (yield dut.tx.source.valid):
+            packet.append((yield dut.tx.source.data))
+            if (yield dut.tx.source.last):
+                if not header:
+                    packet = packet[ipv4_header.length:]
+                received.append(((yield dut.tx.source.target_mac), packet))
+                packet = []
+
+
+@passive
+def arp_responder(dut, hosts, requests):
+    # Answer the ARP requests for the hosts currently in hosts.
+    yield dut.arp_table.source.ready.eq(1)
+    while True:
+        yield
+        if (yield dut.arp_table.source.valid) and (yield dut.arp_table.source.request):
+            target_ip = (yield dut.arp_table.source.ip_address)
+            requests.append(target_ip)
+            if target_ip in hosts:
+                yield
+                yield dut.arp_table.sink.valid.eq(1)
+                yield dut.arp_table.sink.reply.eq(1)
+                yield dut.arp_table.sink.ip_address.eq(target_ip)
+                yield dut.arp_table.sink.mac_address.eq(hosts[target_ip])
+                yield
+                yield dut.arp_table.sink.valid.eq(0)
+
+
+def ip_rx_packet(target_ip, payload, corrupt=False, identification=0, flags_offset=0):
+    header  = [0x45, 0x00] + list((ipv4_header.length + len(payload)).to_bytes(2, "big"))
+    header += list(identification.to_bytes(2, "big")) + list(flags_offset.to_bytes(2, "big"))
+    header += [0x80, udp_protocol, 0, 0]
+    header += list(0xc0a80101.to_bytes(4, "big")) + list(target_ip.to_bytes(4, "big"))
+    value   = ip.checksum(header) ^ (0xffff if corrupt else 0)
+    header[10:12] = [value & 0xff, value >> 8]
+    return header + payload
+
+
+def ip_rx_fragments(target_ip, payload, identification, fragment_bytes):
+    fragments = []
+    for offset in range(0, len(payload), fragment_bytes):
+        more = (offset + fragment_bytes) < len(payload)
+        fragments.append(ip_rx_packet(target_ip, payload[offset:offset + fragment_bytes],
+            identification = identification,
+            flags_offset   = (ipv4_more_fragments if more else 0) | (offset//8)))
+    return fragments
+
+
+def stall_monitor(endpoint, stalls):
+    # Count the cycles where the endpoint is presented data it does not accept.
+    while True:
+        yield
+        if (yield endpoint.valid) and not (yield endpoint.ready):
+            stalls.append(1)
+
+
 class TestIP(unittest.TestCase):
+    def rx_bubbles_test(self, dw):
+        dut      = LiteEthIPRX(mac_address, ip_address, dw=dw)
+        payloads = [[n]*(4 + 4*n) for n in range(6)]
+        packets  = [
+            ip_rx_packet(ip_address, payloads[0]),
+            ip_rx_packet(ip_address, payloads[1], corrupt=True), # Dropped (checksum).
+            ip_rx_packet(0x12345679, payloads[2]),               # Dropped (target IP).
+            ip_rx_packet(ip_address, payloads[3]),
+            ip_rx_packet(ip_address, payloads[4]),
+            ip_rx_packet(ip_address, payloads[5]),
+        ]
+        received, errors, stalls = [], [], []
+        run_simulation(dut, [
+            stream_generator(dut.sink, packets, dw//8, valid_rand=0),
+            stream_logger(dut.source, 4, dw//8, received, errors, ready_rand=0),
+            passive(stall_monitor)(dut.sink, stalls),
+        ])
+        self.assertEqual(received, [payloads[n] for n in [0, 3, 4, 5]])
+        # Back-to-back packets accepted at one word per cycle (no bubble).
+        self.assertEqual(len(stalls), 0)
+
+    def test_rx_bubbles_8b(self):
+        self.rx_bubbles_test(8)
+
+    def test_rx_bubbles_32b(self):
+        self.rx_bubbles_test(32)
+
+    def test_tx_hold(self):
+        dut      = IPTXDUT(hold_packets=1)
+        host_a   = 0xc0a80101
+        host_b   = 0xc0a80102
+        host_c   = 0xc0a80103
+        hosts    = {host_b: 0x10e2d5000002}
+        requests = []
+        received = []
+        payloads = [[n]*32 for n in range(8)]
+        def generator():
+            # Resolve B.
+            yield from iptx_generator(dut, [(host_b, payloads[0])])
+            while len(received) < 1:
+                yield
+            # A unresolved: held, traffic to B keeps flowing, C dropped (hold buffer full).
+            yield from iptx_generator(dut, [
+                (host_a, payloads[1]),
+                (host_b, payloads[2]),
+                (host_c, payloads[3]),
+                (host_b, payloads[4]),
+            ])
+            while len(received) < 3:
+                yield
+            self.assertEqual((yield dut.tx._dropped.status), 1)
+            # A resolved: held packet sent.
+            hosts[host_a] = 0x10e2d5000001
+            while len(received) < 4:
+                yield
+            # C never resolved: dropped after the ARP retries.
+            yield from iptx_generator(dut, [(host_c, payloads[5]), (host_b, payloads[6])])
+            for i in range(2000):
+                yield
+            self.assertEqual((yield dut.tx._dropped.status), 2)
+        run_simulation(dut, [
+            generator(),
+            iptx_logger(dut, 5, received),
+            arp_responder(dut, hosts, requests),
+        ])
+        self.assertEqual(received, [
+            (hosts[host_b], payloads[0]),
+            (hosts[host_b], payloads[2]),
+            (hosts[host_b], payloads[4]),
+            (hosts[host_a], payloads[1]),
+            (hosts[host_b], payloads[6]),
+        ])
+
+    def test_tx_hold_block(self):
+        dut      = IPTXDUT(hold_packets=1, hold_policy="block")
+        host_a   = 0xc0a80101
+        hosts    = {}
+        requests = []
+        received = []
+        payloads = [[n]*32 for n in range(2)]
+        def generator():
+            # A unresolved: first packet held, second one waiting for space.
+            yield from iptx_generator(dut, [(host_a, payloads[0]), (host_a, payloads[1])])
+        def resolver():
+            for i in range(200):
+                yield
+            hosts[host_a] = 0x10e2d5000001
+            while len(received) < 2:
+                yield
+            # Blocked packet looked up (and counted as a hit) once.
+            self.assertEqual((yield dut.arp_table._hits.status), 1)
+            self.assertEqual((yield dut.tx._dropped.status), 0)
+        run_simulation(dut, [
+            generator(),
+            resolver(),
+            iptx_logger(dut, 2, received),
+            arp_responder(dut, hosts, requests),
+        ])
+        self.assertEqual(received, [(hosts[host_a], payloads[n]) for n in range(2)])
+
+    def test_tx_gateway(self):
+        gateway  = 0x123456fe
+        dut      = IPTXDUT(hold_packets=1, static_entries=1, netmask="255.255.255.0",
+            gateway=gateway)
+        host_a   = 0x12345601 # On the link.
+        host_b   = 0x0a000001 # Off the subnet (through the gateway).
+        host_c   = 0x0a000002 # Off the subnet (through the gateway).
+        hosts    = {host_a: 0x10e2d5000001}
+        requests = []
+        received = []
+        payloads = [[n]*32 for n in range(4)]
+        def generator():
+            # Gateway statically resolved.
+            yield dut.arp_table._static_ip0.storage.eq(gateway)
+            yield dut.arp_table._static_mac0.storage.eq(0x10e2d50000fe)
+            yield dut.arp_table._static_enable.storage.eq(0b1)
+            yield
+            yield from iptx_generator(dut, [
+                (host_b, payloads[0]),
+                (host_a, payloads[1]),
+                (host_c, payloads[2]),
+            ])
+            # Routing disabled: host C resolved directly (never answered).
+            while len(received) < 3:
+                yield
+            yield dut.tx._gateway.storage.eq(0)
+            yield from iptx_generator(dut, [(host_c, payloads[3])])
+            for i in range(2000):
+                yield
+            self.assertEqual((yield dut.tx._dropped.status), 1)
+        run_simulation(dut, [
+            generator(),
+            iptx_logger(dut, 3, received),
+            arp_responder(dut, hosts, requests),
+        ])
+        self.assertEqual(received, [
+            (0x10e2d50000fe, payloads[0]),
+            (hosts[host_a],  payloads[1]),
+            (0x10e2d50000fe, payloads[2]),
+        ])
+        self.assertEqual(requests[0], host_a)
+        self.assertEqual(set(requests), {host_a, host_c})
+
+    def test_tx_checksum(self):
+        prng = random.Random(42)
+        dut  = LiteEthIPV4TXChecksum(ip_address, ttl=0x80)
+        def generator():
+            for i in range(64):
+                total_length = prng.randrange(2**16)
+                protocol     = prng.randrange(2**8)
+                target_ip    = prng.randrange(2**32)
+                yield dut.total_length.eq(total_length)
+                yield dut.protocol.eq(protocol)
+                yield dut.target_ip.eq(target_ip)
+                yield
+                header  = [0x45, 0x00] + list(total_length.to_bytes(2, "big")) + [0]*4
+                header += [0x80, protocol, 0, 0]
+                header += list(ip_address.to_bytes(4, "big")) + list(target_ip.to_bytes(4, "big"))
+                value   = ip.checksum(header)
+                self.assertEqual((yield dut.value), ((value & 0xff) << 8) | (value >> 8))
+        run_simulation(dut, generator())
+
+    def test_tx_latency(self):
+        # Header sent on the cycle following the first sink.valid (no checksum computation wait).
+        dut     = IPTXDUT(hold_packets=1)
+        latency = []
+        def generator():
+            yield dut.tx.sink.ip_address.eq(0xe0000001) # Multicast: no resolution.
+            yield dut.tx.sink.protocol.eq(udp_protocol)
+            yield dut.tx.sink.length.eq(4)
+            yield dut.tx.source.ready.eq(1)
+            yield dut.tx.sink.valid.eq(1)
+            for i in range(16):
+                yield
+                if (yield dut.tx.source.valid):
+                    latency.append(i)
+                    break
+        run_simulation(dut, generator())
+        self.assertEqual(latency, [1])
+
+    def test_tx_fragmentation(self):
+        dut      = IPTXDUT(hold_packets=1, static_entries=1, mtu=100 + eth_mtu_overhead,
+            fragmentation=True)
+        prng     = random.Random(42)
+        payloads = [[prng.randrange(256) for _ in range(n)] for n in [200, 30, 160]]
+        received = []
+        def generator():
+            yield dut.arp_table._static_ip0.storage.eq(0x12345601)
+            yield dut.arp_table._static_mac0.storage.eq(0x10e2d5000001)
+            yield dut.arp_table._static_enable.storage.eq(0b1)
+            yield
+            yield from iptx_generator(dut, [(0x12345601, payload) for payload in payloads])
+        run_simulation(dut, [generator(), iptx_logger(dut, 6, received, header=True)])
+        # Fragments of 80 bytes (largest multiple of 8 fitting in the MTU with the header).
+        fragments = []
+        for target_mac, packet in received:
+            header = packet[:ipv4_header.length]
+            self.assertEqual(ip.checksum(header), 0)
+            self.assertEqual(int.from_bytes(bytes(header[2:4]), "big"), len(packet))
+            fragments.append((
+                int.from_bytes(bytes(header[4:6]), "big"), # Identification.
+                int.from_bytes(bytes(header[6:8]), "big"), # Flags/Offset.
+                packet[ipv4_header.length:]))
+        self.assertEqual([(i, f) for i, f, _ in fragments], [
+            (0, ipv4_more_fragments | 0), (0, ipv4_more_fragments | 10), (0, 20),
+            (1, 0),
+            (2, ipv4_more_fragments | 0), (2, 10),
+        ])
+        self.assertEqual([p for _, _, p in fragments], [
+            payloads[0][:80], payloads[0][80:160], payloads[0][160:],
+            payloads[1],
+            payloads[2][:80], payloads[2][80:],
+        ])
+
+    def test_tx_fragmentation_mtu(self):
+        # Default MTU: fragments of at most 1500 bytes (standard IP MTU).
+        dut      = IPTXDUT(hold_packets=1, fragmentation=True)
+        payload  = [n%256 for n in range(4000)]
+        received = []
+        def generator():
+            yield from iptx_generator(dut, [(0xe0000001, payload)]) # Multicast: no resolution.
+        run_simulation(dut, [generator(), iptx_logger(dut, 3, received, header=True)])
+        self.assertEqual([len(packet) for _, packet in received], [1500, 1500, 1060])
+        self.assertEqual(sum([packet[ipv4_header.length:] for _, packet in received], []), payload)
+
+    def rx_reassembly_test(self, dw):
+        dut      = LiteEthIPRX(mac_address, ip_address, dw=dw, reassembly=True, reassembly_size=512,
+            reassembly_timeout=2000)
+        prng     = random.Random(42)
+        payloads = [[prng.randrange(256) for _ in range(n)] for n in [200, 32, 300, 40, 600, 150]]
+        a = ip_rx_fragments(ip_address, payloads[0], 1, 64)
+        b = ip_rx_fragments(ip_address, payloads[2], 2, 128)
+        c = ip_rx_fragments(ip_address, payloads[4], 3, 128)
+        d = ip_rx_fragments(ip_address, payloads[5], 4, 64)
+        packets = [
+            a[1], ip_rx_packet(ip_address, payloads[1]), a[3], a[0], a[2], # A (out of order).
+            b[0], c[0], b[2], b[1],                                         # B (C dropped: busy).
+            d[0], d[1],                                                     # D (never completed).
+            ip_rx_packet(ip_address, payloads[3]),
+        ]
+        received, errors = [], []
+        def generator():
+            yield from stream_generator(dut.sink, packets, dw//8, valid_rand=0)
+            for i in range(4000):
+                yield
+            self.assertEqual((yield dut.reassembler._dropped.status),  1)
+            self.assertEqual((yield dut.reassembler._timeouts.status), 1)
+            # Reassembly possible again after the timeout.
+            yield from stream_generator(dut.sink, d[::-1], dw//8, valid_rand=0)
+        run_simulation(dut, [
+            generator(),
+            stream_logger(dut.source, 5, dw//8, received, errors, ready_rand=50),
+        ])
+        self.assertEqual(received, [payloads[n] for n in [1, 0, 2, 3, 5]])
+
+    def test_rx_reassembly_8b(self):
+        self.rx_reassembly_test(8)
+
+    def test_rx_reassembly_32b(self):
+        self.rx_reassembly_test(32)
+
+    def rx_reassembly_padding_test(self, dw):
+        dut      = LiteEthIPRX(mac_address, ip_address, dw=dw, reassembly=True, reassembly_size=512)
+        prng     = random.Random(42)
+        payloads = [[prng.randrange(256) for _ in range(n)] for n in [136, 512]]
+        padding  = [0xee]*40
+        a = ip_rx_fragments(ip_address, payloads[0], 1, 64)
+        b = ip_rx_fragments(ip_address, payloads[1], 2, 256)
+        packets = [
+            a[1], a[0] + padding, a[2], # Padding over an already received fragment.
+            b[0], b[1] + padding,       # Padding past the end of the buffer.
+        ]
+        received, errors = [], []
+        run_simulation(dut, [
+            stream_generator(dut.sink, packets, dw//8, valid_rand=0),
+            stream_logger(dut.source, 2, dw//8, received, errors),
+        ])
+        self.assertEqual(received, payloads)
+
+    def test_rx_reassembly_padding_8b(self):
+        self.rx_reassembly_padding_test(8)
+
+    def test_rx_reassembly_padding_32b(self):
+        self.rx_reassembly_padding_test(32)
+
     def test(self):
         dut = DUT()
         generators = {
@@ -0,0 +1,190 @@
+#
+# This file is part of LiteEth.
+#
+# Copyright (c) 2026 AEW2015 <AEW2015@users.noreply.github.com>
+# SPDX-License-Identifier: BSD-2-Clause
+
+import unittest
+import random
+
+from migen import *
+
+from liteeth.common import *
+from liteeth.mac.checksum import *
+from liteeth.mac.sram import LiteEthMACSRAMWriter, LiteEthMACSRAMReader
+
+from test.model.stream import stream_generator, stream_logger
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def checksum(data):
+    data = data + [0]*(len(data)%2)
+    s    = sum((data[i] << 8) | data[i + 1] for i in range(0, len(data), 2))
+    while s >> 16:
+        s = (s & 0xffff) + (s >> 16)
+    return (~s) & 0xffff
+
+def ip_frame(prng, protocol, payload_length, options=0, udp_no_checksum=False):
+    # Ethernet header.
+    frame  = [prng.randrange(256) for _ in range(12)] + [0x08, 0x00]
+    # IPv4 header.
+    ihl    = 5 + options
+    length = 4*ihl + payload_length
+    ip     = [0x40 | ihl, 0, length >> 8, length & 0xff, 0, 0, 0x40, 0, 64, protocol, 0, 0]
+    ip    += [prng.randrange(256) for _ in range(8 + 4*options)]
+    cs     = checksum(ip)
+    ip[10:12] = [cs >> 8, cs & 0xff]
+    # UDP/TCP header and payload.
+    l4     = [prng.randrange(256) for _ in range(payload_length)]
+    offset = {udp_protocol: 6, tcp_protocol: 16}.get(protocol, None)
+    if offset is not None:
+        if protocol == udp_protocol:
+            l4[4:6] = [payload_length >> 8, payload_length & 0xff]
+        l4[offset:offset + 2] = [0, 0]
+        if not udp_no_checksum:
+            pseudo = ip[12:20] + [0, protocol, payload_length >> 8, payload_length & 0xff]
+            cs     = checksum(pseudo + l4)
+            if protocol == udp_protocol and cs == 0:
+                cs = 0xffff
+            l4[offset:offset + 2] = [cs >> 8, cs & 0xff]
+    # Ethernet padding.
+    frame += ip + l4
+    return frame + [0]*max(60 - len(frame), 0)
+
+def corrupt_checksums(frame):
+    # Checksum fields filled with garbage.
+    frame = list(frame)
+    if frame[12:14] == [0x08, 0x00]:
+        frame[24:26] = [0xde, 0xad]
+        if frame[23] in [udp_protocol, tcp_protocol]:
+            offset = 14 + 4*(frame[14] & 0xf) + (6 if frame[23] == udp_protocol else 16)
+            frame[offset:offset + 2] = [0xbe, 0xef]
+    return frame
+
+def frame_to_words(frame, nbytes, endianness):
+    frame = frame + [0]*(-len(frame)%nbytes)
+    return [int.from_bytes(bytes(frame[i:i + nbytes]), "big" if endianness == "big" else "little")
+        for i in range(0, len(frame), nbytes)]
+
+# Test MAC Checksum --------------------------------------------------------------------------------
+
+class TestMACChecksum(unittest.TestCase):
+    def frames(self):
+        prng = random.Random(42)
+        return [
+            (ip_frame(prng, udp_protocol, 100),                       (1, 1, 1, 1)),
+            (ip_frame(prng, udp_protocol, 8),                         (1, 1, 1, 1)),
+            (ip_frame(prng, tcp_protocol, 333, options=2),            (1, 1, 1, 1)),
+            (ip_frame(prng, udp_protocol, 41, udp_no_checksum=True),  (1, 1, 1, 1)),
+            (ip_frame(prng, icmp_protocol, 64),                       (1, 1, 0, 0)),
+            ([prng.randrange(256) for _ in range(64)],                (0, 0, 0, 0)),
+        ]
+
+    def checksum_check_test(self, dw, endianness):
+        dut    = LiteEthMACChecksum(dw, endianness, mode="check")
+        frames = self.frames()
+        # Corrupted IPv4 header and UDP payload.
+        bad_ip = list(frames[0][0])
+        bad_ip[22] ^= 0x01
+        bad_l4 = list(frames[2][0])
+        bad_l4[70] ^= 0x80
+        frames += [(bad_ip, (1, 0, 1, 1)), (bad_l4, (1, 1, 1, 0))]
+        def generator():
+            for frame, expected in frames:
+                words = frame_to_words(frame, dw//8, endianness)
+                for i, word in enumerate(words):
+                    yield dut.valid.eq(1)
+                    yield dut.data.eq(word)
+                    yield dut.last.eq(i == len(words) - 1)
+                    yield
+                yield dut.valid.eq(0)
+                yield
+                results = ((yield dut.ip), (yield dut.ip_ok), (yield dut.l4), (yield dut.l4_ok))
+                self.assertEqual(results, expected)
+        run_simulation(dut, generator())
+
+    def test_checksum_check_32b_big(self):
+        self.checksum_check_test(32, "big")
+
+    def test_checksum_check_32b_little(self):
+        self.checksum_check_test(32, "little")
+
+    def test_checksum_insert(self):
+        dw, endianness = 32, "little"
+        dut = LiteEthMACChecksum(dw, endianness, mode="insert")
+        def generator():
+            for n, (frame, (ip, _, l4, _)) in enumerate(self.frames()):
+                if n == 3:
+                    continue # UDP without checksum (a checksum would be inserted).
+                words = frame_to_words(corrupt_checksums(frame), dw//8, endianness)
+                for i, word in enumerate(words):
+                    yield dut.valid.eq(1)
+                    yield dut.data.eq(word)
+                    yield dut.last.eq(i == len(words) - 1)
+                    yield
+                yield dut.valid.eq(0)
+                yield
+                out = []
+                for i, word in enumerate(words):
+                    yield dut.tx_offset.eq(4*i)
+                    yield dut.tx_data_in.eq(word)
+                    yield
+                    out.append((yield dut.tx_data))
+                self.assertEqual(out, frame_to_words(frame, dw//8, endianness))
+        run_simulation(dut, generator())
+
+    def test_sram_writer_checksum(self):
+        dut    = LiteEthMACSRAMWriter(32, 400, nslots=2, endianness="little", checksum=True)
+        dut.specials += dut.mems
+        frames = self.frames()
+        bad_l4 = list(frames[0][0])
+        bad_l4[50] ^= 0x10
+        frames += [(bad_l4, (1, 1, 1, 0))]
+        results = []
+        def generator():
+            for frame, _ in frames:
+                yield from stream_generator(dut.sink, [frame], 4, valid_rand=0)
+                while not (yield dut.ev.available.trigger):
+                    yield
+                status = (yield dut._checksum.status)
+                results.append(tuple((status >> i) & 0b1 for i in range(4)))
+                yield dut.ev.pending.re.eq(1)
+                yield dut.ev.pending.r.eq(1)
+                yield
+                yield dut.ev.pending.re.eq(0)
+                yield dut.ev.pending.r.eq(0)
+                yield
+        run_simulation(dut, generator())
+        self.assertEqual(results, [expected for _, expected in frames])
+
+    def test_sram_reader_checksum(self):
+        nslots = 2
+        dut    = LiteEthMACSRAMReader(32, 400, nslots, endianness="little", checksum=True)
+        dut.specials += dut.mems
+        frames = [frame for n, (frame, _) in enumerate(self.frames()) if n != 3]
+        # Insertion disabled on the last frame: sent as is.
+        expected = frames + [corrupt_checksums(frames[0])]
+        received, errors = [], []
+        def generator():
+            for n, frame in enumerate(expected):
+                while not (yield dut._ready.status):
+                    yield
+                while (yield dut._level.status) == nslots:
+                    yield
+                tx_frame = corrupt_checksums(frame)
+                for i, word in enumerate(frame_to_words(tx_frame, 4, "little")):
+                    yield dut.mems[n%nslots][i].eq(word)
+                yield dut._checksum.storage.eq(0b00 if n == len(frames) else 0b11)
+                yield dut._slot.storage.eq(n%nslots)
+                yield dut._length.storage.eq(len(frame))
+                yield dut._start.re.eq(1)
+                yield
+                yield dut._start.re.eq(0)
+                # Wait for the packet to be sent before reusing the slot.
+                while (yield dut._level.status) != 0:
+                    yield
+        run_simulation(dut, [
+            generator(),
+            stream_logger(dut.source, len(expected), 4, received, errors),
+        ])
+        self.assertEqual(received, expected)
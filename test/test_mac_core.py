@@ -5,6 +5,7 @@
 # SPDX-License-Identifier: BSD-2-Clause
 
 import unittest
+import random
 
 from migen import *
 
@@ -13,17 +14,20 @@ from litex.soc.interconnect.stream_sim import *
 
 from liteeth.common import *
 from liteeth.mac.core import LiteEthMACCore
+from liteeth.phy.model import LiteEthPHY10GBASERModel
 
 from test.model import phy, mac
+from test.model.stream import stream_generator, stream_logger
 
 from litex.gen.sim import *
 
 
 class DUT(Module):
-    def __init__(self):
+    def __init__(self, rx_mode="cut-through"):
         self.submodules.phy_model = phy.PHY(8, debug=False)
         self.submodules.mac_model = mac.MAC(self.phy_model, debug=False, loopback=True)
-        self.submodules.core = LiteEthMACCore(phy=self.phy_model, dw=8, with_preamble_crc=True)
+        self.submodules.core = LiteEthMACCore(phy=self.phy_model, dw=8, with_preamble_crc=True,
+            rx_mode=rx_mode)
 
         self.submodules.streamer = PacketStreamer(eth_phy_description(8), last_be=1)
         self.submodules.streamer_randomizer = Randomizer(eth_phy_description(8), level=50)
@@ -39,6 +43,13 @@ class DUT(Module):
         ]
 
 
+class DUT10G(Module):
+    def __init__(self, dw, endianness="little", rx_mode="cut-through"):
+        self.submodules.phy  = LiteEthPHY10GBASERModel()
+        self.submodules.core = LiteEthMACCore(phy=self.phy, dw=dw, endianness=endianness,
+            with_preamble_crc=True, rx_mode=rx_mode)
+
+
 def main_generator(dut):
     for i in range(2):
         packet = mac.MACPacket([i for i in range(64)])
@@ -54,8 +65,8 @@ def main_generator(dut):
         print("shift " + str(s) + " / length " + str(l) + " / errors " + str(e))
 
 class TestMACCore(unittest.TestCase):
-    def test(self):
-        dut = DUT()
+    def test(self, rx_mode="cut-through"):
+        dut = DUT(rx_mode)
         generators = {
             "sys" :   [main_generator(dut),
                        dut.streamer.generator(),
@@ -70,3 +81,35 @@ class TestMACCore(unittest.TestCase):
                   "eth_rx": 10,
                   "eth_tx": 10}
         run_simulation(dut, generators, clocks, vcd_name="sim.vcd")
+
+    def test_store_and_forward(self):
+        self.test(rx_mode="store-and-forward")
+
+    def core_10g_test(self, dw, rx_mode="cut-through"):
+        nbytes  = dw//8
+        prng    = random.Random(dw)
+        packets = [[prng.randrange(256) for _ in range(prng.randrange(60, 256))] for _ in range(8)]
+        # Short packet, padded to 60 bytes.
+        packets[3] = [prng.randrange(256) for _ in range(21)]
+        dut = DUT10G(dw, rx_mode=rx_mode)
+        received, errors = [], []
+        def generator():
+            while not (yield dut.phy.pcs.block_lock):
+                yield
+            yield from stream_generator(dut.core.sink, packets, nbytes, valid_rand=0)
+        generators = {
+            "sys" : [generator(), stream_logger(dut.core.source, len(packets), nbytes, received, errors, ready_rand=0)],
+        }
+        clocks = {"sys":    10,
+                  "eth_rx": 10,
+                  "eth_tx": 10}
+        run_simulation(dut, generators, clocks)
+        packets[3] += [0]*(60 - len(packets[3]))
+        self.assertEqual(received, packets)
+        self.assertEqual(errors, [False]*len(packets))
+
+    def test_10g(self):
+        self.core_10g_test(64)
+
+    def test_10g_128b(self):
+        self.core_10g_test(128, rx_mode="store-and-forward")
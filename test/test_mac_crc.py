@@ -0,0 +1,72 @@
+#
+# This file is part of LiteEth.
+#
+# Copyright (c) 2026 AEW2015 <AEW2015@users.noreply.github.com>
+# SPDX-License-Identifier: BSD-2-Clause
+
+import unittest
+import random
+import binascii
+
+from migen import *
+
+from liteeth.common import *
+from liteeth.mac.crc import LiteEthMACCRC32PipelinedInserter, LiteEthMACCRC32PipelinedChecker
+
+from test.model.stream import stream_generator, stream_logger
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def crc32(packet):
+    return list(binascii.crc32(bytes(packet)).to_bytes(4, byteorder="little"))
+
+# Test MAC CRC -------------------------------------------------------------------------------------
+
+class TestMACCRC(unittest.TestCase):
+    def get_packets(self, n):
+        prng = random.Random(n)
+        return [[prng.randrange(256) for _ in range(prng.randrange(46, 128))] for _ in range(n)]
+
+    def inserter_test(self, dw, stages):
+        nbytes  = dw//8
+        packets = self.get_packets(8)
+        dut     = LiteEthMACCRC32PipelinedInserter(eth_phy_description(dw), stages)
+        received, errors = [], []
+        generators = [
+            stream_generator(dut.sink, packets, nbytes),
+            stream_logger(dut.source, len(packets), nbytes, received, errors),
+        ]
+        run_simulation(dut, generators)
+        for packet, rx_packet in zip(packets, received):
+            self.assertEqual(packet + crc32(packet), rx_packet)
+
+    def checker_test(self, dw, stages):
+        nbytes  = dw//8
+        packets = self.get_packets(8)
+        corrupt = [i%3 == 1 for i in range(len(packets))]
+        tx_packets = []
+        for packet, c in zip(packets, corrupt):
+            tx_packet = packet + crc32(packet)
+            if c:
+                tx_packet[len(tx_packet)//2] ^= 0x01
+            tx_packets.append(tx_packet)
+        dut = LiteEthMACCRC32PipelinedChecker(eth_phy_description(dw), stages)
+        received, errors = [], []
+        generators = [
+            stream_generator(dut.sink, tx_packets, nbytes),
+            stream_logger(dut.source, len(packets), nbytes, received, errors),
+        ]
+        run_simulation(dut, generators)
+        for packet, c, rx_packet, error in zip(packets, corrupt, received, errors):
+            self.assertEqual(len(packet), len(rx_packet))
+            self.assertEqual(c, error)
+            if not c:
+                self.assertEqual(packet, rx_packet)
+
+    def test_crc32_pipelined_inserter(self):
+        for dw, stages in [(32, 1), (64, 0), (128, 2), (256, 1)]:
+            self.inserter_test(dw, stages)
+
+    def test_crc32_pipelined_checker(self):
+        for dw, stages in [(32, 1), (64, 0), (128, 2), (256, 1)]:
+            self.checker_test(dw, stages)
@@ -0,0 +1,152 @@
+#
+# This file is part of LiteEth.
+#
+# Copyright (c) 2026 AEW2015 <AEW2015@users.noreply.github.com>
+# SPDX-License-Identifier: BSD-2-Clause
+
+import unittest
+import random
+
+from migen import *
+
+from litex.soc.interconnect import wishbone
+
+from liteeth.common import *
+from liteeth.mac.dma import *
+
+from test.model.stream import stream_generator, stream_logger
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def descriptor(length, address, own=1):
+    return [(own << dma_own_bit) | length, address, 0, 0]
+
+def memory_write(mem, address, data):
+    # Little-endian bytes in 32-bit words.
+    data = data + [0]*(-len(data)%4)
+    for n in range(0, len(data), 4):
+        yield mem[(address + n)//4].eq(int.from_bytes(bytes(data[n:n+4]), byteorder="little"))
+
+def memory_read(mem, address, length):
+    data = []
+    for n in range(0, length, 4):
+        data += list(((yield mem[(address + n)//4])).to_bytes(4, byteorder="little"))
+    return data[:length]
+
+# DUT ----------------------------------------------------------------------------------------------
+
+class DUT(Module):
+    def __init__(self):
+        self.submodules.dma  = LiteEthMACDMAInterface(dw=32, endianness="little")
+        self.submodules.sram = wishbone.SRAM(0x4000)
+        self.comb += self.dma.bus.connect(self.sram.bus)
+        self.mem = self.sram.mem
+
+# Test MAC DMA -------------------------------------------------------------------------------------
+
+class TestMACDMA(unittest.TestCase):
+    def test_dma_rx(self):
+        prng    = random.Random(42)
+        dut     = DUT()
+        writer  = dut.dma.writer
+        packets = [[prng.randrange(256) for _ in range(prng.randrange(60, 200))] for _ in range(7)]
+        errors  = [i == 1 for i in range(len(packets))]
+        sizes   = [0x400, 0x400, 40, 0x400]
+        done    = []
+        def generator():
+            for n, size in enumerate(sizes):
+                for i, word in enumerate(descriptor(size, 0x1000 + n*0x400)):
+                    yield dut.mem[4*n + i].eq(word)
+            yield writer.base.storage.eq(0)
+            yield writer.size.storage.eq(len(sizes))
+            yield writer.enable.storage.eq(1)
+            yield
+            yield from stream_generator(dut.dma.sink, packets, 4, errors=errors)
+            for i in range(256):
+                yield
+            done.append(True)
+        def checker():
+            # Errored frame ignored, frames received without owned descriptor dropped.
+            expected = [p for p, e in zip(packets, errors) if not e]
+            while not done:
+                yield
+            for n, size in enumerate(sizes):
+                status = (yield dut.mem[4*n])
+                length = status & (2**dma_length_bits - 1)
+                self.assertEqual(status >> dma_own_bit, 0)
+                self.assertEqual((status >> dma_error_bit) & 0b1, int(len(expected[n]) > size))
+                self.assertEqual(length, min(len(expected[n]), size))
+                data = yield from memory_read(dut.mem, 0x1000 + n*0x400, length)
+                self.assertEqual(data, expected[n][:length])
+            self.assertEqual((yield writer.errors.status), 2)
+            self.assertEqual((yield writer.index.status), 0)
+        run_simulation(dut, [generator(), checker()])
+
+    def test_dma_tx(self):
+        prng    = random.Random(43)
+        dut     = DUT()
+        reader  = dut.dma.reader
+        packets = [[prng.randrange(256) for _ in range(length)] for length in [60, 61, 62, 63, 127]]
+        received, errors = [], []
+        def generator():
+            for n, packet in enumerate(packets):
+                own = int(n != 3) # Descriptor 3 not given to the MAC (yet).
+                for i, word in enumerate(descriptor(len(packet), 0x1000 + n*0x400, own)):
+                    yield dut.mem[4*n + i].eq(word)
+                yield from memory_write(dut.mem, 0x1000 + n*0x400, packet)
+            yield reader.base.storage.eq(0)
+            yield reader.size.storage.eq(len(packets))
+            yield reader.enable.storage.eq(1)
+            yield reader.start.re.eq(1)
+            yield
+            yield reader.start.re.eq(0)
+            while len(received) < 3:
+                yield
+            for i in range(64):
+                yield
+            self.assertEqual((yield reader.index.status), 3)
+            # Give descriptors 3 and 4 to the MAC.
+            yield dut.mem[4*3].eq((1 << dma_own_bit) | len(packets[3]))
+            yield reader.start.re.eq(1)
+            yield
+            yield reader.start.re.eq(0)
+        run_simulation(dut, [
+            generator(),
+            stream_logger(dut.dma.source, len(packets), 4, received, errors),
+        ])
+        self.assertEqual(received, packets)
+
+    def test_dma_tx_invalid(self):
+        prng    = random.Random(44)
+        dut     = DUT()
+        reader  = dut.dma.reader
+        lengths = [60, 0x1000, 0, 62] # Descriptors 1 (larger than the frame buffer) and 2 invalid.
+        packets = [[prng.randrange(256) for _ in range(length)] for length in lengths]
+        received, errors = [], []
+        def generator():
+            for n, packet in enumerate(packets):
+                for i, word in enumerate(descriptor(len(packet), 0x1000 + n*0x400)):
+                    yield dut.mem[4*n + i].eq(word)
+                yield from memory_write(dut.mem, 0x1000 + n*0x400, packet[:0x400])
+            yield reader.base.storage.eq(0)
+            yield reader.size.storage.eq(len(packets))
+            yield reader.enable.storage.eq(1)
+            yield reader.start.re.eq(1)
+            yield
+            yield reader.start.re.eq(0)
+            while len(received) < 2:
+                yield
+            for i in range(64):
+                yield
+            # All the descriptors given back, the invalid ones with the error bit set.
+            for n, length in enumerate(lengths):
+                status = (yield dut.mem[4*n])
+                self.assertEqual(status >> dma_own_bit, 0)
+                self.assertEqual((status >> dma_error_bit) & 0b1, int(n in [1, 2]))
+                self.assertEqual(status & (2**dma_length_bits - 1), length)
+            self.assertEqual((yield reader.index.status), 0)
+        run_simulation(dut, [
+            generator(),
+            stream_logger(dut.dma.source, 2, 4, received, errors),
+        ])
+        self.assertEqual(received, [packets[0], packets[3]])
@@ -0,0 +1,43 @@
+#
+# This file is part of LiteEth.
+#
+# Copyright (c) 2026 AEW2015 <AEW2015@users.noreply.github.com>
+# SPDX-License-Identifier: BSD-2-Clause
+
+import unittest
+import random
+
+from migen import *
+
+from liteeth.common import *
+from liteeth.mac.drop import LiteEthMACErrorDropper
+
+from test.model.stream import stream_generator, stream_logger
+
+# Test MAC Drop ------------------------------------------------------------------------------------
+
+class TestMACDrop(unittest.TestCase):
+    def dropper_test(self, dw, depth):
+        nbytes  = dw//8
+        prng    = random.Random(dw)
+        packets = [[prng.randrange(256) for _ in range(prng.randrange(46, 128))] for _ in range(8)]
+        errors  = [i%3 == 1 for i in range(len(packets))]
+        # Packet larger than the buffer.
+        packets[5] = [prng.randrange(256) for _ in range(depth*nbytes + 1)]
+        dropped = [e or (i == 5) for i, e in enumerate(errors)]
+
+        dut = LiteEthMACErrorDropper(dw, depth)
+        received, rx_errors = [], []
+        generators = [
+            stream_generator(dut.sink, packets, nbytes, errors=errors, valid_rand=0),
+            stream_logger(dut.source, dropped.count(False), nbytes, received, rx_errors),
+        ]
+        run_simulation(dut, generators)
+        self.assertEqual(received, [p for p, d in zip(packets, dropped) if not d])
+        self.assertEqual(rx_errors, [False]*len(received))
+
+    def test_dropper_8b(self):
+        self.dropper_test(8, 512)
+
+    def test_dropper_32b(self):
+        self.dropper_test(32, 128)
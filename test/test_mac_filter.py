@@ -0,0 +1,70 @@
+#
+# This file is part of LiteEth.
+#
+# Copyright (c) 2026 AEW2015 <AEW2015@users.noreply.github.com>
+# SPDX-License-Identifier: BSD-2-Clause
+
+import unittest
+import random
+import zlib
+
+from migen import *
+
+from liteeth.common import *
+from liteeth.mac.filter import *
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def mac_hash(address, hash_size):
+    return zlib.crc32(address.to_bytes(6, byteorder="big")) % hash_size
+
+# Test MAC Filter ----------------------------------------------------------------------------------
+
+class TestMACFilter(unittest.TestCase):
+    def filter_test(self, hash_size):
+        hw_mac     = 0x10e2d5000000
+        cpu_mac    = 0x10e2d5000001
+        multicasts = [0x01005e000001, 0x01005e7f0203, 0x333300000001]
+        dut = LiteEthMACFilter(naddresses=4, hash_size=hash_size,
+            addresses      = [(hw_mac, filter_action_hw)],
+            default_action = filter_action_cpu)
+        prng = random.Random(hash_size)
+        def check(address, action):
+            yield dut.address.eq(address)
+            yield
+            self.assertEqual((yield dut.action), action, hex(address))
+        def generator():
+            # Reset configuration.
+            yield from check(hw_mac,              filter_action_hw)
+            yield from check(cpu_mac,             filter_action_cpu)
+            yield from check(0xffffffffffff,      filter_action_both)
+            yield from check(multicasts[0],       filter_action_cpu)
+            # Exact-match entries.
+            yield dut.address1.storage.eq(cpu_mac)
+            yield dut.action1.storage.eq(filter_action_drop)
+            yield dut.enable.storage.eq(0b11)
+            yield dut.broadcast_action.storage.eq(filter_action_hw)
+            yield from check(cpu_mac,             filter_action_drop)
+            yield from check(0xffffffffffff,      filter_action_hw)
+            yield dut.enable.storage.eq(0b01)
+            yield from check(cpu_mac,             filter_action_cpu)
+            # Multicast hash table.
+            table = 0
+            for address in multicasts[:2]:
+                table |= 1 << mac_hash(address, hash_size)
+            yield dut.hash_table.storage.eq(table)
+            yield dut.multicast_action.storage.eq(filter_action_both)
+            yield dut.default_action.storage.eq(filter_action_drop)
+            for address in multicasts + [prng.randrange(2**48) | (1 << 40) for _ in range(64)]:
+                hit = (table >> mac_hash(address, hash_size)) & 0b1
+                yield from check(address, filter_action_both if hit else filter_action_drop)
+            # Unicast addresses do not use the hash table.
+            for address in [prng.randrange(2**48) & ~(1 << 40) for _ in range(16)]:
+                yield from check(address, filter_action_drop)
+        run_simulation(dut, generator())
+
+    def test_filter_hash64(self):
+        self.filter_test(64)
+
+    def test_filter_hash512(self):
+        self.filter_test(512)
@@ -0,0 +1,96 @@
+#
+# This file is part of LiteEth.
+#
+# Copyright (c) 2026 AEW2015 <AEW2015@users.noreply.github.com>
+# SPDX-License-Identifier: BSD-2-Clause
+
+import unittest
+import random
+
+from migen import *
+
+from liteeth.common import *
+from liteeth.mac.gap import LiteEthMACGap
+
+from test.model.stream import stream_generator
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def gap_logger(endpoint, npackets, nbytes, gaps):
+    # Log the interpacket gaps (in bytes) on endpoint (always ready).
+    yield endpoint.ready.eq(1)
+    idle   = None
+    ending = False
+    n      = 0
+    while n < npackets:
+        yield
+        if (yield endpoint.valid):
+            if ending:
+                ending = False
+                if idle is not None:
+                    gaps.append(idle)
+            if (yield endpoint.last):
+                last_be = (yield endpoint.last_be)
+                idle    = 0 if last_be == 0 else nbytes - 1 - log2_int(last_be)
+                ending  = True
+                n      += 1
+        elif idle is not None:
+            idle += nbytes
+
+# Test MAC Gap -------------------------------------------------------------------------------------
+
+class TestMACGap(unittest.TestCase):
+    def gap_test(self, dw, dic, lengths):
+        nbytes  = dw//8
+        prng    = random.Random(dw)
+        # Packets (with preamble) sent back to back.
+        packets = [[prng.randrange(256) for _ in range(8 + length)] for length in lengths]
+        dut     = LiteEthMACGap(dw, dic=dic)
+        gaps    = []
+        generators = [
+            stream_generator(dut.sink, packets, nbytes, valid_rand=0),
+            gap_logger(dut.source, len(packets), nbytes, gaps),
+        ]
+        run_simulation(dut, generators)
+        self.assertEqual(len(gaps), len(packets) - 1)
+        return gaps
+
+    def efficiency(self, lengths, gaps):
+        # Line-rate efficiency: packets bytes / (packets + gaps bytes).
+        nbytes = sum(8 + length for length in lengths[1:])
+        return nbytes/(nbytes + sum(gaps))
+
+    def check_dic_gaps(self, gaps):
+        # No gap shorter than 9 bytes (IEEE 802.3 clause 46: deficit of at most 3 bytes).
+        self.assertTrue(min(gaps) >= 9)
+        # Average of 12 bytes.
+        self.assertTrue(abs(sum(gaps) - eth_interpacket_gap*len(gaps)) <= 3)
+
+    def dic_test(self, dw):
+        # 64-byte frames.
+        lengths = [64]*64
+        gaps    = self.gap_test(dw, dic=False, lengths=lengths)
+        self.assertTrue(min(gaps) >= eth_interpacket_gap)
+        dic_gaps = self.gap_test(dw, dic=True, lengths=lengths)
+        self.check_dic_gaps(dic_gaps)
+        self.assertAlmostEqual(self.efficiency(lengths, dic_gaps), 72/84, delta=1e-3)
+        self.assertTrue(self.efficiency(lengths, dic_gaps) >= self.efficiency(lengths, gaps))
+        # Mixed frames sizes (all last byte lanes).
+        prng    = random.Random(dw)
+        lengths = [prng.randrange(60, 128) for _ in range(64)]
+        gaps     = self.gap_test(dw, dic=False, lengths=lengths)
+        dic_gaps = self.gap_test(dw, dic=True, lengths=lengths)
+        self.check_dic_gaps(dic_gaps)
+        self.assertTrue(self.efficiency(lengths, dic_gaps) >= self.efficiency(lengths, gaps))
+
+    def test_gap_8b(self):
+        lengths = [64]*8
+        gaps    = self.gap_test(8, dic=False, lengths=lengths)
+        self.assertEqual(gaps, [eth_interpacket_gap]*7)
+        self.assertAlmostEqual(self.efficiency(lengths, gaps), 72/84, delta=1e-3)
+
+    def test_gap_dic_16b(self):
+        self.dic_test(16)
+
+    def test_gap_dic_32b(self):
+        self.dic_test(32)
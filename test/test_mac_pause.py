@@ -0,0 +1,133 @@
+#
+# This file is part of LiteEth.
+#
+# Copyright (c) 2026 AEW2015 <AEW2015@users.noreply.github.com>
+# SPDX-License-Identifier: BSD-2-Clause
+
+import unittest
+import random
+
+from migen import *
+
+from liteeth.common import *
+from liteeth.mac.pause import *
+
+from test.model.stream import stream_generator, stream_logger
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def pause_frame(quanta, mac_address=0x10e2d5000000):
+    frame  = list(pause_mac_address.to_bytes(6, byteorder="big"))
+    frame += list(mac_address.to_bytes(6, byteorder="big"))
+    frame += list(pause_ethertype.to_bytes(2, byteorder="big"))
+    frame += list(pause_opcode.to_bytes(2, byteorder="big"))
+    frame += list(quanta.to_bytes(2, byteorder="big"))
+    return frame + [0]*(60 - len(frame))
+
+# DUT ----------------------------------------------------------------------------------------------
+
+class DUT(Module):
+    def __init__(self, dw, quanta_cycles):
+        self.submodules.inserter = LiteEthMACPauseInserter(dw, "little", quanta_cycles)
+        self.submodules.detector = LiteEthMACPauseDetector(dw, "little")
+        self.sink, self.source = self.inserter.sink, self.inserter.source
+        self.comb += [
+            self.source.connect(self.detector.sink, omit={"ready"}),
+            self.detector.sink.ready.eq(self.source.ready),
+        ]
+
+# Test MAC PAUSE -----------------------------------------------------------------------------------
+
+class TestMACPause(unittest.TestCase):
+    def test_pause_detector(self):
+        prng    = random.Random(42)
+        packets = []
+        for i in range(8):
+            if i%2:
+                packets.append(pause_frame(quanta=0x100*i + 1))
+            else:
+                packets.append([prng.randrange(256) for _ in range(64)])
+        errors = [i == 5 for i in range(len(packets))]
+        for dw in [8, 32, 64]:
+            dut    = LiteEthMACPauseDetector(dw, "little")
+            pauses = []
+            def logger():
+                yield dut.sink.ready.eq(1)
+                for i in range(1024):
+                    if (yield dut.pause):
+                        pauses.append((yield dut.quanta))
+                    yield
+            generators = [
+                stream_generator(dut.sink, packets, dw//8, errors=errors),
+                logger(),
+            ]
+            run_simulation(dut, generators)
+            # Errored PAUSE frames are ignored.
+            self.assertEqual(pauses, [0x101, 0x301, 0x701])
+
+    def test_pause_honoring(self):
+        dw            = 32
+        quanta_cycles = 8
+        dut     = DUT(dw, quanta_cycles)
+        packets = [[n]*64 for n in range(4)]
+        starts  = []
+        pause_cycle = []
+        def generator():
+            for i in range(16):
+                yield
+            # Pause after the first packet.
+            yield from stream_generator(dut.sink, packets[:1], dw//8, valid_rand=0)
+            yield dut.inserter.quanta.eq(10)
+            yield dut.inserter.pause.eq(1)
+            yield
+            yield dut.inserter.pause.eq(0)
+            pause_cycle.append(len(cycles))
+            yield from stream_generator(dut.sink, packets[1:], dw//8, valid_rand=0)
+        cycles = []
+        def monitor():
+            first = True
+            while len(starts) < len(packets):
+                if (yield dut.source.valid) and (yield dut.source.ready):
+                    if first:
+                        starts.append(len(cycles))
+                    first = (yield dut.source.last)
+                cycles.append(1)
+                yield
+        received, errors = [], []
+        generators = [
+            generator(),
+            stream_logger(dut.source, len(packets), dw//8, received, errors, ready_rand=0),
+            monitor(),
+        ]
+        run_simulation(dut, generators)
+        self.assertEqual(received, packets)
+        self.assertTrue(starts[1] - pause_cycle[0] >= 10*quanta_cycles - 1)
+        self.assertTrue(starts[1] - pause_cycle[0] <= 10*quanta_cycles + 4)
+
+    def test_pause_generation(self):
+        for dw in [8, 32, 64]:
+            dut = DUT(dw, quanta_cycles=4)
+            received, errors = [], []
+            pauses = []
+            def generator():
+                yield dut.inserter.mac_address.eq(0x10e2d5000000)
+                yield dut.inserter.pause_time.eq(8)
+                yield dut.inserter.request.eq(1)
+                # XOFF, refreshed after 4 quanta.
+                while len(received) < 2:
+                    yield
+                yield dut.inserter.request.eq(0)
+                # XON.
+            def pause_logger():
+                while len(pauses) < 3:
+                    if (yield dut.detector.pause):
+                        pauses.append((yield dut.detector.quanta))
+                    yield
+            generators = [
+                generator(),
+                pause_logger(),
+                stream_logger(dut.source, 3, dw//8, received, errors, ready_rand=0),
+            ]
+            run_simulation(dut, generators)
+            self.assertEqual(received, [pause_frame(8), pause_frame(8), pause_frame(0)])
+            self.assertEqual(pauses, [8, 8, 0])
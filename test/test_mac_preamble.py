@@ -0,0 +1,71 @@
+#
+# This file is part of LiteEth.
+#
+# Copyright (c) 2026 AEW2015 <AEW2015@users.noreply.github.com>
+# SPDX-License-Identifier: BSD-2-Clause
+
+import unittest
+import random
+
+from migen import *
+
+from liteeth.common import *
+from liteeth.mac.preamble import LiteEthMACPreambleInserter, LiteEthMACPreambleChecker
+
+from test.model.stream import stream_generator, stream_logger
+
+# Test MAC Preamble --------------------------------------------------------------------------------
+
+class TestMACPreamble(unittest.TestCase):
+    def get_packets(self, n):
+        prng = random.Random(n)
+        return [[prng.randrange(256) for _ in range(prng.randrange(46, 128))] for _ in range(n)]
+
+    def inserter_test(self, dw):
+        nbytes   = dw//8
+        packets  = self.get_packets(8)
+        preamble = list(eth_preamble.to_bytes(8, byteorder="little"))
+        dut      = LiteEthMACPreambleInserter(dw)
+        received, errors = [], []
+        generators = [
+            stream_generator(dut.sink, packets, nbytes),
+            stream_logger(dut.source, len(packets), nbytes, received, errors),
+        ]
+        run_simulation(dut, generators)
+        self.assertEqual(received, [preamble + p for p in packets])
+
+    def checker_test(self, dw):
+        nbytes   = dw//8
+        packets  = self.get_packets(8)
+        preamble = list(eth_preamble.to_bytes(8, byteorder="little"))
+        corrupt  = [i%3 == 0 for i in range(len(packets))]
+        tx_packets = []
+        for packet, c in zip(packets, corrupt):
+            tx_packet = preamble + packet
+            if c:
+                tx_packet[7] ^= 0x01 # SFD.
+            tx_packets.append(tx_packet)
+        dut = LiteEthMACPreambleChecker(dw)
+        received, errors = [], []
+        preamble_errors  = []
+        def error_logger():
+            while len(received) < corrupt.count(False):
+                if (yield dut.error):
+                    preamble_errors.append(1)
+                yield
+        generators = [
+            stream_generator(dut.sink, tx_packets, nbytes),
+            stream_logger(dut.source, corrupt.count(False), nbytes, received, errors),
+            error_logger(),
+        ]
+        run_simulation(dut, generators)
+        self.assertEqual(received, [p for p, c in zip(packets, corrupt) if not c])
+        self.assertEqual(len(preamble_errors), corrupt.count(True))
+
+    def test_preamble_inserter(self):
+        for dw in [8, 32, 64]:
+            self.inserter_test(dw)
+
+    def test_preamble_checker(self):
+        for dw in [32, 64]:
+            self.checker_test(dw)
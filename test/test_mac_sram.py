@@ -0,0 +1,229 @@
+#
+# This file is part of LiteEth.
+#
+# Copyright (c) 2026 AEW2015 <AEW2015@users.noreply.github.com>
+# SPDX-License-Identifier: BSD-2-Clause
+
+import unittest
+import random
+
+from migen import *
+
+from liteeth.common import *
+from liteeth.mac.sram import LiteEthMACSRAMWriter, LiteEthMACSRAMRingWriter, LiteEthMACSRAMReader
+from liteeth.mac.sram import LiteEthMACIRQModeration
+
+from test.model.stream import stream_generator, stream_logger
+
+# Test MAC SRAM ------------------------------------------------------------------------------------
+
+class TestMACSRAM(unittest.TestCase):
+    def writer_test(self, mtu, lengths):
+        prng    = random.Random(mtu)
+        packets = [[prng.randrange(256) for _ in range(length)] for length in lengths]
+        depth   = (mtu + 3)//4
+        dut     = LiteEthMACSRAMWriter(32, depth, nslots=2, endianness="little", mtu=mtu)
+        dut.specials += dut.mems # Memories are normally exposed by the Wishbone interface.
+        results = []
+        def generator():
+            for packet in packets:
+                yield from stream_generator(dut.sink, [packet], 4, valid_rand=0)
+                while not (yield dut.ev.available.trigger):
+                    yield
+                slot   = (yield dut._slot.status)
+                length = (yield dut._length.status)
+                data   = []
+                for n in range((min(length, 4*depth) + 3)//4):
+                    data += list((yield dut.mems[slot][n]).to_bytes(4, byteorder="little"))
+                results.append((length, data[:length]))
+                yield dut.ev.pending.re.eq(1)
+                yield dut.ev.pending.r.eq(1)
+                yield
+                yield dut.ev.pending.re.eq(0)
+                yield dut.ev.pending.r.eq(0)
+                yield
+        run_simulation(dut, generator())
+        return packets, results
+
+    def test_writer_mtu(self):
+        packets, results = self.writer_test(eth_mtu, [64, 1514, eth_mtu, 2000])
+        for packet, (length, data) in zip(packets[:3], results[:3]):
+            self.assertEqual(length, len(packet))
+            self.assertEqual(data, packet)
+        # Frames larger than the MTU are truncated to the slot.
+        length, data = results[3]
+        self.assertTrue(eth_mtu <= length <= 4*((eth_mtu + 3)//4))
+
+    def test_writer_jumbo(self):
+        packets, results = self.writer_test(eth_jumbo_mtu, [64, 9018, eth_jumbo_mtu, 9100])
+        for packet, (length, data) in zip(packets[:3], results[:3]):
+            self.assertEqual(length, len(packet))
+            self.assertEqual(data, packet)
+        length, data = results[3]
+        self.assertTrue(eth_jumbo_mtu <= length <= 4*((eth_jumbo_mtu + 3)//4))
+        self.assertEqual(data[:eth_jumbo_mtu], packets[3][:eth_jumbo_mtu])
+
+    def test_ring_writer(self):
+        prng  = random.Random(42)
+        depth = 64
+        dut   = LiteEthMACSRAMRingWriter(32, depth, endianness="little", mtu=200)
+        dut.specials += dut.mems
+        mem   = dut.mems[0]
+        burst = [[prng.randrange(256) for _ in range(60)] for _ in range(5)]
+        flow  = [[prng.randrange(256) for _ in range(prng.randrange(20, 200))] for _ in range(8)]
+        results = []
+        def read_frame():
+            rd_ptr = (yield dut._rd_ptr.storage)
+            length = (yield mem[rd_ptr])
+            data   = []
+            for n in range((length + 3)//4):
+                data += list((yield mem[(rd_ptr + 1 + n)%depth]).to_bytes(4, byteorder="little"))
+            results.append(data[:length])
+            yield dut._rd_ptr.storage.eq((rd_ptr + 1 + (length + 3)//4)%depth)
+            yield dut._rd_ptr.re.eq(1)
+            yield
+            yield dut._rd_ptr.re.eq(0)
+            yield
+        def generator():
+            # Burst of small frames: packed until the ring is full, then dropped.
+            yield from stream_generator(dut.sink, burst, 4, valid_rand=0)
+            for i in range(4):
+                yield
+            self.assertEqual((yield dut.level), 3)
+            self.assertEqual((yield dut._errors.status), 2)
+            while (yield dut.ev.available.trigger):
+                yield from read_frame()
+            # Frames wrapping around the ring.
+            for packet in flow:
+                yield from stream_generator(dut.sink, [packet], 4, valid_rand=0)
+                while not (yield dut.ev.available.trigger):
+                    yield
+                yield from read_frame()
+        run_simulation(dut, generator())
+        self.assertEqual(results, burst[:3] + flow)
+
+    def test_ring_writer_rd_ptr(self):
+        # Pending frames tracked from the pointers (rd_ptr writes consuming no/several frames).
+        prng    = random.Random(42)
+        depth   = 64
+        dut     = LiteEthMACSRAMRingWriter(32, depth, endianness="little", mtu=200)
+        dut.specials += dut.mems
+        packets = [[prng.randrange(256) for _ in range(40)] for _ in range(3)]
+        def write_rd_ptr(rd_ptr):
+            yield dut._rd_ptr.storage.eq(rd_ptr)
+            yield dut._rd_ptr.re.eq(1)
+            yield
+            yield dut._rd_ptr.re.eq(0)
+            for i in range(4):
+                yield
+        def generator():
+            # rd_ptr written with no frame pending (driver initialization).
+            yield from write_rd_ptr(0)
+            self.assertEqual((yield dut.level), 0)
+            self.assertEqual((yield dut.ev.available.trigger), 0)
+            yield from stream_generator(dut.sink, packets, 4, valid_rand=0)
+            for i in range(4):
+                yield
+            self.assertEqual((yield dut.level), 3)
+            # rd_ptr rewritten without consuming any frame.
+            yield from write_rd_ptr(0)
+            self.assertEqual((yield dut.level), 3)
+            # Two frames consumed at once.
+            yield from write_rd_ptr(2*(1 + 40//4))
+            self.assertEqual((yield dut.level), 1)
+            # Last frame consumed.
+            yield from write_rd_ptr((yield dut._wr_ptr.status))
+            self.assertEqual((yield dut.level), 0)
+            self.assertEqual((yield dut.ev.available.trigger), 0)
+        run_simulation(dut, generator())
+
+    def test_reader_doorbell(self):
+        prng    = random.Random(42)
+        nslots  = 4
+        dut     = LiteEthMACSRAMReader(32, 16, nslots, endianness="little", doorbell=True)
+        dut.specials += dut.mems
+        packets = [[prng.randrange(256) for _ in range(prng.randrange(1, 64))] for _ in range(7)]
+        received, errors = [], []
+        def fill(n, packet):
+            mem  = dut.mems[n%nslots]
+            data = packet + [0]*(-len(packet)%4)
+            yield mem[0].eq(len(packet))
+            for i in range(len(data)//4):
+                yield mem[1 + i].eq(int.from_bytes(bytes(data[4*i:4*i + 4]), byteorder="little"))
+        def generator():
+            # Batches of 3 and 4 packets (wrapping around the slots), one doorbell each.
+            for first, last in [(0, 3), (3, 7)]:
+                while (yield dut._head.status) != first:
+                    yield
+                for n in range(first, last):
+                    yield from fill(n, packets[n])
+                yield dut._tail.storage.eq(last)
+                yield
+            while (yield dut._head.status) != len(packets):
+                yield
+        run_simulation(dut, [
+            generator(),
+            stream_logger(dut.source, len(packets), 4, received, errors),
+        ])
+        self.assertEqual(received, packets)
+
+    def test_irq_moderation_level(self):
+        dut = LiteEthMACIRQModeration(8, mode="level")
+        def generator():
+            # Default configuration: trigger on each event.
+            yield dut.level.eq(1)
+            yield
+            self.assertEqual((yield dut.trigger), 1)
+            yield dut.level.eq(0)
+            yield dut.frames.storage.eq(3)
+            yield dut.timeout.storage.eq(20)
+            yield
+            # Timeout.
+            yield dut.level.eq(1)
+            cycles = 0
+            while not (yield dut.trigger):
+                cycles += 1
+                yield
+            self.assertEqual(cycles, 21)
+            yield dut.level.eq(0)
+            yield
+            yield
+            self.assertEqual((yield dut.trigger), 0)
+            # Frames threshold, trigger kept until all events handled.
+            yield dut.timeout.storage.eq(0)
+            for level, trigger in [(1, 0), (2, 0), (3, 1), (2, 1), (1, 1)]:
+                yield dut.level.eq(level)
+                yield
+                yield
+                self.assertEqual((yield dut.trigger), trigger)
+            yield dut.level.eq(0)
+            yield
+            yield
+            self.assertEqual((yield dut.trigger), 0)
+        run_simulation(dut, generator())
+
+    def test_irq_moderation_pulse(self):
+        dut      = LiteEthMACIRQModeration(mode="pulse")
+        triggers = []
+        def generator():
+            yield dut.frames.storage.eq(4)
+            yield
+            for i in range(10):
+                yield dut.event.eq(1)
+                yield
+                yield dut.event.eq(0)
+                yield
+            for i in range(64):
+                yield
+            # Pending events sent on timeout.
+            yield dut.timeout.storage.eq(16)
+            for i in range(64):
+                yield
+        def monitor():
+            for i in range(256):
+                if (yield dut.trigger):
+                    triggers.append(i)
+                yield
+        run_simulation(dut, [generator(), monitor()])
+        self.assertEqual(len(triggers), 3)
+        self.assertTrue(triggers[2] - triggers[1] > 64)
@@ -0,0 +1,124 @@
+#
+# This file is part of LiteEth.
+#
+# Copyright (c) 2026 AEW2015 <AEW2015@users.noreply.github.com>
+# SPDX-License-Identifier: BSD-2-Clause
+
+import unittest
+import random
+
+from migen import *
+
+from liteeth.common import *
+from liteeth.mac.stats import LiteEthMACStats, stats_counters, stats_histogram
+
+from test.model.stream import stream_generator
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def expected_stats(packets, errors, min_length=0, mtu=eth_mtu):
+    stats = {name: 0 for name in stats_counters}
+    for packet, error in zip(packets, errors):
+        size = max(len(packet), min_length) + 4
+        dst  = packet[:6]
+        stats["frames"]    += 1
+        stats["bytes"]     += len(packet)
+        stats["broadcast"] += dst == [0xff]*6
+        stats["multicast"] += (dst[0] & 0x1) and dst != [0xff]*6
+        stats["unicast"]   += not (dst[0] & 0x1)
+        stats["runts"]     += size < 64
+        stats["oversize"]  += size > mtu - 8
+        stats["errors"]    += error
+        for name, size_min, size_max in stats_histogram:
+            stats[name] += (size >= size_min) and (size_max is None or size <= size_max)
+    return stats
+
+def big_endian_generator(endpoint, packets, nbytes, errors):
+    # Same as stream_generator, with the first byte in the MSBs.
+    for packet, error in zip(packets, errors):
+        for n in range(0, len(packet), nbytes):
+            chunk = packet[n:n + nbytes]
+            last  = (n + nbytes) >= len(packet)
+            yield endpoint.valid.eq(1)
+            yield endpoint.data.eq(int.from_bytes(bytes(chunk + [0]*(nbytes - len(chunk))), "big"))
+            yield endpoint.last.eq(last)
+            yield endpoint.last_be.eq(2**(nbytes - len(chunk)) if last else 0)
+            yield endpoint.error.eq(2**nbytes - 1 if (last and error) else 0)
+            yield
+        yield endpoint.valid.eq(0)
+        yield
+
+# Test MAC Stats -----------------------------------------------------------------------------------
+
+class TestMACStats(unittest.TestCase):
+    def get_packets(self, n):
+        prng    = random.Random(n)
+        packets = []
+        for i in range(n):
+            length = prng.choice([20, 60, 64, 100, 200, 600, 1100, 1514, 1600])
+            dst    = [
+                [0xff, 0xff, 0xff, 0xff, 0xff, 0xff], # Broadcast.
+                [0x01, 0x00, 0x5e, 0x00, 0x00, 0x01], # Multicast.
+                [0x10, 0xe2, 0xd5, 0x00, 0x00, 0x00], # Unicast.
+            ][i%3]
+            packets.append(dst + [prng.randrange(256) for _ in range(length - 6)])
+        errors = [prng.randrange(4) == 0 for _ in range(n)]
+        return packets, errors
+
+    def stats_test(self, dw, endianness):
+        nbytes = dw//8
+        dut    = LiteEthMACStats(dw, endianness)
+        rx_packets, rx_errors = self.get_packets(16)
+        tx_packets, tx_errors = self.get_packets(12)
+        done = []
+        def generator(endpoint, packets, errors, drops):
+            yield endpoint.ready.eq(1)
+            if endianness == "big":
+                yield from big_endian_generator(endpoint, packets, nbytes, errors)
+            else:
+                yield from stream_generator(endpoint, packets, nbytes, errors)
+            for i in range(drops):
+                yield dut.rx.drop.eq(1)
+                yield
+                yield dut.rx.drop.eq(0)
+            done.append(1)
+        results = {}
+        def checker():
+            while len(done) < 2:
+                yield
+            yield dut.snapshot.re.eq(1)
+            yield
+            yield dut.snapshot.re.eq(0)
+            yield
+            for direction in ["rx", "tx"]:
+                for name in stats_counters:
+                    csr = getattr(dut, "{}_{}".format(direction, name))
+                    results[(direction, name)] = (yield csr.status)
+            # Counters cleared on snapshot.
+            yield dut.snapshot.re.eq(1)
+            yield
+            yield dut.snapshot.re.eq(0)
+            yield
+            results["cleared"] = (yield dut.rx_frames.status)
+        generators = [
+            generator(dut.rx.sink, rx_packets, rx_errors, drops=3),
+            generator(dut.tx.sink, tx_packets, tx_errors, drops=0),
+            checker(),
+        ]
+        run_simulation(dut, generators)
+        rx_expected = expected_stats(rx_packets, rx_errors)
+        rx_expected["drops"] = 3
+        tx_expected = expected_stats(tx_packets, tx_errors, min_length=60)
+        for name in stats_counters:
+            self.assertEqual(results[("rx", name)], rx_expected[name], "rx_" + name)
+            self.assertEqual(results[("tx", name)], tx_expected[name], "tx_" + name)
+        self.assertEqual(results["cleared"], 0)
+
+    def test_stats_8b(self):
+        self.stats_test(8, "big")
+
+    def test_stats_32b_big(self):
+        self.stats_test(32, "big")
+
+    def test_stats_64b_little(self):
+        self.stats_test(64, "little")
@@ -0,0 +1,80 @@
+#
+# This file is part of LiteEth.
+#
+# Copyright (c) 2026 AEW2015 <AEW2015@users.noreply.github.com>
+# SPDX-License-Identifier: BSD-2-Clause
+
+import unittest
+import random
+
+from migen import *
+
+from liteeth.common import *
+from liteeth.mac.checksum import tcp_protocol
+from liteeth.mac.steering import *
+
+from test.model.stream import stream_generator, stream_logger
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def ip_frame(prng, protocol, src_port, dst_port, length, fragment=0):
+    frame  = [prng.randrange(256) for _ in range(12)] + [0x08, 0x00]
+    frame += [0x45, 0, 0, 0, 0, 0, fragment >> 8, fragment & 0xff, 64, protocol, 0, 0]
+    frame += [prng.randrange(256) for _ in range(8)]
+    frame += list(src_port.to_bytes(2, "big")) + list(dst_port.to_bytes(2, "big"))
+    return frame + [prng.randrange(256) for _ in range(length - len(frame))]
+
+def flow_hash(frame):
+    h = 0
+    for n in range(26, 34, 2):
+        h ^= (frame[n] << 8) | frame[n + 1]
+    if frame[23] in [udp_protocol, tcp_protocol] and frame[20:22] == [0, 0]:
+        for n in range(34, 38, 2):
+            h ^= (frame[n] << 8) | frame[n + 1]
+    return h
+
+# Test MAC RX Steering -----------------------------------------------------------------------------
+
+class TestMACRXSteering(unittest.TestCase):
+    def test_steering(self):
+        prng    = random.Random(42)
+        nqueues = 4
+        dut     = LiteEthMACRXSteering(dw=32, endianness="little", nqueues=nqueues, nrules=2)
+        frames, queues = [], []
+        for i in range(24):
+            kind = i%6
+            if kind == 0:   # ARP: rule 0.
+                frame, queue = [prng.randrange(256) for _ in range(12)] + [0x08, 0x06], 3
+                frame += [prng.randrange(256) for _ in range(46)]
+            elif kind == 1: # UDP to port 1234: rule 1.
+                frame, queue = ip_frame(prng, udp_protocol, prng.randrange(2**16), 1234, 80), 2
+            elif kind == 2: # Non-IPv4/ARP: default queue.
+                frame, queue = [prng.randrange(256) for _ in range(12)] + [0x86, 0xdd], 1
+                frame += [prng.randrange(256) for _ in range(60)]
+            else:           # UDP/TCP/ICMP/fragments: flow hash.
+                protocol = [udp_protocol, tcp_protocol, icmp_protocol][kind - 3]
+                frame    = ip_frame(prng, protocol, prng.randrange(2**16), prng.randrange(2**16),
+                    prng.randrange(60, 120), fragment=0x2000*(i%4 == 0))
+                queue    = flow_hash(frame)%nqueues
+            frames.append(frame)
+            queues.append(queue)
+        received = [[] for _ in range(nqueues)]
+        errors   = [[] for _ in range(nqueues)]
+        def config():
+            yield dut.ethertype0.storage.eq(ethernet_type_arp)
+            yield dut.queue0.storage.eq(3)
+            yield dut.port1.storage.eq(1234)
+            yield dut.queue1.storage.eq(2)
+            yield dut.enable.storage.eq(0b11)
+            yield dut.default_queue.storage.eq(1)
+            yield
+        def generator():
+            yield from config()
+            yield from stream_generator(dut.sink, frames, 4, valid_rand=0)
+        generators = [generator()]
+        for n in range(nqueues):
+            generators.append(stream_logger(dut.sources[n], queues.count(n), 4,
+                received[n], errors[n]))
+        run_simulation(dut, generators)
+        for n in range(nqueues):
+            self.assertEqual(received[n], [f for f, q in zip(frames, queues) if q == n])
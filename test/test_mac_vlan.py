@@ -0,0 +1,101 @@
+#
+# This file is part of LiteEth.
+#
+# Copyright (c) 2026 AEW2015 <AEW2015@users.noreply.github.com>
+# SPDX-License-Identifier: BSD-2-Clause
+
+import unittest
+import random
+
+from migen import *
+
+from liteeth.common import *
+from liteeth.mac.common import *
+
+from test.model.stream import stream_generator, stream_logger
+
+# Helpers ------------------------------------------------------------------------------------------
+
+target_mac = 0x10e2d5000001
+sender_mac = 0x10e2d5000000
+
+def frame(ethernet_type, payload, vlan_id=None, vlan_pcp=0):
+    f  = list(target_mac.to_bytes(6, byteorder="big"))
+    f += list(sender_mac.to_bytes(6, byteorder="big"))
+    if vlan_id is not None:
+        f += list(ethernet_type_vlan.to_bytes(2, byteorder="big"))
+        f += list(((vlan_pcp << 13) | vlan_id).to_bytes(2, byteorder="big"))
+    f += list(ethernet_type.to_bytes(2, byteorder="big"))
+    return f + payload
+
+def port_generator(endpoint, ethernet_type, payloads):
+    for payload in payloads:
+        yield endpoint.target_mac.eq(target_mac)
+        yield endpoint.sender_mac.eq(sender_mac)
+        yield endpoint.ethernet_type.eq(ethernet_type)
+        yield from stream_generator(endpoint, [payload], 1)
+
+# DUT ----------------------------------------------------------------------------------------------
+
+class DUT(Module):
+    def __init__(self, ports):
+        self.submodules.packetizer   = LiteEthMACVLANPacketizer()
+        self.submodules.depacketizer = LiteEthMACVLANDepacketizer()
+        self.submodules.crossbar     = LiteEthMACVLANCrossbar()
+        self.ports = {}
+        for ethernet_type, vlan_id in ports:
+            self.ports[(ethernet_type, vlan_id)] = self.crossbar.get_port(ethernet_type, vlan_id=vlan_id)
+        self.comb += [
+            self.crossbar.master.source.connect(self.packetizer.sink),
+            self.depacketizer.source.connect(self.crossbar.master.sink),
+        ]
+        self.sink, self.source = self.depacketizer.sink, self.packetizer.source
+
+# Test MAC VLAN ------------------------------------------------------------------------------------
+
+class TestMACVLAN(unittest.TestCase):
+    def test_vlan_rx_dispatch(self):
+        prng  = random.Random(42)
+        ports = [(ethernet_type_ip, 0), (ethernet_type_ip, 5), (ethernet_type_arp, 5)]
+        dut   = DUT(ports)
+        # Frames: untagged, tagged on VLAN 5, priority-tagged (VLAN 0), unknown VLAN (dropped).
+        frames   = []
+        expected = {port: [] for port in ports}
+        for i in range(16):
+            payload = [prng.randrange(256) for _ in range(prng.randrange(20, 80))]
+            ethernet_type, vlan_id = [
+                (ethernet_type_ip,  None),
+                (ethernet_type_ip,  5),
+                (ethernet_type_arp, 5),
+                (ethernet_type_ip,  0),
+                (ethernet_type_ip,  7),
+            ][i%5]
+            frames.append(frame(ethernet_type, payload, vlan_id, vlan_pcp=i%8))
+            key = (ethernet_type, vlan_id or 0)
+            if key in expected:
+                expected[key].append(payload)
+        received = {port: [] for port in ports}
+        errors   = {port: [] for port in ports}
+        generators = [stream_generator(dut.sink, frames, 1)]
+        for port in ports:
+            generators.append(stream_logger(dut.ports[port].source, len(expected[port]), 1,
+                received[port], errors[port]))
+        run_simulation(dut, generators)
+        for port in ports:
+            self.assertEqual(received[port], expected[port])
+
+    def test_vlan_tx_tagging(self):
+        prng  = random.Random(43)
+        ports = [(ethernet_type_ip, 0), (ethernet_type_ip, 5), (ethernet_type_arp, 4095)]
+        dut   = DUT(ports)
+        payloads = {port: [[prng.randrange(256) for _ in range(prng.randrange(20, 80))]
+            for _ in range(4)] for port in ports}
+        received, errors = [], []
+        generators = [port_generator(dut.ports[port].sink, port[0], payloads[port]) for port in ports]
+        generators.append(stream_logger(dut.source, 4*len(ports), 1, received, errors))
+        run_simulation(dut, generators)
+        expected = []
+        for (ethernet_type, vlan_id), port_payloads in payloads.items():
+            for payload in port_payloads:
+                expected.append(frame(ethernet_type, payload, vlan_id or None))
+        self.assertEqual(sorted(received), sorted(expected))
@@ -13,6 +13,7 @@ from litex.soc.interconnect.stream_sim import *
 
 from liteeth.common import *
 from liteeth.mac import LiteEthMAC
+from liteeth.mac.wishbone import LiteEthMACWishboneInterface
 
 from test.model import phy, mac
 
@@ -52,6 +53,33 @@ class WishboneMaster:
         yield
 
 
+def wishbone_burst(bus, adr, n, datas=None):
+    # Incrementing burst of n words (writes if datas provided, reads otherwise).
+    def present(i):
+        yield bus.adr.eq(adr + i)
+        yield bus.cti.eq(wishbone.CTI_BURST_END if i == (n - 1) else wishbone.CTI_BURST_INCREMENTING)
+        if datas is not None:
+            yield bus.dat_w.eq(datas[i])
+    yield bus.cyc.eq(1)
+    yield bus.stb.eq(1)
+    yield bus.we.eq(datas is not None)
+    yield bus.sel.eq(2**len(bus.sel) - 1)
+    yield from present(0)
+    i, reads = 0, []
+    while i < n:
+        yield
+        if (yield bus.ack):
+            reads.append((yield bus.dat_r))
+            i += 1
+            if i < n:
+                yield from present(i)
+    yield bus.cyc.eq(0)
+    yield bus.stb.eq(0)
+    yield bus.cti.eq(0)
+    yield
+    return reads
+
+
 class SRAMReaderDriver:
     def __init__(self, obj):
         self.obj = obj
@@ -157,3 +185,56 @@ class TestMACWishbone(unittest.TestCase):
                   "eth_rx": 8,
                   "eth_tx": 8}
         run_simulation(dut, generators, clocks, vcd_name="sim.vcd")
+
+    def wide_burst_test(self, data_width):
+        class DUT(Module):
+            def __init__(self):
+                self.submodules.interface = LiteEthMACWishboneInterface(32,
+                    endianness     = "little",
+                    bus_data_width = data_width,
+                    bus_bursting   = True)
+                # Loopback.
+                self.comb += self.interface.source.connect(self.interface.sink)
+        dut    = DUT()
+        bus    = dut.interface.bus
+        nbytes = data_width//8
+        length = 150
+        packet = [seed_to_data(i, True) % 0xff for i in range(length)]
+        words  = (length + nbytes - 1)//nbytes
+        data   = packet + [0]*(words*nbytes - length)
+        rx_adr = 0x0000//nbytes # RX slot 0.
+        tx_adr = 0x1000//nbytes # TX slot 0.
+        cycles = []
+        def generator():
+            reader = dut.interface.sram.reader
+            writer = dut.interface.sram.writer
+            yield from wishbone_burst(bus, tx_adr, words,
+                [int.from_bytes(bytes(data[nbytes*i:nbytes*(i + 1)]), "little") for i in range(words)])
+            yield reader._slot.storage.eq(0)
+            yield reader._length.storage.eq(length)
+            yield reader._start.re.eq(1)
+            yield
+            yield reader._start.re.eq(0)
+            while not (yield writer.ev.available.trigger):
+                yield
+            self.assertEqual((yield writer._length.status), length)
+            rx = yield from wishbone_burst(bus, rx_adr, words)
+            rx_data = []
+            for word in rx:
+                rx_data += list(word.to_bytes(nbytes, "little"))
+            self.assertEqual(rx_data[:length], packet)
+        def monitor():
+            for i in range(2048):
+                if (yield bus.cyc) and (yield bus.ack):
+                    cycles.append(i)
+                yield
+        run_simulation(dut, [generator(), monitor()])
+        # One word per cycle in bursts.
+        self.assertEqual(len(cycles), 2*words)
+        self.assertEqual(cycles[words - 1] - cycles[0], words - 1)
+
+    def test_wide_burst_64(self):
+        self.wide_burst_test(64)
+
+    def test_wide_burst_128(self):
+        self.wide_burst_test(128)
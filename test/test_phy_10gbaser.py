@@ -0,0 +1,191 @@
+#
+# This file is part of LiteEth.
+#
+# Copyright (c) 2026 AEW2015 <AEW2015@users.noreply.github.com>
+# SPDX-License-Identifier: BSD-2-Clause
+
+import unittest
+import random
+
+from migen import *
+
+from liteeth.common import *
+from liteeth.phy.xgmii import *
+from liteeth.phy.pcs_10gbaser import TransmitPath, ReceivePath
+
+from test.model.stream import stream_generator, stream_logger
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def xgmii_words(packets, start_lane):
+    # Encode packets as XGMII (data, ctl) words with /S/ in start_lane.
+    chars = []
+    for packet in packets:
+        chars += [(xgmii_idle, 1)]*start_lane
+        chars += [(xgmii_start, 1)] + [(b, 0) for b in packet[1:]] + [(xgmii_end, 1)]
+        chars += [(xgmii_idle, 1)]*((-len(chars))%8 + 8)
+    words = []
+    for n in range(0, len(chars), 8):
+        data = sum(c[0] << 8*i for i, c in enumerate(chars[n:n+8]))
+        ctl  = sum(c[1] << i   for i, c in enumerate(chars[n:n+8]))
+        words.append((data, ctl))
+    return words
+
+def xgmii_gap_logger(xgmii, npackets, gaps):
+    # Log the interpacket gaps (in bytes, /T/ included) on the XGMII TX.
+    idle = None
+    n    = 0
+    while n < npackets:
+        yield
+        data = (yield xgmii.tx_data)
+        ctl  = (yield xgmii.tx_ctl)
+        for i in range(8):
+            char = (data >> 8*i) & 0xff
+            if (ctl >> i) & 0b1:
+                if char == xgmii_start:
+                    if idle is not None:
+                        gaps.append(idle)
+                    idle = None
+                elif char == xgmii_end:
+                    idle = 1
+                    n   += 1
+                elif idle is not None:
+                    idle += 1
+
+# DUT ----------------------------------------------------------------------------------------------
+
+class DUT(Module):
+    def __init__(self, bitshift=0):
+        self.xgmii = xgmii = Record(xgmii_layout)
+        self.submodules.phy_tx = LiteEthPHYXGMIITX(xgmii)
+        self.submodules.pcs_tx = TransmitPath()
+        self.submodules.pcs_rx = ReceivePath()
+        self.submodules.phy_rx = LiteEthPHYXGMIIRX(xgmii)
+        self.sink, self.source = self.phy_tx.sink, self.phy_rx.source
+
+        # XGMII TX can be overriden to test specific sequences.
+        self.xgmii_override = Signal()
+        self.xgmii_data     = Signal(64)
+        self.xgmii_ctl      = Signal(8)
+        self.comb += [
+            If(self.xgmii_override,
+                self.pcs_tx.d.eq(self.xgmii_data),
+                self.pcs_tx.k.eq(self.xgmii_ctl)
+            ).Else(
+                self.pcs_tx.d.eq(xgmii.tx_data),
+                self.pcs_tx.k.eq(xgmii.tx_ctl)
+            ),
+            xgmii.rx_data.eq(self.pcs_rx.d),
+            xgmii.rx_ctl.eq(self.pcs_rx.k),
+        ]
+
+        # Serial link, with bitshift bits of misalignment.
+        tx_data_d = Signal(66)
+        self.sync += tx_data_d.eq(self.pcs_tx.data)
+        self.comb += self.pcs_rx.data.eq(Cat(tx_data_d, self.pcs_tx.data)[bitshift:bitshift + 66])
+
+# Test PHY 10GBASE-R -------------------------------------------------------------------------------
+
+class TestPHY10GBASER(unittest.TestCase):
+    def get_packets(self, n):
+        prng     = random.Random(n)
+        preamble = list(eth_preamble.to_bytes(8, byteorder="little"))
+        # Cover all the /T/ positions.
+        lengths  = [64 + i for i in range(8)] + [prng.randrange(64, 256) for _ in range(n - 8)]
+        return [preamble + [prng.randrange(256) for _ in range(length)] for length in lengths]
+
+    def wait_lock(self, dut, timeout=10000):
+        for i in range(timeout):
+            if (yield dut.pcs_rx.block_lock):
+                return
+            yield
+        raise TimeoutError
+
+    def loopback_test(self, bitshift):
+        packets = self.get_packets(16)
+        dut     = DUT(bitshift)
+        received, errors = [], []
+        def generator():
+            yield from self.wait_lock(dut)
+            yield from stream_generator(dut.sink, packets, 8, valid_rand=0)
+        generators = [
+            generator(),
+            stream_logger(dut.source, len(packets), 8, received, errors, ready_rand=0),
+        ]
+        run_simulation(dut, generators)
+        self.assertEqual(received, packets)
+        self.assertEqual(errors, [False]*len(packets))
+
+    def test_loopback(self):
+        self.loopback_test(bitshift=0)
+
+    def test_block_lock_bitslip(self):
+        self.loopback_test(bitshift=23)
+
+    def test_start_lane4(self):
+        packets = self.get_packets(8)
+        dut     = DUT()
+        received, errors = [], []
+        def generator():
+            yield dut.xgmii_override.eq(1)
+            yield from self.wait_lock(dut)
+            for data, ctl in xgmii_words(packets, start_lane=4):
+                yield dut.xgmii_data.eq(data)
+                yield dut.xgmii_ctl.eq(ctl)
+                yield
+        generators = [
+            generator(),
+            stream_logger(dut.source, len(packets), 8, received, errors, ready_rand=0),
+        ]
+        run_simulation(dut, generators)
+        self.assertEqual(received, packets)
+        self.assertEqual(errors, [False]*len(packets))
+
+    def ifg_test(self, dic, lengths):
+        # Frames (with preamble) sent back to back.
+        prng     = random.Random(len(lengths))
+        preamble = list(eth_preamble.to_bytes(8, byteorder="little"))
+        packets  = [preamble + [prng.randrange(256) for _ in range(length)] for length in lengths]
+        xgmii    = Record(xgmii_layout)
+        dut      = LiteEthPHYXGMIITX(xgmii, dic=dic)
+        gaps     = []
+        generators = [
+            stream_generator(dut.sink, packets, 8, valid_rand=0),
+            xgmii_gap_logger(xgmii, len(packets), gaps),
+        ]
+        run_simulation(dut, generators)
+        self.assertEqual(len(gaps), len(packets) - 1)
+        nbytes = sum(8 + length for length in lengths[1:])
+        return gaps, nbytes/(nbytes + sum(gaps))
+
+    def test_ifg(self):
+        # Frames start in lane 0 or 4: 64-byte frames at line rate without DIC.
+        gaps, efficiency = self.ifg_test(dic=False, lengths=[64]*64)
+        self.assertEqual(gaps, [eth_interpacket_gap]*63)
+        self.assertAlmostEqual(efficiency, 72/84, delta=1e-3)
+        # Other sizes: gap rounded up to the next start lane.
+        prng = random.Random(0)
+        gaps, efficiency = self.ifg_test(dic=False, lengths=[prng.randrange(60, 128)
+            for _ in range(64)])
+        self.assertTrue(min(gaps) >= eth_interpacket_gap)
+        self.assertTrue(sum(gaps) > eth_interpacket_gap*len(gaps))
+
+    def check_dic_gaps(self, gaps):
+        # No gap shorter than 9 bytes (IEEE 802.3 clause 46: deficit of at most 3 bytes).
+        self.assertTrue(min(gaps) >= 9)
+        # Average of 12 bytes.
+        self.assertTrue(abs(sum(gaps) - eth_interpacket_gap*len(gaps)) <= 3)
+
+    def test_ifg_dic(self):
+        # 64-byte frames.
+        gaps, efficiency = self.ifg_test(dic=True, lengths=[64]*64)
+        self.check_dic_gaps(gaps)
+        self.assertAlmostEqual(efficiency, 72/84, delta=1e-3)
+        # Mixed frames sizes (all last byte lanes): efficiency of a 12-byte gap.
+        prng    = random.Random(0)
+        lengths = [prng.randrange(60, 128) for _ in range(64)]
+        gaps, efficiency = self.ifg_test(dic=True, lengths=lengths)
+        self.check_dic_gaps(gaps)
+        nbytes = sum(8 + length for length in lengths[1:])
+        self.assertAlmostEqual(efficiency, nbytes/(nbytes + eth_interpacket_gap*len(gaps)),
+            delta=1e-3)
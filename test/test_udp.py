@@ -13,8 +13,10 @@ from litex.soc.interconnect.stream_sim import *
 
 from liteeth.common import *
 from liteeth.core import LiteEthUDPIPCore
+from liteeth.core.udp import LiteEthUDPRX
 
 from test.model import phy, mac, arp, ip, udp
+from test.model.stream import packet_to_words, stream_logger
 
 from litex.gen.sim import *
 
@@ -54,6 +56,36 @@ def main_generator(dut):
     print("shift " + str(s) + " / length " + str(l) + " / errors " + str(e))
 
 class TestUDP(unittest.TestCase):
+    def test_rx_bubbles(self):
+        dw        = 32
+        dut       = LiteEthUDPRX(ip_address, dw=dw)
+        payloads  = [[n]*(4 + 4*n) for n in range(5)]
+        protocols = [udp_protocol, icmp_protocol, udp_protocol, udp_protocol, icmp_protocol]
+        received, errors, stalls = [], [], []
+        def generator():
+            # Back-to-back packets (UDP ones presented, other ones dropped).
+            for payload, protocol in zip(payloads, protocols):
+                length = udp_header.length + len(payload)
+                packet = [0x12, 0x34, 0x56, 0x78] + list(length.to_bytes(2, "big")) + [0, 0]
+                yield dut.sink.protocol.eq(protocol)
+                for word in packet_to_words(packet + payload, dw//8):
+                    yield dut.sink.valid.eq(1)
+                    yield dut.sink.data.eq(word["data"])
+                    yield dut.sink.last.eq(word["last"])
+                    yield
+                    if not (yield dut.sink.ready):
+                        stalls.append(1)
+                    while not (yield dut.sink.ready):
+                        yield
+            yield dut.sink.valid.eq(0)
+        run_simulation(dut, [
+            generator(),
+            stream_logger(dut.source, 3, dw//8, received, errors, ready_rand=0),
+        ])
+        self.assertEqual(received, [payloads[n] for n in [0, 2, 3]])
+        # Back-to-back packets accepted at one word per cycle (no bubble).
+        self.assertEqual(len(stalls), 0)
+
     def test(self):
         dut = DUT(8)
         generators = {